@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Compares a benchmark run to the stored baseline and flags regressions.
+
+The benchmarks are run with pytest-benchmark (from the repository root):
+    python -m pytest benchmarks --benchmark-only --benchmark-json=benchmark.json
+
+and compared with:
+    python benchmarks/compare_benchmarks.py benchmark.json
+
+which returns a non-zero exit code if any benchmark is slower than the baseline by
+more than the threshold. The baseline is (re-)stored with:
+    python benchmarks/compare_benchmarks.py benchmark.json --store-baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# Stored statistics of each benchmark [s]
+STATISTICS = ("min", "median", "mean")
+
+
+def load_results(file_path: str) -> dict:
+    """Returns the statistics {name: {statistic: value}} of a pytest-benchmark
+    json-output or of a stored baseline."""
+    with open(file_path, "r") as file:
+        data = json.load(file)
+
+    results = {}
+    for benchmark in data["benchmarks"]:
+        if "stats" in benchmark:
+            # Raw output of pytest-benchmark
+            stats = benchmark["stats"]
+            results[benchmark["fullname"]] = {key: stats[key] for key in STATISTICS}
+        else:
+            results[benchmark["fullname"]] = {key: benchmark[key] for key in STATISTICS}
+    return results
+
+
+def store_baseline(results: dict, file_path: str = BASELINE_PATH) -> None:
+    data = {
+        "benchmarks": [
+            {"fullname": name, **stats} for name, stats in sorted(results.items())
+        ]
+    }
+    with open(file_path, "w") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def compare_results(
+    results: dict, baseline: dict, threshold: float = 0.2, statistic: str = "median"
+) -> list:
+    """Prints the comparison table and returns the names of the benchmarks which
+    are slower by more than the (relative) threshold."""
+    regressions = []
+    width = max([len(name) for name in results] + [10])
+    print(
+        f"{'benchmark':<{width}} {'baseline [ms]':>14} {'current [ms]':>14} "
+        + f"{'change':>8}"
+    )
+    for name, stats in sorted(results.items()):
+        if name not in baseline:
+            print(
+                f"{name:<{width}} {'-':>14} {stats[statistic] * 1e3:>14.3f} {'new':>8}"
+            )
+            continue
+
+        reference = baseline[name][statistic]
+        change = stats[statistic] / reference - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  <-- REGRESSION"
+
+        print(
+            f"{name:<{width}} {reference * 1e3:>14.3f} "
+            + f"{stats[statistic] * 1e3:>14.3f} {change:>+8.1%}{flag}"
+        )
+
+    for name in sorted(set(baseline) - set(results)):
+        print(f"{name:<{width}} (not run)")
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("results", help="json-output of pytest-benchmark")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slow-down which is flagged as regression (default: 0.2)",
+    )
+    parser.add_argument("--statistic", choices=STATISTICS, default="median")
+    parser.add_argument(
+        "--store-baseline",
+        action="store_true",
+        help="store the results as new baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = load_results(args.results)
+    if args.store_baseline:
+        store_baseline(results, args.baseline)
+        print(f"Stored {len(results)} benchmarks as baseline in {args.baseline}.")
+        return 0
+
+    regressions = compare_results(
+        results,
+        load_results(args.baseline),
+        threshold=args.threshold,
+        statistic=args.statistic,
+    )
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmark(s) slower by more than "
+            + f"{args.threshold:.0%}."
+        )
+        return 1
+    return 0
+
+
+if (__name__) == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Fixtures of the performance benchmarks.
+"""
+
+import pytest
+
+from scenes import scene_factories
+
+
+@pytest.fixture(scope="session", params=list(scene_factories))
+def scene(request):
+    """Each canonical scene is created once per session."""
+    return scene_factories[request.param]()
@@ -0,0 +1,238 @@
+"""
+Canonical (fixed) scenes of the performance benchmarks.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.containers import GradientContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.obstacles import Ellipse, Polygon, StarshapedFlower
+
+
+@dataclass
+class Scene:
+    """Obstacle environment and the positions at which it is evaluated.
+
+    Attributes
+    ----------
+    obstacle_environment: obstacle container
+    positions: (dimension, n_points) array of (collision free) sample positions
+    attractor_position: attractor of the linear initial dynamics
+    """
+
+    obstacle_environment: ObstacleContainer
+    positions: np.ndarray
+    attractor_position: np.ndarray
+
+    @property
+    def dimension(self) -> int:
+        return self.positions.shape[0]
+
+    def initial_dynamics(self, positions: np.ndarray) -> np.ndarray:
+        """Linear dynamics towards the attractor of positions (dimension, n_points)."""
+        return np.reshape(self.attractor_position, (-1, 1)) - positions
+
+
+def get_free_positions(
+    obstacle_environment, x_lim, y_lim, z_lim=None, n_points=100, seed=0
+) -> np.ndarray:
+    """Returns n_points (uniformly) sampled positions outside of all obstacles."""
+    rng = np.random.default_rng(seed)
+    limits = [x_lim, y_lim] if z_lim is None else [x_lim, y_lim, z_lim]
+
+    positions = np.zeros((len(limits), 0))
+    while positions.shape[1] < n_points:
+        samples = np.array([rng.uniform(lim[0], lim[1], n_points) for lim in limits])
+        is_free = np.ones(n_points, dtype=bool)
+        for ii in range(n_points):
+            for obs in obstacle_environment:
+                gamma = obs.get_gamma(samples[:, ii], in_global_frame=True)
+                if gamma <= 1.01:
+                    is_free[ii] = False
+                    break
+        positions = np.hstack((positions, samples[:, is_free]))
+
+    return positions[:, :n_points]
+
+
+def create_single_ellipse() -> Scene:
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([2.0, 1.0]),
+            orientation=30 * np.pi / 180,
+            margin_absolut=0.1,
+        )
+    )
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(obstacle_environment, [-4, 4], [-4, 4]),
+        attractor_position=np.array([4.0, 0.0]),
+    )
+
+
+def create_mixed_obstacles(n_obstacles: int = 50) -> Scene:
+    """Grid of alternating (rotated) cuboids and ellipses."""
+    rng = np.random.default_rng(1)
+    obstacle_environment = ObstacleContainer()
+    n_rows = int(np.ceil(np.sqrt(n_obstacles)))
+    for ii in range(n_obstacles):
+        center_position = 3.0 * np.array([ii % n_rows, ii // n_rows]) + rng.uniform(
+            -0.3, 0.3, 2
+        )
+        kwargs = dict(
+            center_position=center_position,
+            axes_length=rng.uniform(0.5, 1.5, 2),
+            orientation=rng.uniform(-np.pi, np.pi),
+        )
+        if ii % 2:
+            obstacle_environment.append(CuboidXd(**kwargs))
+        else:
+            obstacle_environment.append(EllipseWithAxes(**kwargs))
+
+    limit = 3.0 * n_rows
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(obstacle_environment, [-1, limit], [-1, limit]),
+        attractor_position=np.array([limit, limit]),
+    )
+
+
+def create_polygon_room() -> Scene:
+    """Polygonal room (boundary) with two polygonal pieces of furniture."""
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Polygon(
+            edge_points=np.array(
+                [[-5.0, -4.0], [5.0, -4.0], [5.0, 1.0], [2.0, 4.0], [-5.0, 4.0]]
+            ).T,
+            center_position=np.array([0.0, 0.0]),
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        Polygon(
+            edge_points=np.array(
+                [[-4.0, 2.0], [-2.0, 2.0], [-2.0, 3.0], [-4.0, 3.0]]
+            ).T,
+            center_position=np.array([-3.0, 2.5]),
+        )
+    )
+    obstacle_environment.append(
+        Polygon(
+            edge_points=np.array([[1.0, -3.0], [3.0, -2.0], [1.0, -1.0]]).T,
+            center_position=np.array([1.6, -2.0]),
+        )
+    )
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(obstacle_environment, [-5, 5], [-4, 4]),
+        attractor_position=np.array([4.0, -3.0]),
+    )
+
+
+def create_starshaped_flower() -> Scene:
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        StarshapedFlower(
+            center_position=np.array([0.0, 0.0]),
+            radius_magnitude=0.5,
+            number_of_edges=5,
+            radius_mean=1.5,
+            orientation=10 * np.pi / 180,
+        )
+    )
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(obstacle_environment, [-4, 4], [-4, 4]),
+        attractor_position=np.array([4.0, 0.0]),
+    )
+
+
+def create_surgery_boundary() -> Scene:
+    """3D (ellipsoidal) boundary of a surgery setup with instruments inside."""
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0, 0.15]),
+            axes_length=np.array([0.4, 0.4, 0.6]),
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([0.05, 0.0, 0.2]),
+            axes_length=np.array([0.02, 0.02, 0.2]),
+        )
+    )
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([-0.05, 0.05, 0.1]),
+            axes_length=np.array([0.03, 0.03, 0.15]),
+        )
+    )
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(
+            obstacle_environment, [-0.1, 0.1], [-0.1, 0.1], [0.0, 0.3]
+        ),
+        attractor_position=np.array([0.0, 0.0, 0.0]),
+    )
+
+
+def create_pedestrian_crowd(n_pedestrians: int = 200) -> Scene:
+    """Crowd of (elliptic) pedestrians walking in random directions."""
+    rng = np.random.default_rng(2)
+    obstacle_environment = ObstacleContainer()
+    for ii in range(n_pedestrians):
+        obstacle_environment.append(
+            EllipseWithAxes(
+                center_position=rng.uniform([-20, -10], [20, 10]),
+                axes_length=np.array([0.5, 0.3]),
+                orientation=rng.uniform(-np.pi, np.pi),
+                linear_velocity=rng.normal(0, 0.8, 2),
+                margin_absolut=0.3,
+            )
+        )
+    return Scene(
+        obstacle_environment=obstacle_environment,
+        positions=get_free_positions(obstacle_environment, [-20, 20], [-10, 10]),
+        attractor_position=np.array([20.0, 0.0]),
+    )
+
+
+def create_intersecting_ellipses() -> GradientContainer:
+    """Intersecting obstacles, whose common reference points are searched
+    (the gradient container supports the ellipses with reference length only)."""
+    obstacle_environment = GradientContainer()
+    for center_position, orientation in [
+        ([0.0, 0.0], 0.0),
+        ([1.5, 0.5], 30),
+        ([3.0, 0.0], -20),
+        ([-2.0, 2.0], 60),
+        ([-3.0, 3.5], 10),
+        ([4.0, 4.0], 0.0),
+    ]:
+        obstacle_environment.append(
+            Ellipse(
+                center_position=np.array(center_position),
+                axes_length=np.array([1.5, 0.8]),
+                orientation=orientation * np.pi / 180,
+            )
+        )
+    return obstacle_environment
+
+
+scene_factories: dict[str, Callable[[], Scene]] = {
+    "single_ellipse": create_single_ellipse,
+    "mixed_50": create_mixed_obstacles,
+    "polygon_room": create_polygon_room,
+    "starshaped_flower": create_starshaped_flower,
+    "surgery_boundary_3d": create_surgery_boundary,
+    "crowd_200": create_pedestrian_crowd,
+}
@@ -0,0 +1,65 @@
+"""
+Benchmark of the modulation, the rollouts and the vector field evaluation
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+from dynamic_obstacle_avoidance.avoidance import (
+    obs_avoidance_interpolation_moving_batch,
+)
+from dynamic_obstacle_avoidance.avoidance import integrate_trajectories_rk4
+
+# Number of positions evaluated within one round
+N_POSITIONS = 20
+
+# Rollouts of N_AGENTS with N_STEPS each
+N_AGENTS = 10
+N_STEPS = 10
+
+# Number of grid points of the vector field in 2D (the 3D grid has similar size)
+N_GRID = 400
+
+
+def evaluate_modulation(scene, positions):
+    velocities = scene.initial_dynamics(positions)
+    for ii in range(positions.shape[1]):
+        obs_avoidance_interpolation_moving(
+            positions[:, ii], velocities[:, ii], scene.obstacle_environment
+        )
+
+
+def get_grid(scene) -> np.ndarray:
+    n_per_dim = int(round(N_GRID ** (1.0 / scene.dimension)))
+    axes = [
+        np.linspace(np.min(scene.positions[dd, :]), np.max(scene.positions[dd, :]), n)
+        for dd, n in enumerate([n_per_dim] * scene.dimension)
+    ]
+    return np.array([mesh.flatten() for mesh in np.meshgrid(*axes)])
+
+
+def test_modulation(benchmark, scene):
+    benchmark(evaluate_modulation, scene, scene.positions[:, :N_POSITIONS])
+
+
+def test_rk4_rollout(benchmark, scene):
+    trajectories, n_steps = benchmark(
+        integrate_trajectories_rk4,
+        scene.positions[:, :N_AGENTS],
+        scene.obstacle_environment,
+        ds=scene.initial_dynamics,
+        dt=0.02,
+        max_simu_step=N_STEPS,
+    )
+    assert trajectories.shape[2] == N_AGENTS
+
+
+def test_vector_field_grid(benchmark, scene):
+    positions = get_grid(scene)
+    velocities = benchmark(
+        obs_avoidance_interpolation_moving_batch,
+        positions,
+        scene.initial_dynamics(positions),
+        scene.obstacle_environment,
+    )
+    assert velocities.shape == positions.shape
@@ -0,0 +1,62 @@
+"""
+Benchmark of the geometric queries of the obstacles
+"""
+
+import itertools
+
+import numpy as np
+
+from scenes import create_intersecting_ellipses
+
+# Number of positions evaluated within one round
+N_POSITIONS = 20
+
+
+def evaluate_gamma(obstacle_environment, positions):
+    for obs in obstacle_environment:
+        for ii in range(positions.shape[1]):
+            obs.get_gamma(positions[:, ii], in_global_frame=True)
+
+
+def evaluate_normal_direction(obstacle_environment, positions):
+    for obs in obstacle_environment:
+        for ii in range(positions.shape[1]):
+            obs.get_normal_direction(positions[:, ii], in_global_frame=True)
+
+
+def test_get_gamma(benchmark, scene):
+    benchmark(
+        evaluate_gamma, scene.obstacle_environment, scene.positions[:, :N_POSITIONS]
+    )
+
+
+def test_get_normal_direction(benchmark, scene):
+    benchmark(
+        evaluate_normal_direction,
+        scene.obstacle_environment,
+        scene.positions[:, :N_POSITIONS],
+    )
+
+
+def test_update_reference_points(benchmark):
+    obstacle_environment = create_intersecting_ellipses()
+    displacements = itertools.cycle(
+        [np.array([0.01, -0.005]), np.array([-0.01, 0.005])]
+    )
+
+    def move_obstacles():
+        # Moved obstacles are searched again in every round (no skipped pairs)
+        displacement = next(displacements)
+        for obs in obstacle_environment:
+            obs.center_position = obs.center_position + displacement
+
+    benchmark.pedantic(
+        obstacle_environment.update_reference_points,
+        setup=move_obstacles,
+        rounds=50,
+        warmup_rounds=1,
+    )
+
+    assert all(
+        np.all(np.isfinite(obs.global_reference_point)) for obs in obstacle_environment
+    )
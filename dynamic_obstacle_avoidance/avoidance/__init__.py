@@ -5,6 +5,7 @@ The :mod:`dynamic_obstacle_avoidance` module implements mixture modeling algorit
 
 # from .utils import *   # Added this to avoid 'circular'-error
 from .modulation import obs_avoidance_interpolation_moving
+from .modulation import obs_avoidance_interpolation_moving_batch
 from .repulsion_modulation import obs_avoidance_nonlinear_hirarchy
 from .comparison_algorithms import (
     obs_avoidance_potential_field,
@@ -13,9 +14,13 @@ from .comparison_algorithms import (
 
 # Addition classes / functions
 from .rk4 import obs_avoidance_rk4, obs_avoidance_rungeKutta
+from .rk4 import obs_avoidance_rk4_batch, integrate_trajectories_rk4
+from .adaptive_integration import DormandPrinceIntegrator, AdaptiveTrajectory
 
 # Avoider Classes
 from .modulation import ModulationAvoider
+from .modulation import ModulationWorkspace
+from .profiling import ModulationProfiler
 from .base_avoider import BaseAvoider
 from .obstacle_avoider import ObstacleAvoiderWithInitialDynamcis
 from .dynamic_crowd_avoider import DynamicCrowdAvoider
@@ -23,12 +28,19 @@ from .dynamic_crowd_avoider import DynamicCrowdAvoider
 __all__ = [
     "obs_avoidance_rk4",
     "obs_avoidance_rungeKutta",
+    "obs_avoidance_rk4_batch",
+    "integrate_trajectories_rk4",
+    "DormandPrinceIntegrator",
+    "AdaptiveTrajectory",
     "obs_avoidance_interpolation_moving",
+    "obs_avoidance_interpolation_moving_batch",
     "obs_avoidance_nonlinear_hirarchy",
     "obs_avoidance_potential_field",
     "obs_avoidance_orthogonal_moving",
     "ObstacleAvoiderWithInitialDynamcis",
     "DynamicCrowdAvoider",
     "ModulationAvoider",
+    "ModulationWorkspace",
+    "ModulationProfiler",
     "BaseAvoider",
 ]
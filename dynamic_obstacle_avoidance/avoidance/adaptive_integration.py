@@ -0,0 +1,173 @@
+"""
+Adaptive step integration (Dormand-Prince 5(4)) of the avoidance dynamics.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy import linalg as LA
+
+from scipy.integrate import RK45, OdeSolution
+
+from .base_avoider import BaseAvoider
+
+
+@dataclass
+class AdaptiveTrajectory:
+    """Trajectory of the adaptive integration.
+
+    Attributes
+    ----------
+    times: (n_steps + 1) array of the (accepted) step times
+    positions: (dimension, n_steps + 1) array of the positions at the step times
+    dense_output: continuous (4th-order) interpolant between the steps; None if no
+        step was done
+    n_evaluations: number of evaluations of the avoider
+    has_converged: True if the integration stopped at the attractor
+    """
+
+    times: np.ndarray
+    positions: np.ndarray
+    dense_output: Optional[OdeSolution]
+    n_evaluations: int
+    has_converged: bool
+
+    def get_position(self, time: float | np.ndarray) -> np.ndarray:
+        """Interpolated position(s) for time(s) in [times[0], times[-1]]."""
+        if self.dense_output is None:
+            # Constant trajectory
+            if np.ndim(time):
+                return np.tile(self.positions[:, :1], (1, np.size(time)))
+            return self.positions[:, 0]
+
+        return self.dense_output(time)
+
+
+class DormandPrinceIntegrator:
+    """Adaptive integration of the (avoided) dynamics of an avoider with the
+    embedded Runge-Kutta method of Dormand-Prince of order 5(4) (scipy's RK45).
+
+    The step size is controlled by the error estimate with the tolerances rtol and
+    atol. Additionally, the step is bounded by the distance to the obstacles, i.e.,
+    the path length of a step is at most gamma_step_factor * (gamma - 1), with the
+    minimum gamma of the environment at the start of the step.
+
+    Attributes
+    ----------
+    avoider: `BaseAvoider` whose `evaluate` is integrated (or any object with an
+        evaluate function and an obstacle_environment)
+    max_step: global maximum time step
+    min_step: lower bound of the maximum step close to (or within) obstacles
+    convergence_margin: the integration stops once the velocity is below
+    """
+
+    def __init__(
+        self,
+        avoider: BaseAvoider,
+        rtol: float = 1e-4,
+        atol: float = 1e-6,
+        max_step: float = np.inf,
+        min_step: float = 1e-4,
+        gamma_step_factor: float = 0.5,
+        convergence_margin: float = 1e-3,
+    ):
+        self.avoider = avoider
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.min_step = min_step
+        self.gamma_step_factor = gamma_step_factor
+        self.convergence_margin = convergence_margin
+
+        self.n_evaluations = 0
+
+    def evaluate(self, time: float, position: np.ndarray) -> np.ndarray:
+        self.n_evaluations += 1
+        return self.avoider.evaluate(position)
+
+    def get_minimum_gamma(self, position: np.ndarray) -> float:
+        obstacle_environment = self.avoider.obstacle_environment
+        if obstacle_environment is None or not len(obstacle_environment):
+            return np.inf
+
+        if hasattr(obstacle_environment, "get_minimum_gamma"):
+            return obstacle_environment.get_minimum_gamma(position)
+
+        return min(
+            obs.get_gamma(position, in_global_frame=True)
+            for obs in obstacle_environment
+        )
+
+    def get_max_step(self, position: np.ndarray, velocity: np.ndarray) -> float:
+        """Maximum time step at position given its velocity."""
+        if self.gamma_step_factor is None:
+            return self.max_step
+
+        speed = LA.norm(velocity)
+        if not speed:
+            return self.max_step
+
+        gamma = self.get_minimum_gamma(position)
+        max_step = self.gamma_step_factor * (gamma - 1) / speed
+        return min(max(max_step, self.min_step), self.max_step)
+
+    def integrate(
+        self,
+        position_init: np.ndarray,
+        time_max: float,
+        first_step: float = None,
+        max_evaluations: int = None,
+    ) -> AdaptiveTrajectory:
+        """Integrates from position_init until time_max, convergence or until the
+        maximum number of evaluations is reached."""
+        self.n_evaluations = 0
+
+        solver = RK45(
+            self.evaluate,
+            t0=0,
+            y0=np.array(position_init, dtype=float),
+            t_bound=time_max,
+            rtol=self.rtol,
+            atol=self.atol,
+            max_step=self.max_step,
+            first_step=first_step,
+        )
+
+        times = [solver.t]
+        positions = [np.copy(solver.y)]
+        interpolants = []
+        has_converged = False
+
+        while solver.status == "running":
+            # The first stage is the last evaluation (first same as last)
+            velocity = solver.f
+            if LA.norm(velocity) < self.convergence_margin:
+                has_converged = True
+                break
+
+            if max_evaluations is not None and self.n_evaluations >= max_evaluations:
+                break
+
+            solver.max_step = self.get_max_step(solver.y, velocity)
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(f"Adaptive integration failed: {message}")
+
+            times.append(solver.t)
+            positions.append(np.copy(solver.y))
+            interpolants.append(solver.dense_output())
+
+        times = np.array(times)
+        if interpolants:
+            dense_output = OdeSolution(times, interpolants)
+        else:
+            dense_output = None
+
+        return AdaptiveTrajectory(
+            times=times,
+            positions=np.array(positions).T,
+            dense_output=dense_output,
+            n_evaluations=self.n_evaluations,
+            has_converged=has_converged,
+        )
@@ -5,6 +5,7 @@ Library for the Modulation of Linear Systems
 # Email: hubernikus@gmail.com
 # License: BSD (c) 2021
 import warnings
+from time import perf_counter
 
 import numpy as np
 import numpy.linalg as LA
@@ -13,10 +14,17 @@ from vartools.directional_space import get_directional_weighted_sum
 from vartools.dynamical_systems import DynamicalSystem
 
 from dynamic_obstacle_avoidance.utils import get_relative_obstacle_velocity
+from dynamic_obstacle_avoidance.utils import get_relative_obstacle_velocity_batch
 from dynamic_obstacle_avoidance.utils import get_orthogonal_basis
+from dynamic_obstacle_avoidance.utils import get_orthogonal_basis_batch
+from dynamic_obstacle_avoidance.utils import get_directional_weighted_sum_batch
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix_batch
 from dynamic_obstacle_avoidance.utils import compute_weights
+from dynamic_obstacle_avoidance.utils import compute_weights_batch
 
 from .base_avoider import BaseAvoider
+from .profiling import get_active_profiler
 
 
 class ModulationAvoider(BaseAvoider):
@@ -25,12 +33,19 @@ class ModulationAvoider(BaseAvoider):
         initial_dynamics: DynamicalSystem = None,
         # convergence_system: DynamicalSystem = None,
         obstacle_environment=None,
+        influence_distance: float = None,
     ):
-        """Initial dynamics, convergence direction and obstacle list are used."""
+        """Initial dynamics, convergence direction and obstacle list are used.
+        If an influence_distance is given, far obstacles are culled."""
         super().__init__(
             initial_dynamics=initial_dynamics, obstacle_environment=obstacle_environment
         )
 
+        self.influence_distance = influence_distance
+
+        # Work buffers are created at the first evaluation
+        self.workspace = None
+
         # if convergence_system is None:
         #     self.convergence_system = self.initial_dynamics
         # else:
@@ -42,11 +57,130 @@ class ModulationAvoider(BaseAvoider):
         velocity: np.ndarray,
     ) -> np.ndarray:
         """Obstacle avoidance based on 'local' rotation and the directional weighted mean."""
+        if self.workspace is None or self.workspace.dimension != position.shape[0]:
+            self.workspace = ModulationWorkspace(
+                dimension=position.shape[0],
+                max_obstacles=len(self.obstacle_environment),
+            )
+
         return obs_avoidance_interpolation_moving(
-            position, velocity, self.obstacle_environment
+            position,
+            velocity,
+            self.obstacle_environment,
+            workspace=self.workspace,
+            influence_distance=self.influence_distance,
+        )
+
+    @property
+    def n_culled_obstacles(self) -> int:
+        """Number of obstacles culled in the last call of avoid()."""
+        if self.workspace is None:
+            return 0
+        return self.workspace.n_culled_obstacles
+
+    def avoid_batch(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+    ) -> np.ndarray:
+        """Obstacle avoidance of many points at once, positions and velocities are
+        of shape (dimension, n_points). Far obstacles are culled as in avoid()."""
+        return obs_avoidance_interpolation_moving_batch(
+            positions,
+            velocities,
+            self.obstacle_environment,
+            influence_distance=self.influence_distance,
         )
 
 
+class ModulationWorkspace:
+    """Preallocated work buffers of the modulation, which are reused across calls of
+    `obs_avoidance_interpolation_moving` (e.g. in a high-frequency control loop).
+
+    The buffers are sized for (dimension, max_obstacles) and grow if an environment
+    with more obstacles is evaluated. `get_buffers(n_obstacles)` returns views of the
+    first n_obstacles columns; their content is overwritten with each evaluation.
+    The views are only recreated if the number of obstacles changes.
+
+    Attributes
+    ----------
+    pos_relative: (dimension, max_obstacles) array
+    gamma: (max_obstacles) array
+    normal, reference_direction: (dimension, max_obstacles) arrays
+    eigenvalues: (dimension, max_obstacles) array of the diagonal of D
+    E, E_orth: (dimension, dimension, max_obstacles) arrays
+    E_inv: (dimension, dimension) array of the inverse of the current E
+    relative_velocity_trafo, stretched_velocity: (dimension) arrays of the
+        relative velocity in the basis E (before and after the stretching by D)
+    relative_velocity_hat, relative_velocity_hat_normalized:
+        (dimension, max_obstacles) arrays
+    relative_velocity_hat_magnitude: (max_obstacles) array
+    n_culled_obstacles: number of obstacles skipped in the last evaluation
+        (when evaluated with an influence distance)
+    n_allocations: number of (re-)allocations of the buffers
+    """
+
+    def __init__(self, dimension: int, max_obstacles: int = 10):
+        self.dimension = dimension
+        self.n_allocations = 0
+        self.allocate(max_obstacles)
+
+        # Diagnostics of the last evaluation with an influence distance
+        self.n_culled_obstacles = 0
+
+    @property
+    def max_obstacles(self) -> int:
+        return self.gamma.shape[0]
+
+    def allocate(self, max_obstacles: int) -> None:
+        self.n_allocations += 1
+        dim = self.dimension
+        self.pos_relative = np.zeros((dim, max_obstacles))
+        self.gamma = np.zeros(max_obstacles)
+        self.normal = np.zeros((dim, max_obstacles))
+        self.reference_direction = np.zeros((dim, max_obstacles))
+        self.eigenvalues = np.zeros((dim, max_obstacles))
+        self.E = np.zeros((dim, dim, max_obstacles))
+        self.E_orth = np.zeros((dim, dim, max_obstacles))
+        self.E_inv = np.zeros((dim, dim))
+        self.relative_velocity_trafo = np.zeros(dim)
+        self.stretched_velocity = np.zeros(dim)
+        self.relative_velocity_hat = np.zeros((dim, max_obstacles))
+        self.relative_velocity_hat_normalized = np.zeros((dim, max_obstacles))
+        self.relative_velocity_hat_magnitude = np.zeros(max_obstacles)
+        self._buffers = None
+
+    def get_buffers(self, n_obstacles: int) -> dict:
+        """Returns the (views of the) buffers for n_obstacles."""
+        if n_obstacles > self.max_obstacles:
+            # Grow silently, since this is evaluated within the control loop
+            self.allocate(n_obstacles)
+
+        if self._buffers is not None and self._buffers["gamma"].shape[0] == n_obstacles:
+            return self._buffers
+
+        self._buffers = {
+            "pos_relative": self.pos_relative[:, :n_obstacles],
+            "gamma": self.gamma[:n_obstacles],
+            "normal": self.normal[:, :n_obstacles],
+            "reference_direction": self.reference_direction[:, :n_obstacles],
+            "eigenvalues": self.eigenvalues[:, :n_obstacles],
+            "E": self.E[:, :, :n_obstacles],
+            "E_orth": self.E_orth[:, :, :n_obstacles],
+            "E_inv": self.E_inv,
+            "relative_velocity_trafo": self.relative_velocity_trafo,
+            "stretched_velocity": self.stretched_velocity,
+            "relative_velocity_hat": self.relative_velocity_hat[:, :n_obstacles],
+            "relative_velocity_hat_normalized": (
+                self.relative_velocity_hat_normalized[:, :n_obstacles]
+            ),
+            "relative_velocity_hat_magnitude": (
+                self.relative_velocity_hat_magnitude[:n_obstacles]
+            ),
+        }
+        return self._buffers
+
+
 def get_sticky_surface_imiation(relative_velocity, Gamma, E_orth, obs):
     # TODO: test & review sticky surface feature [!]
     relative_velocity_norm = np.linalg.norm(relative_velocity)
@@ -93,6 +227,49 @@ def get_sticky_surface_imiation(relative_velocity, Gamma, E_orth, obs):
             )
 
 
+def get_obstacles_within_influence(obs, position, influence_distance):
+    """Returns the obstacles (list) whose bounding sphere is closer to the position
+    than the influence_distance, and the number of culled obstacles.
+
+    Boundaries and obstacles without bounding radius are never culled.
+    The spatial index of the container is used if it has one."""
+    if getattr(obs, "has_spatial_index", False):
+        indices = obs.query_radius(position, influence_distance)
+        return [obs[ii] for ii in indices], len(obs) - len(indices)
+
+    influencing_obstacles = []
+    for obstacle in obs:
+        if not obstacle.is_boundary:
+            bounding_radius = obstacle.get_bounding_radius()
+            if bounding_radius is not None and (
+                LA.norm(position - obstacle.center_position) - bounding_radius
+                > influence_distance
+            ):
+                continue
+        influencing_obstacles.append(obstacle)
+
+    return influencing_obstacles, len(obs) - len(influencing_obstacles)
+
+
+def get_influence_mask(obs, positions, influence_distance):
+    """Returns the (n_obstacles, n_points) boolean array of the obstacles whose
+    bounding sphere is closer to the positions than the influence_distance, i.e.,
+    the array version of `get_obstacles_within_influence`."""
+    is_influencing = np.ones((len(obs), positions.shape[1]), dtype=bool)
+    for oo, obstacle in enumerate(obs):
+        if obstacle.is_boundary:
+            continue
+        bounding_radius = obstacle.get_bounding_radius()
+        if bounding_radius is None:
+            continue
+        distances = LA.norm(
+            positions - np.reshape(obstacle.center_position, (-1, 1)), axis=0
+        )
+        is_influencing[oo, :] = distances - bounding_radius <= influence_distance
+
+    return is_influencing
+
+
 def compute_diagonal_matrix(
     Gamma,
     dim,
@@ -105,6 +282,34 @@ def compute_diagonal_matrix(
     self_priority=1,
 ):
     """Compute diagonal Matrix"""
+    return np.diag(
+        compute_diagonal_eigenvalues(
+            Gamma,
+            dim,
+            rho=rho,
+            repulsion_coeff=repulsion_coeff,
+            tangent_eigenvalue_isometric=tangent_eigenvalue_isometric,
+            tangent_power=tangent_power,
+            treat_obstacle_special=treat_obstacle_special,
+            self_priority=self_priority,
+        )
+    )
+
+
+def compute_diagonal_eigenvalues(
+    Gamma,
+    dim,
+    rho=1,
+    repulsion_coeff=1.0,
+    tangent_eigenvalue_isometric=True,
+    tangent_power=5,
+    treat_obstacle_special=True,
+    self_priority=1,
+    out=None,
+):
+    """Compute the diagonal (eigenvalues) of the modulation, i.e., the reference
+    eigenvalue followed by the (dim-1) tangent eigenvalues.
+    The result is written into 'out' if an array of shape (dim,) is given."""
     if Gamma <= 1 and treat_obstacle_special:
         # Point inside the obstacle
         delta_eigenvalue = 1
@@ -117,17 +322,34 @@ def compute_diagonal_matrix(
     else:
         # Decreasing velocity in order to reach zero on surface
         eigenvalue_tangent = 1 - 1.0 / abs(Gamma) ** tangent_power
-    return np.diag(
-        np.hstack((eigenvalue_reference, np.ones(dim - 1) * eigenvalue_tangent))
-    )
-
 
-def compute_decomposition_matrix(obs, x_t, in_global_frame=False, dot_margin=0.02):
-    """Compute decomposition matrix and orthogonal matrix to basis"""
-    normal_vector = obs.get_normal_direction(x_t, in_global_frame=in_global_frame)
-    reference_direction = obs.get_reference_direction(
-        x_t, in_global_frame=in_global_frame
-    )
+    if out is None:
+        out = np.empty(dim)
+    out[0] = eigenvalue_reference
+    out[1:] = eigenvalue_tangent
+    return out
+
+
+def compute_decomposition_matrix(
+    obs,
+    x_t,
+    in_global_frame=False,
+    dot_margin=0.02,
+    normal_vector=None,
+    reference_direction=None,
+    out=None,
+):
+    """Compute decomposition matrix and orthogonal matrix to basis.
+    Already evaluated normal and reference directions can be passed.
+    If out, the tuple of the (E, E_orth) arrays, is given, the matrices are written
+    to it instead of new arrays."""
+    if normal_vector is None:
+        normal_vector = obs.get_normal_direction(x_t, in_global_frame=in_global_frame)
+
+    if reference_direction is None:
+        reference_direction = obs.get_reference_direction(
+            x_t, in_global_frame=in_global_frame
+        )
 
     dot_prod = np.dot(normal_vector, reference_direction)
     if obs.is_non_starshaped and np.abs(dot_prod) < dot_margin:
@@ -144,13 +366,78 @@ def compute_decomposition_matrix(obs, x_t, in_global_frame=False, dot_margin=0.0
                 weights=np.array([weight, (1 - weight)]),
             )
 
-    E_orth = get_orthogonal_basis(normal_vector, normalize=True)
-    E = np.copy((E_orth))
+    if out is None:
+        E_orth = get_orthogonal_basis(normal_vector, normalize=True)
+        E = np.copy((E_orth))
+    else:
+        E, E_orth = out
+        E_orth[:, :] = get_orthogonal_basis(normal_vector, normalize=True)
+        E[:, :] = E_orth
     E[:, 0] = -reference_direction
 
     return E, E_orth
 
 
+def compute_decomposition_matrix_batch(obs, positions, dot_margin=0.02):
+    """Compute decomposition matrices and orthogonal matrices to the basis for
+    positions of shape (dimension, n_points) given in the global frame.
+
+    Returns arrays of shape (dimension, dimension, n_points)."""
+    normal_vectors = get_normal_direction_batch(obs, positions)
+    reference_directions = get_reference_direction_batch(obs, positions)
+
+    if obs.is_non_starshaped:
+        dot_prod = np.sum(normal_vectors * reference_directions, axis=0)
+        ind_critical = np.abs(dot_prod) < dot_margin
+        if np.sum(ind_critical):
+            # Adapt reference direction to avoid singularities
+            # WARNING: full convergence is not given anymore, but impenetrability
+            ind_zero = np.logical_and(
+                ind_critical, np.logical_not(LA.norm(normal_vectors, axis=0))
+            )
+            normal_vectors[:, ind_zero] = (-1) * reference_directions[:, ind_zero]
+
+            ind_critical = np.logical_and(ind_critical, np.logical_not(ind_zero))
+            if np.sum(ind_critical):
+                weight = np.abs(dot_prod[ind_critical]) / dot_margin
+                dir_norm = np.copysign(1, dot_prod[ind_critical])
+                normals = normal_vectors[:, ind_critical]
+                reference_directions[
+                    :, ind_critical
+                ] = get_directional_weighted_sum_batch(
+                    null_directions=normals,
+                    directions=np.stack(
+                        (reference_directions[:, ind_critical], dir_norm * normals),
+                        axis=1,
+                    ),
+                    weights=np.vstack((weight, (1 - weight))),
+                )
+
+    E_orth = get_orthogonal_basis_batch(normal_vectors)
+    E = np.copy(E_orth)
+    E[:, 0, :] = -reference_directions
+
+    return E, E_orth
+
+
+def get_gamma_batch(obs, positions):
+    """Returns the gamma values of shape (n_points) of one obstacle for
+    positions of shape (dimension, n_points) given in the global frame."""
+    return obs.get_gamma_array(positions, in_global_frame=True)
+
+
+def get_normal_direction_batch(obs, positions):
+    """Returns the normal directions of shape (dimension, n_points) of one
+    obstacle for positions of shape (dimension, n_points) in the global frame."""
+    return obs.get_normal_direction_array(positions, in_global_frame=True)
+
+
+def get_reference_direction_batch(obs, positions):
+    """Returns the reference directions of shape (dimension, n_points) of one
+    obstacle for positions of shape (dimension, n_points) in the global frame."""
+    return obs.get_reference_direction_array(positions, in_global_frame=True)
+
+
 def compute_modulation_matrix(
     x_t, obs, matrix_singularity_margin=np.pi / 2.0 * 1.05, angular_vel_weight=0
 ):
@@ -210,6 +497,9 @@ def obs_avoidance_interpolation_moving(
     gamma_distance=None,
     xd=None,
     self_priority=1,
+    workspace=None,
+    influence_distance=None,
+    profiler=None,
 ):
     """
     This function modulates the dynamical system at position x and dynamics xd
@@ -224,11 +514,31 @@ def obs_avoidance_interpolation_moving(
         present in the local environment
     attractor [list of [dim]]]: list of positions of all attractors
     weightPow [int]: hyperparameter which defines the evaluation of the weight
+    workspace [ModulationWorkspace]: preallocated buffers which are reused
+        (a temporary workspace is created if none is given)
+    influence_distance [float]: if given, obstacles whose bounding sphere is further
+        away are ignored before evaluating gamma (the number of culled obstacles
+        is stored in the workspace)
+    profiler [ModulationProfiler]: accumulates the time of the stages (by default
+        the profiler of an active `with ModulationProfiler()` context is used)
 
     Return
     ------
     xd [dim]: modulated dynamical system at position x
     """
+    if profiler is None:
+        profiler = get_active_profiler()
+    if profiler is not None:
+        profiler.n_evaluations += 1
+
+    n_culled = 0
+    if influence_distance is not None:
+        obs, n_culled = get_obstacles_within_influence(
+            obs, position, influence_distance
+        )
+    if workspace is not None:
+        workspace.n_culled_obstacles = n_culled
+
     N_obs = len(obs)
 
     if not N_obs:  # No obstacles
@@ -236,22 +546,38 @@ def obs_avoidance_interpolation_moving(
 
     dim = obs[0].dimension
 
+    if workspace is None:
+        workspace = ModulationWorkspace(dimension=dim, max_obstacles=N_obs)
+    buffers = workspace.get_buffers(N_obs)
+
+    pos_relative = buffers["pos_relative"]
     if evaluate_in_global_frame:
-        pos_relative = np.tile(position, (N_obs, 1)).T
+        pos_relative[:, :] = position[:, np.newaxis]
 
     else:
-        pos_relative = np.zeros((dim, N_obs))
         for n in range(N_obs):
             # Move to obstacle centered frame
             pos_relative[:, n] = obs[n].transform_global2relative(position)
 
     # Two (Gamma) weighting functions lead to better behavior when agent &
     # obstacle size differs largely.
-    Gamma = np.zeros((N_obs))
+    Gamma = buffers["gamma"]
+    normals = buffers["normal"]
+    reference_directions = buffers["reference_direction"]
     for n in range(N_obs):
-        Gamma[n] = obs[n].get_gamma(
+        if profiler is not None:
+            time_start = perf_counter()
+
+        # Gamma, normal and reference direction are evaluated together
+        local_geometry = obs[n].get_local_geometry(
             pos_relative[:, n], in_global_frame=evaluate_in_global_frame
         )
+        Gamma[n] = local_geometry.gamma
+        normals[:, n] = local_geometry.normal
+        reference_directions[:, n] = local_geometry.reference_direction
+
+        if profiler is not None:
+            profiler.add("local_geometry", perf_counter() - time_start, obs[n])
 
         if obs[n].is_boundary:
             pass
@@ -271,30 +597,49 @@ def obs_avoidance_interpolation_moving(
     if any(~ind_obs):
         return initial_velocity
 
+    if profiler is not None:
+        time_start = perf_counter()
+
     weight = compute_weights(Gamma)
 
-    # Modulation matrices
-    E = np.zeros((dim, dim, N_obs))
-    D = np.zeros((dim, dim, N_obs))
-    E_orth = np.zeros((dim, dim, N_obs))
+    if profiler is not None:
+        profiler.add("weights", perf_counter() - time_start)
+
+    # Modulation matrices (only the diagonal of D is stored)
+    E = buffers["E"]
+    D_diag = buffers["eigenvalues"]
+    E_orth = buffers["E_orth"]
 
     for n in np.arange(N_obs)[ind_obs]:
+        if profiler is not None:
+            time_start = perf_counter()
+
         # x_t = obs[n].transform_global2relative(x) # Move to obstacle centered frame
-        D[:, :, n] = compute_diagonal_matrix(
+        compute_diagonal_eigenvalues(
             Gamma[n],
             dim,
             repulsion_coeff=obs[n].repulsion_coeff,
             tangent_eigenvalue_isometric=tangent_eigenvalue_isometric,
             rho=obs[n].reactivity,
             self_priority=self_priority,
+            out=D_diag[:, n],
         )
 
-        E[:, :, n], E_orth[:, :, n] = compute_decomposition_matrix(
+        compute_decomposition_matrix(
             obs[n],
             pos_relative[:, n],
             in_global_frame=evaluate_in_global_frame,
+            normal_vector=normals[:, n],
+            reference_direction=reference_directions[:, n],
+            out=(E[:, :, n], E_orth[:, :, n]),
         )
 
+        if profiler is not None:
+            profiler.add("decomposition", perf_counter() - time_start, obs[n])
+
+    if profiler is not None:
+        time_start = perf_counter()
+
     xd_obs = get_relative_obstacle_velocity(
         position=position,
         obstacle_list=obs,
@@ -303,6 +648,9 @@ def obs_avoidance_interpolation_moving(
         weights=weight,
     )
 
+    if profiler is not None:
+        profiler.add("relative_velocity", perf_counter() - time_start)
+
     # Computing the relative velocity with respect to the obstacle
     relative_velocity = initial_velocity - xd_obs
 
@@ -315,11 +663,14 @@ def obs_avoidance_interpolation_moving(
         return xd_obs
 
     # Keep either way, since avoidance from attractor might be needed
-    relative_velocity_hat = np.zeros((dim, N_obs))
-    relative_velocity_hat_magnitude = np.zeros((N_obs))
+    relative_velocity_hat = buffers["relative_velocity_hat"]
+    relative_velocity_hat_magnitude = buffers["relative_velocity_hat_magnitude"]
 
     n = 0
     for n in np.arange(N_obs)[ind_obs]:
+        if profiler is not None:
+            time_start = perf_counter()
+
         if obs[n].repulsion_coeff > 1 and E_orth[:, 0, n].T.dot(relative_velocity) < 0:
             # Only consider boundary when moving towards (normal direction)
             # OR if the object has positive repulsion-coefficient (only consider
@@ -333,33 +684,38 @@ def obs_avoidance_interpolation_moving(
                     relative_velocity
                 )
             else:
-                relative_velocity_temp = np.copy(relative_velocity)
+                relative_velocity_temp = relative_velocity
 
             # Modulation with M = E @ D @ E^-1
-            relative_velocity_trafo = np.linalg.pinv(E[:, :, n]).dot(
-                relative_velocity_temp
+            E_inv = get_inverse_of_decomposition_matrix(
+                E[:, :, n], E_orth[:, :, n], out=buffers["E_inv"]
+            )
+            relative_velocity_trafo = np.dot(
+                E_inv, relative_velocity_temp, out=buffers["relative_velocity_trafo"]
             )
 
             if obs[n].repulsion_coeff < 0:
                 # Negative Repulsion Coefficient at the back of an obstacle
                 if E_orth[:, 0, n].T.dot(relative_velocity) < 0:
                     # Adapt in reference direction
-                    D[0, 0, n] = 2 - D[0, 0, n]
+                    D_diag[0, n] = 2 - D_diag[0, n]
 
             # relative_velocity_trafo[0]>0
             elif not obs[n].tail_effect and (
                 (relative_velocity_trafo[0] > 0 and not obs[n].is_boundary)
                 or (relative_velocity_trafo[0] < 0 and obs[n].is_boundary)
             ):
-                D[0, 0, n] = 1  # No effect in 'radial direction'
-            stretched_velocity = D[:, :, n].dot(relative_velocity_trafo)
+                D_diag[0, n] = 1  # No effect in 'radial direction'
+            stretched_velocity = np.multiply(
+                D_diag[:, n], relative_velocity_trafo, out=buffers["stretched_velocity"]
+            )
 
-            if D[0, 0, n] < 0:
+            if D_diag[0, n] < 0:
                 # Repulsion in tangent direction, too, have really active repulsion
                 factor_tangent_repulsion = 2
                 tang_vel_norm = LA.norm(relative_velocity_trafo[1:])
                 stretched_velocity[0] += (
-                    (-1) * D[0, 0, n] * tang_vel_norm * factor_tangent_repulsion
+                    (-1) * D_diag[0, n] * tang_vel_norm * factor_tangent_repulsion
                 )
 
             relative_velocity_hat[:, n] = E[:, :, n].dot(stretched_velocity)
@@ -394,7 +750,14 @@ def obs_avoidance_interpolation_moving(
             np.sum(relative_velocity_hat[:, n] ** 2)
         )
 
-    relative_velocity_hat_normalized = np.zeros(relative_velocity_hat.shape)
+        if profiler is not None:
+            profiler.add("stretching", perf_counter() - time_start, obs[n])
+
+    if profiler is not None:
+        time_start = perf_counter()
+
+    relative_velocity_hat_normalized = buffers["relative_velocity_hat_normalized"]
+    relative_velocity_hat_normalized.fill(0)
     ind_nonzero = relative_velocity_hat_magnitude > 0
     if np.sum(ind_nonzero):
         relative_velocity_hat_normalized[:, ind_nonzero] = relative_velocity_hat[
@@ -421,4 +784,259 @@ def obs_avoidance_interpolation_moving(
     vel_final = relative_velocity_magnitude * weighted_direction.squeeze()
 
     vel_final = vel_final + xd_obs
+
+    if profiler is not None:
+        profiler.add("weighted_sum", perf_counter() - time_start)
+
     return vel_final
+
+
+def obs_avoidance_interpolation_moving_batch(
+    positions,
+    initial_velocities,
+    obs=[],
+    repulsive_gammaMargin=0.01,
+    repulsive_obstacle=False,
+    zero_vel_inside=False,
+    cut_off_gamma=1e6,
+    tangent_eigenvalue_isometric=True,
+    self_priority=1,
+    influence_distance=None,
+):
+    """
+    Array version of 'obs_avoidance_interpolation_moving', which modulates the
+    dynamical system at many positions at once (evaluated in the global frame).
+    The result of each column equals the point-wise evaluation.
+
+    Parameters
+    ----------
+    positions [dim x n_points]: positions at which the modulation is happening
+    initial_velocities [dim x n_points]: initial dynamical system at the positions
+    obs [list of obstacle_class]: a list of all obstacles and their properties, which
+        present in the local environment
+    influence_distance [float]: if given, obstacles whose bounding sphere is further
+        away are ignored (for each point separately)
+
+    Return
+    ------
+    velocities [dim x n_points]: modulated dynamical system at the positions
+    """
+    positions = np.array(positions, dtype=float)
+    initial_velocities = np.array(initial_velocities, dtype=float)
+
+    N_obs = len(obs)
+    if not N_obs:  # No obstacles
+        return initial_velocities
+
+    dim, n_points = positions.shape
+
+    if influence_distance is not None:
+        # Points with the same influencing obstacles are evaluated together
+        is_influencing = get_influence_mask(obs, positions, influence_distance)
+        subsets, ind_subset = np.unique(is_influencing, axis=1, return_inverse=True)
+        ind_subset = np.ravel(ind_subset)
+
+        velocities = np.zeros((dim, n_points))
+        for it_subset in range(subsets.shape[1]):
+            ind_points = ind_subset == it_subset
+            velocities[:, ind_points] = obs_avoidance_interpolation_moving_batch(
+                positions[:, ind_points],
+                initial_velocities[:, ind_points],
+                [obs[oo] for oo in np.flatnonzero(subsets[:, it_subset])],
+                repulsive_gammaMargin=repulsive_gammaMargin,
+                repulsive_obstacle=repulsive_obstacle,
+                zero_vel_inside=zero_vel_inside,
+                cut_off_gamma=cut_off_gamma,
+                tangent_eigenvalue_isometric=tangent_eigenvalue_isometric,
+                self_priority=self_priority,
+            )
+        return velocities
+
+    if any(oo.is_deforming for oo in obs):
+        # Deformation velocities are only available point-wise
+        velocities = np.zeros((dim, n_points))
+        for ii in range(n_points):
+            velocities[:, ii] = obs_avoidance_interpolation_moving(
+                positions[:, ii],
+                initial_velocities[:, ii],
+                obs,
+                repulsive_gammaMargin=repulsive_gammaMargin,
+                repulsive_obstacle=repulsive_obstacle,
+                zero_vel_inside=zero_vel_inside,
+                cut_off_gamma=cut_off_gamma,
+                tangent_eigenvalue_isometric=tangent_eigenvalue_isometric,
+                self_priority=self_priority,
+            )
+        return velocities
+
+    Gamma = np.zeros((N_obs, n_points))
+    for n in range(N_obs):
+        Gamma[n, :] = get_gamma_batch(obs[n], positions)
+
+    velocities = np.copy(initial_velocities)
+
+    # Worst case of being at the center
+    ind_zero = np.any(Gamma == 0, axis=0)
+    if zero_vel_inside:
+        ind_zero = np.logical_or(ind_zero, np.any(Gamma < 1, axis=0))
+    velocities[:, ind_zero] = 0
+
+    # Points with any obstacle beyond the cut-off keep the initial velocity
+    ind_eval = np.logical_and(
+        np.logical_not(ind_zero), np.all(Gamma < cut_off_gamma, axis=0)
+    )
+    if not np.sum(ind_eval):
+        return velocities
+
+    position = positions[:, ind_eval]
+    Gamma = Gamma[:, ind_eval]
+    n_eval = position.shape[1]
+
+    weight = compute_weights_batch(Gamma)
+
+    # Modulation matrices
+    E = np.zeros((dim, dim, N_obs, n_eval))
+    E_orth = np.zeros((dim, dim, N_obs, n_eval))
+    for n in range(N_obs):
+        E[:, :, n, :], E_orth[:, :, n, :] = compute_decomposition_matrix_batch(
+            obs[n], position
+        )
+
+    # Eigenvalues of the diagonal matrices (reference & tangent)
+    repulsion_coeff = np.array([oo.repulsion_coeff for oo in obs])[:, np.newaxis]
+    reactivity = np.array([oo.reactivity for oo in obs])[:, np.newaxis]
+    is_boundary = np.array([oo.is_boundary for oo in obs])[:, np.newaxis]
+    tail_effect = np.array([oo.tail_effect for oo in obs])[:, np.newaxis]
+
+    delta_eigenvalue = np.where(
+        Gamma <= 1, 1, 1.0 / np.abs(Gamma) ** (self_priority / reactivity)
+    )
+    eigenvalue_reference = 1 - delta_eigenvalue * repulsion_coeff
+    if tangent_eigenvalue_isometric:
+        eigenvalue_tangent = 1 + delta_eigenvalue
+    else:
+        # Decreasing velocity in order to reach zero on surface
+        eigenvalue_tangent = 1 - 1.0 / np.abs(Gamma) ** 5
+
+    xd_obs = get_relative_obstacle_velocity_batch(
+        positions=position,
+        obstacle_list=obs,
+        E_orth=E_orth,
+        gamma_list=Gamma,
+        weights=weight,
+    )
+
+    # Computing the relative velocity with respect to the obstacle
+    relative_velocity = initial_velocities[:, ind_eval] - xd_obs
+    rel_velocity_norm = LA.norm(relative_velocity, axis=0)
+
+    # Zero velocity
+    ind_moving = rel_velocity_norm > 0
+    vel_final = np.copy(xd_obs)
+    if not np.sum(ind_moving):
+        velocities[:, ind_eval] = vel_final
+        return velocities
+
+    relative_velocity = relative_velocity[:, ind_moving]
+    rel_velocity_normalized = relative_velocity / rel_velocity_norm[ind_moving]
+    E = E[:, :, :, ind_moving]
+    E_orth = E_orth[:, :, :, ind_moving]
+    Gamma = Gamma[:, ind_moving]
+    weight = weight[:, ind_moving]
+    eigenvalue_reference = eigenvalue_reference[:, ind_moving]
+    eigenvalue_tangent = eigenvalue_tangent[:, ind_moving]
+
+    normal_velocity = np.sum(
+        E_orth[:, 0, :, :] * relative_velocity[:, np.newaxis, :], axis=0
+    )
+
+    # Modulation with M = E @ D @ E^-1
+    E_inv = get_inverse_of_decomposition_matrix_batch(E, E_orth)
+    relative_velocity_trafo = np.einsum("ijon,jn->ion", E_inv, relative_velocity)
+
+    # Negative Repulsion Coefficient at the back of an obstacle
+    ind_negative = repulsion_coeff < 0
+    ind_back = np.logical_and(ind_negative, normal_velocity < 0)
+    eigenvalue_reference = np.where(
+        ind_back, 2 - eigenvalue_reference, eigenvalue_reference
+    )
+
+    # No effect in 'radial direction'
+    ind_no_effect = np.logical_and(
+        np.logical_and(np.logical_not(ind_negative), np.logical_not(tail_effect)),
+        np.logical_or(
+            np.logical_and(relative_velocity_trafo[0] > 0, np.logical_not(is_boundary)),
+            np.logical_and(relative_velocity_trafo[0] < 0, is_boundary),
+        ),
+    )
+    eigenvalue_reference = np.where(ind_no_effect, 1, eigenvalue_reference)
+
+    stretched_velocity = relative_velocity_trafo * eigenvalue_tangent
+    stretched_velocity[0] = relative_velocity_trafo[0] * eigenvalue_reference
+
+    # Repulsion in tangent direction, too, have really active repulsion
+    ind_repulsive = eigenvalue_reference < 0
+    if np.sum(ind_repulsive):
+        factor_tangent_repulsion = 2
+        tang_vel_norm = LA.norm(relative_velocity_trafo[1:], axis=0)
+        stretched_velocity[0][ind_repulsive] += (
+            (-1)
+            * eigenvalue_reference[ind_repulsive]
+            * tang_vel_norm[ind_repulsive]
+            * factor_tangent_repulsion
+        )
+
+    relative_velocity_hat = np.einsum("ijon,jon->ion", E, stretched_velocity)
+
+    # Only consider boundary when moving towards (normal direction)
+    # OR if the object has positive repulsion-coefficient (only consider
+    # it at front)
+    ind_passive = np.logical_and(repulsion_coeff > 1, normal_velocity < 0)
+    relative_velocity_hat = np.where(
+        ind_passive, relative_velocity[:, np.newaxis, :], relative_velocity_hat
+    )
+
+    if repulsive_obstacle:
+        # Emergency move away from center in case of a collision
+        ind_repulsive = Gamma < (1 + repulsive_gammaMargin)
+        for n in np.arange(N_obs)[np.any(ind_repulsive, axis=1)]:
+            repulsive_power = 5
+            repulsive_factor = 5
+            repulsive_gamma = 1 + repulsive_gammaMargin
+
+            ind_n = ind_repulsive[n, :]
+            repulsive_speed = (
+                (repulsive_gamma / Gamma[n, ind_n]) ** repulsive_power - repulsive_gamma
+            ) * repulsive_factor
+            if not obs[n].is_boundary:
+                repulsive_speed *= -1
+
+            pos_rel = get_reference_direction_batch(
+                obs[n], position[:, ind_moving][:, ind_n]
+            )
+            relative_velocity_hat[:, n, ind_n] = pos_rel * repulsive_speed
+
+    relative_velocity_hat_magnitude = LA.norm(relative_velocity_hat, axis=0)
+
+    relative_velocity_hat_normalized = np.zeros(relative_velocity_hat.shape)
+    ind_nonzero = relative_velocity_hat_magnitude > 0
+    relative_velocity_hat_normalized[:, ind_nonzero] = (
+        relative_velocity_hat[:, ind_nonzero]
+        / relative_velocity_hat_magnitude[ind_nonzero]
+    )
+
+    weighted_direction = get_directional_weighted_sum_batch(
+        null_directions=rel_velocity_normalized,
+        directions=relative_velocity_hat_normalized,
+        weights=weight,
+    )
+
+    relative_velocity_magnitude = np.sum(
+        relative_velocity_hat_magnitude * weight, axis=0
+    )
+    vel_final[:, ind_moving] = (
+        relative_velocity_magnitude * weighted_direction + xd_obs[:, ind_moving]
+    )
+
+    velocities[:, ind_eval] = vel_final
+    return velocities
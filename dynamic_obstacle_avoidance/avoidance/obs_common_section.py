@@ -18,24 +18,35 @@ import warnings
 
 
 class DistanceMatrix:
-    """Symmetric matrix storage. Only stores one half of the values, as a 1D"""
+    """Symmetric matrix storage. Only stores one half of the values, as a 1D array
+    in the order of the upper triangle (see `np.triu_indices`).
+
+    The values can be accessed element-wise, i.e., matrix[ii, jj], or in bulk with
+    index arrays, i.e., matrix[rows, cols]."""
 
     def __init__(self, n_obs):
         self._dim = n_obs
         # self._value_list = [None for ii in range(int((n_obs-1)*n_obs/2))]
         self._value_list = (-1) * np.ones(int((n_obs - 1) * n_obs / 2))
+        self._triangle_indices = None
 
     @property
     def num_obstacles(self):
         return self._dim
 
-    def __repr__(self):
-        matr = np.zeros((self._dim, self._dim))
-        for ii in range(self._dim):
-            for jj in range(ii + 1, self._dim):
-                matr[ii, jj] = matr[jj, ii] = self[ii, jj]
+    @property
+    def num_pairs(self):
+        return int((self._dim - 1) * self._dim / 2)
 
-        return str(matr)
+    @property
+    def triangle_indices(self):
+        """Matrix indexes (rows, cols) of the stored values, with rows < cols."""
+        if self._triangle_indices is None:
+            self._triangle_indices = np.triu_indices(self._dim, k=1)
+        return self._triangle_indices
+
+    def __repr__(self):
+        return str(self.get_matrix())
 
     def __str__(self):
         return self.__repr__()
@@ -57,38 +68,48 @@ class DistanceMatrix:
     def get_matrix(self):
         """Get matrix as numpy-array."""
         matr = np.zeros((self._dim, self._dim))
-        for ix in range(self._dim):
-            for iy in range(ix + 1, self._dim):
-                matr[ix, iy] = matr[iy, ix] = self[ix, iy]
+        rows, cols = self.triangle_indices
+        matr[rows, cols] = matr[cols, rows] = self._value_list
         return matr
 
     def get_index(self, row, col):
-        """Returns the corresponding list index [ind] from matrix index [row, col]"""
-        if row > np.abs(self._dim):
+        """Returns the corresponding list index [ind] from matrix index [row, col].
+        Index arrays (of equal shape) return an array of list indexes."""
+        if isinstance(row, (int, np.integer)) and isinstance(col, (int, np.integer)):
+            if not (-self._dim <= row < self._dim):
+                raise RuntimeError("Fist object index out of bound.")
+
+            if not (-self._dim <= col < self._dim):
+                raise RuntimeError("Second object index out of bound.")
+
+            row, col = row % self._dim, col % self._dim
+
+            if row == col:
+                raise RuntimeError("Self collision observation meaningless.")
+
+            # Symmetric matrix - reverse  indices
+            if col > row:
+                col, row = row, col
+
+            return int((row - col - 1) + col * (2 * self._dim - 1 - col) // 2)
+
+        row = np.asarray(row, dtype=int)
+        col = np.asarray(col, dtype=int)
+        if np.any(row < -self._dim) or np.any(row >= self._dim):
             raise RuntimeError("Fist object index out of bound.")
-            # row = 0
 
-        if col > np.abs(self._dim):
+        if np.any(col < -self._dim) or np.any(col >= self._dim):
             raise RuntimeError("Second object index out of bound.")
-            # col = 1
-
-        if row < 0:
-            row = self._dim + 1 - row
 
-        if col < 0:
-            row = self._dim + 1 - col
+        row, col = row % self._dim, col % self._dim
 
-        if row == col:
+        if np.any(row == col):
             raise RuntimeError("Self collision observation meaningless.")
-            # row, col = 1, 0
 
         # Symmetric matrix - reverse  indices
-        if col > row:
-            col, row = row, col
+        row, col = np.maximum(row, col), np.minimum(row, col)
 
-        return int(
-            int((row - col - 1) + col * ((self._dim - 1) + self._dim - (col)) * 0.5)
-        )
+        return (row - col - 1) + col * (2 * self._dim - 1 - col) // 2
 
 
 class IntersectionMatrix(DistanceMatrix):
@@ -96,43 +117,134 @@ class IntersectionMatrix(DistanceMatrix):
     Matrix uses less space this way this is useful with many obstacles! e.g. dense crowds
     Symmetric matrix with zero as diagonal values
 
-    Stores one common point of intersecting obstacles
+    Stores one common point of intersecting obstacles; None is returned for the
+    non-intersecting pairs. The points are stored densely as one (dim, n_pairs)
+    array, or, for few intersections (sparse=True), as dictionary of the list index
+    to the point.
     """
 
-    # TODO: use scipy sparse matrices to replace this partially!!!
-
-    def __init__(self, n_obs, dim=2):
-        self._value_list = [None for ii in range(int((n_obs - 1) * n_obs / 2))]
+    def __init__(self, n_obs, dim=2, sparse=False):
         self._dim = n_obs
+        self._triangle_indices = None
+
+        self.space_dim = dim
+        self.is_sparse = sparse
+
+        if self.is_sparse:
+            self._points = {}
+        else:
+            self._is_intersecting = np.zeros(self.num_pairs, dtype=bool)
+            self._points = np.zeros((self.space_dim, self.num_pairs))
 
     def __repr__(self):
         return str(self.get_bool_matrix())
 
+    def __setitem__(self, key, value):
+        if len(key) != 2:
+            raise ValueError("Not two indexes given.")
+
+        ind = self.get_index(key[0], key[1])
+        if np.ndim(ind):
+            if value is None:
+                self.reset(key[0], key[1])
+            else:
+                self.set_points(key[0], key[1], value)
+            return
+
+        if self.is_sparse:
+            if value is None:
+                self._points.pop(ind, None)
+            else:
+                self._points[ind] = np.array(value, dtype=float)
+            return
+
+        if value is None:
+            self._is_intersecting[ind] = False
+        else:
+            self._is_intersecting[ind] = True
+            self._points[:, ind] = value
+
+    def __getitem__(self, key):
+        if len(key) != 2:
+            raise ValueError("Not two indexes given.")
+
+        ind = self.get_index(key[0], key[1])
+        if np.ndim(ind):
+            return self.get_points(key[0], key[1])
+
+        if self.is_sparse:
+            point = self._points.get(ind)
+            return None if point is None else np.copy(point)
+
+        if not self._is_intersecting[ind]:
+            return None
+        return np.copy(self._points[:, ind])
+
     def set(self, row, col, value):
         self[row, col] = value
 
     def get(self, row, col):
         return self[row, col]
 
+    def set_points(self, rows, cols, points):
+        """Sets the intersection points (dim, n_indexes) of the index arrays."""
+        inds = np.atleast_1d(self.get_index(rows, cols))
+        points = np.broadcast_to(
+            np.asarray(points, dtype=float).reshape(self.space_dim, -1),
+            (self.space_dim, inds.shape[0]),
+        )
+
+        if self.is_sparse:
+            for it, ind in enumerate(inds):
+                self._points[int(ind)] = np.copy(points[:, it])
+        else:
+            self._is_intersecting[inds] = True
+            self._points[:, inds] = points
+
+    def get_points(self, rows, cols):
+        """Returns the intersection points (dim, n_indexes) of the index arrays, which
+        are nan for non-intersecting pairs."""
+        inds = np.atleast_1d(self.get_index(rows, cols))
+        if self.is_sparse:
+            points = np.full((self.space_dim, inds.shape[0]), np.nan)
+            for it, ind in enumerate(inds):
+                if int(ind) in self._points:
+                    points[:, it] = self._points[int(ind)]
+            return points
+
+        points = self._points[:, inds]
+        points[:, ~self._is_intersecting[inds]] = np.nan
+        return points
+
+    def reset(self, rows, cols):
+        """Removes the intersections of the index arrays."""
+        inds = np.atleast_1d(self.get_index(rows, cols))
+        if self.is_sparse:
+            for ind in inds:
+                self._points.pop(int(ind), None)
+        else:
+            self._is_intersecting[inds] = False
+
     def is_intersecting(self, row, col):
-        return bool(not (self[row, col] is None))
+        """Returns if the obstacles intersect - element-wise for index arrays."""
+        ind = self.get_index(row, col)
+        if self.is_sparse:
+            if np.ndim(ind):
+                return np.array([int(ii) in self._points for ii in ind.flat]).reshape(
+                    ind.shape
+                )
+            return ind in self._points
+        if np.ndim(ind):
+            return self._is_intersecting[ind]
+        return bool(self._is_intersecting[ind])
 
     def get_intersection_matrix(self):
-        # Maybe not necessary function
-        space_dim = 2
-        # matr = np.zeros((self._dim, self._dim), dtype=bool)
-        # for col in range(self._dim):
-        # for row in range(col+1, self._dim):
-        # matr[col, row] = matr[row, col] = not (self[row, col] is None)
-
-        matr = np.zeros((space_dim, self._dim, self._dim))
-        for col in range(self._dim):
-            for row in range(col + 1, self._dim):
-                if col == row:
-                    continue
-                val = self.get(row, col)
-                if not val is None and not isinstance(self.get(row, col), bool):
-                    matr[:, col, row] = matr[:, row, col] = self[row, col]
+        """Returns the (dim, n_obs, n_obs) array of the intersection points, which is
+        zero for non-intersecting pairs."""
+        matr = np.zeros((self.space_dim, self._dim, self._dim))
+        rows, cols = self.get_intersecting_pairs().T
+        points = self.get_points(rows, cols)
+        matr[:, rows, cols] = matr[:, cols, rows] = points
         return matr
 
     def get_bool_triangle_matrix(self):
@@ -140,32 +252,130 @@ class IntersectionMatrix(DistanceMatrix):
             "Function was removed. Use 'get_bool_matrix' instead."
         )
 
-        # intersection_exists_matrix = np.zeros((self._dim+1,self._dim+1), dtype=bool)
-        # for col in range(self._dim+1):
-        # for row in range(col+1, self._dim+1):
-
-        # intersection_exists_matrix = np.zeros((self._dim, self._dim), dtype=bool)
-        # for col in range(self._dim):
-        # for row in range(col+1, self._dim):
-        # if isinstance(self.get(row,col), bool) and (self.get(row,col) == False):
-        # continue
-        # intersection_exists_matrix[row, col] = True
-
-        # return intersection_exists_matrix
+    def _get_intersecting_list_indexes(self):
+        if self.is_sparse:
+            return np.array(sorted(self._points.keys()), dtype=int)
+        return np.flatnonzero(self._is_intersecting)
 
     def get_bool_matrix(self):
         bool_matrix = np.zeros((self._dim, self._dim), dtype=bool)
-        for ii in range(self._dim):
-            for jj in range(ii + 1, self._dim):
-                bool_matrix[ii, jj] = bool_matrix[jj, ii] = self.is_intersecting(ii, jj)
-
+        rows, cols = self.get_intersecting_pairs().T
+        bool_matrix[rows, cols] = bool_matrix[cols, rows] = True
         return bool_matrix
 
+    def get_intersecting_pairs(self) -> np.ndarray:
+        """Returns the (n_pairs, 2) array of the indexes (ii < jj) of all intersecting
+        obstacle pairs."""
+        inds = self._get_intersecting_list_indexes()
+        rows, cols = self.triangle_indices
+        return np.vstack((rows[inds], cols[inds])).T
+
 
 class Intersection_matrix(IntersectionMatrix):
     pass
 
 
+class IntersectionClusters:
+    """Clusters (connected components) of intersecting obstacles, stored as
+    union-find (disjoint-set) structure with path compression and union by rank,
+    i.e., a find-query and the union of two clusters are O(alpha(n)).
+
+    The structure is updated with the pairs whose intersection status has changed.
+    New intersections are merged incrementally; since the union-find does not
+    support splitting, the clusters are rebuilt from the stored pairs once an
+    intersection is removed. Intersections with the wall do not merge clusters.
+    """
+
+    def __init__(self, n_obstacles: int, index_wall: int = None):
+        self.n_obstacles = n_obstacles
+        self.index_wall = index_wall
+
+        self._intersecting_pairs = set()
+        self._parents = np.arange(n_obstacles)
+        self._ranks = np.zeros(n_obstacles, dtype=int)
+
+    def find(self, index: int) -> int:
+        """Returns the root (representative) of the cluster of the obstacle."""
+        root = index
+        while self._parents[root] != root:
+            root = self._parents[root]
+
+        # Path compression
+        while self._parents[index] != root:
+            self._parents[index], index = root, self._parents[index]
+        return root
+
+    def union(self, ii: int, jj: int) -> None:
+        root_ii = self.find(ii)
+        root_jj = self.find(jj)
+        if root_ii == root_jj:
+            return
+
+        if self._ranks[root_ii] < self._ranks[root_jj]:
+            root_ii, root_jj = root_jj, root_ii
+        self._parents[root_jj] = root_ii
+        if self._ranks[root_ii] == self._ranks[root_jj]:
+            self._ranks[root_ii] += 1
+
+    def is_same_cluster(self, ii: int, jj: int) -> bool:
+        return self.find(ii) == self.find(jj)
+
+    def is_intersecting(self, index: int) -> bool:
+        """Returns True if the obstacle intersects any other obstacle (or the wall)."""
+        return any(index in pair for pair in self._intersecting_pairs)
+
+    def update(self, intersecting_pairs: np.ndarray, index_wall: int = None) -> None:
+        """Sets the (n_pairs, 2) array of the currently intersecting pairs and applies
+        the changes compared to the last update."""
+        intersecting_pairs = set(
+            (int(min(ii, jj)), int(max(ii, jj))) for ii, jj in intersecting_pairs
+        )
+        added_pairs = intersecting_pairs - self._intersecting_pairs
+        is_removed = len(self._intersecting_pairs - intersecting_pairs) > 0
+        self._intersecting_pairs = intersecting_pairs
+
+        if is_removed or index_wall != self.index_wall:
+            self.index_wall = index_wall
+            self._parents = np.arange(self.n_obstacles)
+            self._ranks = np.zeros(self.n_obstacles, dtype=int)
+            added_pairs = intersecting_pairs
+
+        for ii, jj in added_pairs:
+            if self.index_wall in (ii, jj):
+                continue
+            self.union(ii, jj)
+
+    def get_clusters(self) -> list:
+        """Returns the list of the clusters, i.e., of the (sorted) obstacle-index lists
+        of all obstacles which intersect. Clusters touching the wall additionally
+        contain the wall index (at the end)."""
+        is_intersecting = np.zeros(self.n_obstacles, dtype=bool)
+        is_touching_wall = np.zeros(self.n_obstacles, dtype=bool)
+        for ii, jj in self._intersecting_pairs:
+            is_intersecting[ii] = is_intersecting[jj] = True
+            if self.index_wall == ii:
+                is_touching_wall[jj] = True
+            elif self.index_wall == jj:
+                is_touching_wall[ii] = True
+
+        clusters = {}
+        clusters_touching_wall = set()
+        for index in np.flatnonzero(is_intersecting):
+            if index == self.index_wall:
+                continue
+            root = self.find(index)
+            clusters.setdefault(root, []).append(int(index))
+            if is_touching_wall[index]:
+                clusters_touching_wall.add(root)
+
+        cluster_list = []
+        for root, cluster in clusters.items():
+            if root in clusters_touching_wall:
+                cluster.append(self.index_wall)
+            cluster_list.append(cluster)
+        return cluster_list
+
+
 def obs_common_section(obs):
     # OBS_COMMON_SECTION finds common section of two ore more obstacles
     # at the moment only solution in two d is implemented
@@ -482,9 +692,14 @@ def get_intersections_obstacles(
         return intersection_cluster_list
 
 
-def get_intersection_cluster(Intersections, obs, representation_type="single_point"):
+def get_intersection_cluster(
+    Intersections, obs, representation_type="single_point", clusters=None
+):
     """Get the clusters number of the intersections.
-    It automatically assign the reference points for intersecting clusters."""
+    It automatically assign the reference points for intersecting clusters.
+
+    clusters: IntersectionClusters of the last evaluation, which are updated with the
+        changed intersections (new clusters are created if None)."""
     # Get variables
     num_obstacles = Intersections.num_obstacles
     dim = obs[0].center_position.shape[0]
@@ -493,59 +708,10 @@ def get_intersection_cluster(Intersections, obs, representation_type="single_poi
     for it_obs in range(num_obstacles):
         R_max[it_obs] = obs[it_obs].get_reference_length()
 
-    # Iterate over all obstacles with an intersection
-    intersection_matrix = Intersections.get_bool_matrix()
-
-    # All obstacles, which have at least one intersection
-    intersecting_obstacles = np.arange(num_obstacles)[
-        np.sum(intersection_matrix, axis=0) > 0
-    ]
-
-    if not obs.index_wall is None:
-        # TODO solve more cleanly...
-        intersecting_obstacles = np.delete(
-            intersecting_obstacles,
-            np.nonzero(intersecting_obstacles == obs.index_wall),
-            axis=0,
-        )
-
-    intersection_cluster_list = []
-
-    while intersecting_obstacles.shape[0]:
-        intersection_matrix_reduced = intersection_matrix[intersecting_obstacles, :][
-            :, intersecting_obstacles
-        ]
-        intersection_cluster = np.zeros(intersecting_obstacles.shape[0], dtype=bool)
-
-        intersection_cluster[0] = True
-
-        # By default new obstacles in cluster
-        new_obstacles = True
-
-        # Iteratively search through clusters. Similar to google page ranking
-        while new_obstacles:
-            intersection_cluster_old = intersection_cluster
-            intersection_cluster = (
-                intersection_matrix_reduced.dot(intersection_cluster)
-                + intersection_cluster
-            )
-            intersection_cluster = intersection_cluster.astype(bool)
-
-            # Bool operation. Equals to one if not equal
-            new_obstacles = np.any(intersection_cluster ^ intersection_cluster_old)
-
-        intersection_cluster_list.append(
-            intersecting_obstacles[intersection_cluster].tolist()
-        )
-
-        if not obs.index_wall is None:  # Add wall connection
-            if np.sum(
-                intersection_matrix[intersection_cluster_list[-1], :][:, obs.index_wall]
-            ):  # nonzero
-                intersection_cluster_list[-1].append(obs.index_wall)
-
-        # Only keep non-intersecting obstacles
-        intersecting_obstacles = intersecting_obstacles[intersection_cluster == 0]
+    if clusters is None or clusters.n_obstacles != num_obstacles:
+        clusters = IntersectionClusters(num_obstacles)
+    clusters.update(Intersections.get_intersecting_pairs(), index_wall=obs.index_wall)
+    intersection_cluster_list = clusters.get_clusters()
 
     if representation_type == "single_point":
         get_single_reference_point(
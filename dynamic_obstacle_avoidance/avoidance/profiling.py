@@ -0,0 +1,145 @@
+"""
+Optional per-stage profiling of the modulation.
+"""
+
+from collections import defaultdict
+from typing import Optional
+
+# The profiler is only activated within its context, i.e., the modulation only
+# checks this (module-level) reference for None if no profiler is active.
+_active_profiler = None
+
+
+def get_active_profiler() -> Optional["ModulationProfiler"]:
+    """Returns the profiler of the current `with ModulationProfiler()` block."""
+    return _active_profiler
+
+
+class ModulationProfiler:
+    """Accumulates the wall-time and the number of calls of each stage of
+    `obs_avoidance_interpolation_moving`; the per-obstacle stages are additionally
+    split by the obstacle type.
+
+    The profiler is either passed to the modulation explicitly or activated for
+    all evaluations within its context (not thread-safe):
+
+    >>> with ModulationProfiler() as profiler:
+    ...     avoider.evaluate(position)
+    >>> print(profiler.get_summary_table())
+
+    Attributes
+    ----------
+    wall_time: dict of the accumulated time [s] of each stage
+    n_calls: dict of the number of calls of each stage
+    obstacle_wall_time: dict of the accumulated time [s] of each
+        (stage, obstacle-type)
+    obstacle_n_calls: dict of the number of calls of each (stage, obstacle-type)
+
+    Stages
+    ------
+    local_geometry: gamma, normal and reference direction of each obstacle, which
+        are evaluated together (see `Obstacle.get_local_geometry`)
+    decomposition: eigenvalues and decomposition matrix of each obstacle
+    weights: weights of the obstacles
+    relative_velocity: (weighted) velocity of the obstacles
+    stretching: modulation of the relative velocity by each obstacle
+    weighted_sum: directional summation of the modulated velocities
+    """
+
+    stages = (
+        "local_geometry",
+        "decomposition",
+        "weights",
+        "relative_velocity",
+        "stretching",
+        "weighted_sum",
+    )
+
+    def __init__(self):
+        self._previous_profiler = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.n_evaluations = 0
+        self.wall_time = defaultdict(float)
+        self.n_calls = defaultdict(int)
+        self.obstacle_wall_time = defaultdict(float)
+        self.obstacle_n_calls = defaultdict(int)
+
+    def __enter__(self) -> "ModulationProfiler":
+        global _active_profiler
+        self._previous_profiler = _active_profiler
+        _active_profiler = self
+        return self
+
+    def __exit__(self, *args) -> None:
+        global _active_profiler
+        _active_profiler = self._previous_profiler
+        self._previous_profiler = None
+
+    def add(self, stage: str, duration: float, obstacle=None) -> None:
+        """Adds a call of duration [s] to the stage (and the type of the obstacle)."""
+        self.wall_time[stage] += duration
+        self.n_calls[stage] += 1
+
+        if obstacle is not None:
+            key = (stage, type(obstacle).__name__)
+            self.obstacle_wall_time[key] += duration
+            self.obstacle_n_calls[key] += 1
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.wall_time.values())
+
+    def get_counters(self) -> dict:
+        """Returns the raw counters as (flat) dictionary, e.g., for monitoring."""
+        counters = {"n_evaluations": self.n_evaluations}
+        for stage in self.wall_time:
+            counters[f"{stage}.wall_time"] = self.wall_time[stage]
+            counters[f"{stage}.n_calls"] = self.n_calls[stage]
+
+        for (stage, obstacle_type), value in self.obstacle_wall_time.items():
+            counters[f"{stage}.{obstacle_type}.wall_time"] = value
+            counters[f"{stage}.{obstacle_type}.n_calls"] = self.obstacle_n_calls[
+                (stage, obstacle_type)
+            ]
+        return counters
+
+    def get_summary_table(self) -> str:
+        """Returns a table of the time spent in each stage (and obstacle type)."""
+        total_time = self.total_time
+        lines = [
+            f"{'stage':<32} {'calls':>10} {'time [ms]':>12} {'per call [us]':>14} "
+            + f"{'share':>7}"
+        ]
+        lines.append("-" * len(lines[0]))
+
+        stages = [stage for stage in self.stages if stage in self.wall_time]
+        stages += [stage for stage in self.wall_time if stage not in self.stages]
+        for stage in stages:
+            rows = [(stage, self.wall_time[stage], self.n_calls[stage])]
+            for (obs_stage, obstacle_type), value in self.obstacle_wall_time.items():
+                if obs_stage == stage:
+                    rows.append(
+                        (
+                            f"  {obstacle_type}",
+                            value,
+                            self.obstacle_n_calls[(obs_stage, obstacle_type)],
+                        )
+                    )
+
+            for name, wall_time, n_calls in rows:
+                share = wall_time / total_time if total_time else 0.0
+                lines.append(
+                    f"{name:<32} {n_calls:>10} {wall_time * 1e3:>12.3f} "
+                    + f"{wall_time / max(n_calls, 1) * 1e6:>14.2f} {share:>7.1%}"
+                )
+
+        lines.append("-" * len(lines[0]))
+        lines.append(
+            f"{'total':<32} {self.n_evaluations:>10} {total_time * 1e3:>12.3f}"
+        )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.get_summary_table()
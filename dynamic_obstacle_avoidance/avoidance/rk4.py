@@ -1,15 +1,29 @@
 """ Runge Kutta 4 algorithm for general obstacle avoidance"""
 import numpy as np
+from numpy import linalg as LA
 
 from dynamic_obstacle_avoidance.avoidance import (
     obs_avoidance_interpolation_moving,
 )
+from dynamic_obstacle_avoidance.avoidance import (
+    obs_avoidance_interpolation_moving_batch,
+)
 from dynamic_obstacle_avoidance.avoidance import (
     obs_avoidance_nonlinear_hirarchy,
 )
 
 
-def obs_avoidance_rk4(dt, x, obs, obs_avoidance, ds, x0=False):
+def get_obstacles_at_time(obs, delta_time: float) -> list:
+    """Returns the obstacles (container or list) moved by their twist to the pose
+    after delta_time as a list of copies, the obstacles themselves are not changed."""
+    if hasattr(obs, "get_obstacles_at_time"):
+        return obs.get_obstacles_at_time(delta_time)
+    return [oo.get_obstacle_at_time(delta_time) for oo in obs]
+
+
+def obs_avoidance_rk4(
+    dt, x, obs, obs_avoidance, ds, x0=False, consider_obstacle_motion=False
+):
     """Fourth order integration of obstacle avoidance differential equation
     Paramters
     ---------
@@ -18,18 +32,24 @@ def obs_avoidance_rk4(dt, x, obs, obs_avoidance, ds, x0=False):
     obs: obstacle list
     obs_avoidance: Obstacle Avoidance algorithm
     ds: initial dynamics
+    consider_obstacle_motion: if True, the stages are evaluated with the obstacles
+        at the stage time (t + c_i * dt) as predicted by their twist; otherwise the
+        obstacles are assumed to be static within the step
 
     Returns
     -------
     Runge-Kutta step of the obstacle avoidance
     """
-    # NOTE: The movement of the obstacle is considered as small, hence
-    # position and movement changed are not considered. This will be fixed in future iterations.
     # TODO: More General Implementation (find library)
-
     if type(x0) == bool:
         x0 = np.zeros(np.array(x).shape[0])
 
+    if consider_obstacle_motion:
+        obs_half = get_obstacles_at_time(obs, 0.5 * dt)
+        obs_end = get_obstacles_at_time(obs, dt)
+    else:
+        obs_half = obs_end = obs
+
     # k1
     xd = ds(x, x0)
     # xd = velConst_attr(x, xd, x0)
@@ -39,20 +59,20 @@ def obs_avoidance_rk4(dt, x, obs, obs_avoidance, ds, x0=False):
     # k2
     xd = ds(x + 0.5 * k1, x0)
     # xd = velConst_attr(x, xd, x0)
-    xd = obs_avoidance(x + 0.5 * k1, xd, obs)
+    xd = obs_avoidance(x + 0.5 * k1, xd, obs_half)
     k2 = dt * xd
 
     # k3
     xd = ds(x + 0.5 * k2, x0)
     # xd = velConst_attr(x, xd, x0)
-    xd = obs_avoidance(x + 0.5 * k2, xd, obs)
+    xd = obs_avoidance(x + 0.5 * k2, xd, obs_half)
 
     k3 = dt * xd
 
     # k4
     xd = ds(x + k3, x0)
     # xd = velConst_attr(x, xd, x0)
-    xd = obs_avoidance(x + k3, xd, obs)
+    xd = obs_avoidance(x + k3, xd, obs_end)
     k4 = dt * xd
 
     # x final
@@ -96,3 +116,145 @@ def obs_avoidance_rungeKutta(
     x = x + np.sum(np.tile(rk_fac, (dim, 1)) * k[:, 1:], axis=1)  # + O(dt^5)
 
     return x
+
+
+def obs_avoidance_rk4_batch(
+    dt,
+    positions,
+    obs,
+    ds,
+    obs_avoidance=obs_avoidance_interpolation_moving_batch,
+    consider_obstacle_motion=False,
+):
+    """Fourth order integration step of many positions at once.
+
+    Paramters
+    ---------
+    dt: time step [s]
+    positions: (dimension, n_points) array of positions
+    obs: obstacle list
+    ds: initial dynamics which evaluates a (dimension, n_points) array at once
+    obs_avoidance: batched obstacle avoidance algorithm
+    consider_obstacle_motion: evaluate the stages with the obstacles at the stage
+        time (see `obs_avoidance_rk4`)
+
+    Returns
+    -------
+    Runge-Kutta step of the obstacle avoidance of shape (dimension, n_points)
+    """
+    if consider_obstacle_motion:
+        obs_half = get_obstacles_at_time(obs, 0.5 * dt)
+        obs_end = get_obstacles_at_time(obs, dt)
+    else:
+        obs_half = obs_end = obs
+
+    k1 = dt * obs_avoidance(positions, ds(positions), obs)
+
+    positions_k = positions + 0.5 * k1
+    k2 = dt * obs_avoidance(positions_k, ds(positions_k), obs_half)
+
+    positions_k = positions + 0.5 * k2
+    k3 = dt * obs_avoidance(positions_k, ds(positions_k), obs_half)
+
+    positions_k = positions + k3
+    k4 = dt * obs_avoidance(positions_k, ds(positions_k), obs_end)
+
+    return positions + 1.0 / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def get_collisions_of_array(obs, positions: np.ndarray) -> np.ndarray:
+    """Returns the collision (bool-array) of positions of shape
+    (dimension, n_points) with the obstacles (container or list)."""
+    if hasattr(obs, "check_collision_array"):
+        return obs.check_collision_array(positions)
+
+    collisions = np.zeros(positions.shape[1], dtype=bool)
+    boundary_collisions = None
+    for oo in obs:
+        is_inside = oo.get_gamma_array(positions, in_global_frame=True) <= 1
+        if oo.is_boundary:
+            if boundary_collisions is None:
+                boundary_collisions = is_inside
+            else:
+                boundary_collisions = np.logical_and(boundary_collisions, is_inside)
+        else:
+            collisions = np.logical_or(collisions, is_inside)
+
+    if boundary_collisions is not None:
+        collisions = np.logical_or(collisions, boundary_collisions)
+    return collisions
+
+
+def integrate_trajectories_rk4(
+    positions_init,
+    obs,
+    ds,
+    dt=0.01,
+    max_simu_step=300,
+    obs_avoidance=obs_avoidance_interpolation_moving_batch,
+    attractor_position=None,
+    convergence_margin=1e-3,
+    check_collision=True,
+):
+    """Rolls out the trajectories of many initial positions at once with a fixed
+    step RK4. Trajectories, which have converged or collided, are deactivated, i.e.,
+    they are not evaluated anymore and keep their last position.
+
+    Paramters
+    ---------
+    positions_init: (dimension, n_points) array of the initial positions
+    obs: obstacle list or container
+    ds: initial dynamics which evaluates a (dimension, n_points) array at once
+    dt: time step [s]
+    max_simu_step: maximum number of integration steps
+    obs_avoidance: batched obstacle avoidance algorithm
+    attractor_position: if given, a trajectory has converged once it is closer than
+        the convergence_margin to the attractor; otherwise once its step is smaller
+        than convergence_margin * dt
+    check_collision: deactivates trajectories which are within an obstacle
+
+    Returns
+    -------
+    trajectories: (dimension, n_steps + 1, n_points) array of the positions
+    n_active_steps: (n_points) array of the number of steps of each trajectory
+    """
+    positions_init = np.array(positions_init, dtype=float)
+    dim, n_points = positions_init.shape
+
+    trajectories = np.zeros((dim, max_simu_step + 1, n_points))
+    trajectories[:, 0, :] = positions_init
+    n_active_steps = np.zeros(n_points, dtype=int)
+
+    ind_active = np.arange(n_points)
+    n_steps = 0
+    for it_step in range(max_simu_step):
+        if not ind_active.shape[0]:
+            break
+
+        positions = trajectories[:, it_step, :]
+        trajectories[:, it_step + 1, :] = positions
+        n_steps += 1
+
+        new_positions = obs_avoidance_rk4_batch(
+            dt, positions[:, ind_active], obs, ds=ds, obs_avoidance=obs_avoidance
+        )
+        trajectories[:, it_step + 1, ind_active] = new_positions
+        n_active_steps[ind_active] += 1
+
+        if attractor_position is not None:
+            distances = LA.norm(
+                new_positions - np.reshape(attractor_position, (-1, 1)), axis=0
+            )
+            ind_stop = distances < convergence_margin
+        else:
+            steps = LA.norm(new_positions - positions[:, ind_active], axis=0)
+            ind_stop = steps < convergence_margin * dt
+
+        if check_collision:
+            ind_stop = np.logical_or(
+                ind_stop, get_collisions_of_array(obs, new_positions)
+            )
+
+        ind_active = ind_active[np.logical_not(ind_stop)]
+
+    return trajectories[:, : n_steps + 1, :], n_active_steps
@@ -8,6 +8,8 @@ from .learning import LearningContainer
 from .obstacle_container import ObstacleContainer
 from .gradient_container import GradientContainer
 from .shapely_container import ShapelyContainer, SphereContainer
+from .compiled_environment import CompiledEnvironment
+from .spatial_index import SpatialIndex
 
 __all__ = [
     "BaseContainer",
@@ -17,4 +19,6 @@ __all__ = [
     "GradientContainer",
     "ShapelyContainer",
     "SphereContainer",
+    "CompiledEnvironment",
+    "SpatialIndex",
 ]
@@ -0,0 +1,388 @@
+"""
+Compiled (structure-of-arrays) representation of an obstacle environment.
+"""
+
+import warnings
+
+import numpy as np
+from numpy import linalg as LA
+
+# Module import only, since the obstacles-package imports the containers
+from dynamic_obstacle_avoidance import obstacles
+
+
+def get_rotation_matrix(obstacle) -> np.ndarray:
+    """Returns the rotation matrix (relative to global) of an obstacle of any
+    dimension. Rotations in dimensions higher than three are not supported,
+    hence the identity is returned."""
+    if obstacle.dimension == 2:
+        angle = obstacle.orientation
+        if angle is None:
+            angle = 0.0
+        cos_, sin_ = np.cos(angle), np.sin(angle)
+        return np.array([[cos_, -sin_], [sin_, cos_]])
+
+    elif obstacle.dimension == 3:
+        if obstacle.orientation is None:
+            return np.eye(3)
+        return obstacle.orientation.as_matrix()
+
+    return np.eye(obstacle.dimension)
+
+
+class CompiledEnvironment:
+    """Packs the obstacles of an environment into contiguous arrays, sorted by
+    shape type, to evaluate the gamma, normal and reference direction of all
+    obstacles and many positions at once.
+
+    Supported are `EllipseWithAxes`, `CuboidXd` and `HyperSphere` (which is treated
+    as an ellipse with equal axes). The compilation is a snapshot: if obstacles are
+    moving, `update_poses()` rewrites the pose rows only; if obstacles are added,
+    removed or their shape is changed, `recompile()` is needed.
+
+    All outputs are ordered as the obstacles in the environment.
+
+    Attributes
+    ----------
+    center_positions: (n_obstacles, dimension) array
+    rotation_matrices: (n_obstacles, dimension, dimension) array (local to global)
+    reference_points: (n_obstacles, dimension) array of the local reference points
+    semiaxes: (n_obstacles, dimension) array
+    margins, curvatures, distance_scalings, repulsion_coeffs, reactivities:
+        (n_obstacles) float-arrays
+    is_boundary: (n_obstacles) bool-array
+    """
+
+    # Names of the obstacle-classes (in `obstacles`) of each shape type
+    shape_types = {
+        "ellipse": ("EllipseWithAxes", "HyperSphere"),
+        "cuboid": ("CuboidXd",),
+    }
+
+    def __init__(self, obstacle_environment):
+        self.obstacle_environment = obstacle_environment
+        self.recompile()
+
+    @property
+    def n_obstacles(self) -> int:
+        return len(self._obstacle_indices)
+
+    @property
+    def dimension(self) -> int:
+        return self.center_positions.shape[1]
+
+    def get_shape_type(self, obstacle) -> str:
+        for key, type_names in self.shape_types.items():
+            types = tuple(getattr(obstacles, name) for name in type_names)
+            if isinstance(obstacle, types):
+                return key
+
+        raise TypeError(
+            f"Obstacle of type {type(obstacle).__name__} can not be compiled."
+        )
+
+    def recompile(self) -> None:
+        """(Re-)create all arrays from the obstacle environment."""
+        shape_of_obstacle = [
+            self.get_shape_type(obs) for obs in self.obstacle_environment
+        ]
+
+        # Obstacles of the same type are stored contiguously
+        self._obstacle_indices = np.zeros(len(shape_of_obstacle), dtype=int)
+        self._shape_slices = {}
+        it_start = 0
+        for key in self.shape_types.keys():
+            indices = [ii for ii, ss in enumerate(shape_of_obstacle) if ss == key]
+            self._obstacle_indices[it_start : it_start + len(indices)] = indices
+            self._shape_slices[key] = slice(it_start, it_start + len(indices))
+            it_start += len(indices)
+
+        # Inverse map: position of each obstacle in the compiled arrays
+        self._compiled_indices = np.argsort(self._obstacle_indices)
+
+        n_obs = len(self._obstacle_indices)
+        if not n_obs:
+            warnings.warn("Compiling an empty environment.")
+            dim = 0
+        else:
+            dim = self.obstacle_environment[0].dimension
+
+        self.center_positions = np.zeros((n_obs, dim))
+        self.rotation_matrices = np.zeros((n_obs, dim, dim))
+        self.reference_points = np.zeros((n_obs, dim))
+
+        self.semiaxes = np.zeros((n_obs, dim))
+        self.margins = np.zeros(n_obs)
+        self.curvatures = np.ones(n_obs)
+        self.distance_scalings = np.ones(n_obs)
+        self.is_boundary = np.zeros(n_obs, dtype=bool)
+        self.repulsion_coeffs = np.ones(n_obs)
+        self.reactivities = np.ones(n_obs)
+
+        for it_comp, it_obs in enumerate(self._obstacle_indices):
+            obs = self.obstacle_environment[it_obs]
+
+            if isinstance(obs, obstacles.HyperSphere):
+                self.semiaxes[it_comp, :] = obs.radius
+            else:
+                self.semiaxes[it_comp, :] = obs.semiaxes
+
+            if isinstance(obs, obstacles.EllipseWithAxes):
+                self.curvatures[it_comp] = obs.curvature
+
+            self.margins[it_comp] = obs.margin_absolut
+            self.distance_scalings[it_comp] = obs.distance_scaling
+            self.is_boundary[it_comp] = obs.is_boundary
+            self.repulsion_coeffs[it_comp] = obs.repulsion_coeff
+            self.reactivities[it_comp] = obs.reactivity
+
+        self.update_poses()
+
+    def update_poses(self, indices=None) -> None:
+        """Rewrites the pose rows (center, rotation and reference point) of the
+        obstacles with the given environment-indices (default: all)."""
+        if indices is None:
+            indices = range(self.n_obstacles)
+
+        for it_obs in indices:
+            it_comp = self._compiled_indices[it_obs]
+            obs = self.obstacle_environment[it_obs]
+
+            self.center_positions[it_comp, :] = obs.center_position
+            self.rotation_matrices[it_comp, :, :] = get_rotation_matrix(obs)
+            self.reference_points[it_comp, :] = obs.reference_point
+
+    def transform_positions_to_relative(self, positions: np.ndarray) -> np.ndarray:
+        """Returns the positions in all obstacle frames, i.e., an array of shape
+        (dimension, n_obstacles, n_points) in compiled order."""
+        relative_positions = (
+            positions[:, np.newaxis, :] - self.center_positions.T[:, :, np.newaxis]
+        )
+        return np.einsum("oji,jon->ion", self.rotation_matrices, relative_positions)
+
+    def transform_directions_from_relative(self, directions: np.ndarray) -> np.ndarray:
+        """Transform directions of shape (dimension, n_obstacles, n_points) from the
+        obstacle frames to the global frame."""
+        return np.einsum("oij,jon->ion", self.rotation_matrices, directions)
+
+    def _to_environment_order(self, values: np.ndarray) -> np.ndarray:
+        """Sorts the obstacle-axis (second last) back to the environment order."""
+        return np.take(values, self._compiled_indices, axis=-2)
+
+    def get_gamma(self, positions: np.ndarray) -> np.ndarray:
+        """Returns gamma of shape (n_obstacles, n_points) for positions of shape
+        (dimension, n_points) given in the global frame."""
+        positions = self._reshape_positions(positions)
+        relative_positions = self.transform_positions_to_relative(positions)
+
+        gammas = np.zeros((self.n_obstacles, positions.shape[1]))
+
+        sl = self._shape_slices["ellipse"]
+        gammas[sl, :] = self._get_ellipse_gamma(relative_positions[:, sl, :], sl)
+
+        sl = self._shape_slices["cuboid"]
+        gammas[sl, :] = self._get_cuboid_gamma(relative_positions[:, sl, :], sl)
+
+        with np.errstate(divide="ignore"):
+            gammas[self.is_boundary, :] = 1 / gammas[self.is_boundary, :]
+        return self._to_environment_order(gammas)
+
+    def get_normal_direction(self, positions: np.ndarray) -> np.ndarray:
+        """Returns the normal directions of shape (dimension, n_obstacles, n_points)
+        for positions of shape (dimension, n_points) given in the global frame."""
+        positions = self._reshape_positions(positions)
+        relative_positions = self.transform_positions_to_relative(positions)
+
+        normals = np.zeros(relative_positions.shape)
+
+        sl = self._shape_slices["ellipse"]
+        normals[:, sl, :] = self._get_ellipse_normal(relative_positions[:, sl, :], sl)
+
+        sl = self._shape_slices["cuboid"]
+        normals[:, sl, :] = self._get_cuboid_normal(relative_positions[:, sl, :], sl)
+
+        normals = self.transform_directions_from_relative(normals)
+        normals[:, self.is_boundary, :] = (-1) * normals[:, self.is_boundary, :]
+        return self._to_environment_order(normals)
+
+    def get_reference_direction(self, positions: np.ndarray) -> np.ndarray:
+        """Returns the (normalized) reference directions of shape
+        (dimension, n_obstacles, n_points) for positions of shape
+        (dimension, n_points) given in the global frame."""
+        positions = self._reshape_positions(positions)
+
+        reference_points = self.center_positions + np.einsum(
+            "oij,oj->oi", self.rotation_matrices, self.reference_points
+        )
+        reference_directions = (
+            reference_points.T[:, :, np.newaxis] - positions[:, np.newaxis, :]
+        )
+
+        ref_norm = LA.norm(reference_directions, axis=0)
+        ind_nonzero = ref_norm > 0
+        reference_directions[:, ind_nonzero] = (
+            reference_directions[:, ind_nonzero] / ref_norm[ind_nonzero]
+        )
+        reference_directions[:, np.logical_not(ind_nonzero)] = 1.0 / self.dimension
+
+        return self._to_environment_order(reference_directions)
+
+    def _reshape_positions(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.array(positions, dtype=float)
+        if len(positions.shape) == 1:
+            positions = positions.reshape(-1, 1)
+
+        if positions.shape[0] != self.dimension:
+            raise ValueError("Wrong position dimensions")
+        return positions
+
+    def _get_ellipse_gamma(self, relative_positions: np.ndarray, sl: slice):
+        """Gamma as in `EllipseWithAxes.get_gamma` (without boundary inversion)."""
+        semiaxes = (self.semiaxes[sl, :] + self.margins[sl, np.newaxis]).T
+        semiaxes = semiaxes[:, :, np.newaxis]
+        distance_scaling = self.distance_scalings[sl, np.newaxis]
+
+        circle_norm = LA.norm(relative_positions / semiaxes, axis=0)
+        ind_center = circle_norm == 0
+
+        surface_points = np.zeros(relative_positions.shape)
+        ind_nonzero = np.logical_not(ind_center)
+        surface_points[:, ind_nonzero] = (
+            relative_positions[:, ind_nonzero] / circle_norm[ind_nonzero]
+        )
+        surface_points[0, ind_center] = np.tile(
+            semiaxes[0, :, :], (1, ind_center.shape[1])
+        )[ind_center]
+
+        distance_surface = LA.norm(surface_points, axis=0) * distance_scaling
+        distance_position = LA.norm(relative_positions, axis=0) * distance_scaling
+
+        distances = distance_position / distance_surface - 1
+        ind_outside = distance_position > distance_surface
+        distances[ind_outside] = LA.norm(relative_positions - surface_points, axis=0)[
+            ind_outside
+        ]
+
+        return distances * distance_scaling + 1
+
+    def _get_ellipse_normal(self, relative_positions: np.ndarray, sl: slice):
+        """Local normal as in `EllipseWithAxes.get_normal_direction`."""
+        axes = 2 * (
+            self.semiaxes[sl, :]
+            + np.where(self.is_boundary[sl], -1, 1)[:, np.newaxis]
+            * self.margins[sl, np.newaxis]
+        )
+        axes = axes.T[:, :, np.newaxis]
+        curvatures = self.curvatures[sl, np.newaxis]
+
+        normals = (
+            2 * curvatures / axes * (relative_positions / axes) ** (2 * curvatures - 1)
+        )
+        return self._normalize_normals(normals)
+
+    def _get_cuboid_distance(
+        self, relative_positions: np.ndarray, sl: slice
+    ) -> np.ndarray:
+        """Distance as in `CuboidXd.get_distance_to_surface`."""
+        semiaxes = self.semiaxes[sl, :].T[:, :, np.newaxis]
+        margins = np.tile(
+            self.margins[sl, np.newaxis], (1, relative_positions.shape[2])
+        )
+
+        relative_position = np.abs(relative_positions) - semiaxes
+        ind_outside = np.any(relative_position > 0, axis=0)
+
+        # Corner case is treated separately
+        distances = LA.norm(np.maximum(relative_position, 0), axis=0)
+        ind_far = np.logical_and(ind_outside, distances > margins)
+        distances = np.where(
+            ind_outside,
+            margins - distances,
+            margins + (-1) * np.max(relative_position, axis=0),
+        )
+
+        # Case: within margin but outside boundary -> edges have to be rounded
+        pos_norm = LA.norm(relative_positions, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distances_inside = (-1) * distances / (pos_norm + distances)
+
+        return np.where(ind_far, (-1) * distances, distances_inside)
+
+    def _get_cuboid_gamma(self, relative_positions: np.ndarray, sl: slice):
+        """Gamma as in `CuboidXd.get_gamma` (without boundary inversion)."""
+        distances = self._get_cuboid_distance(relative_positions, sl)
+        distances = distances * self.distance_scalings[sl, np.newaxis]
+
+        center_distances = LA.norm(relative_positions, axis=0)
+
+        gammas = distances + 1
+        ind_inside = distances < 0
+        gammas[ind_inside] = center_distances[ind_inside] / (
+            center_distances[ind_inside] - distances[ind_inside]
+        )
+        return gammas
+
+    def _get_cuboid_normal(self, relative_positions: np.ndarray, sl: slice):
+        """Local normal as in `CuboidXd.get_normal_direction` (without boundary
+        flip), i.e., points on the surface are treated separately."""
+        semiaxes = self.semiaxes[sl, :].T[:, :, np.newaxis]
+        axes_margin = 2 * (
+            self.semiaxes[sl, :]
+            + np.where(self.is_boundary[sl], -1, 1)[:, np.newaxis]
+            * self.margins[sl, np.newaxis]
+        )
+        half_axes_margin = (0.5 * axes_margin).T[:, :, np.newaxis]
+
+        gammas = self._get_cuboid_gamma(relative_positions, sl)
+        gammas[self.is_boundary[sl], :] = 1 / gammas[self.is_boundary[sl], :]
+        ind_surface = np.isclose(gammas, 1.0)
+
+        # Away from the surface: inside points are mirrored at the boundary
+        abs_positions = np.abs(relative_positions)
+        ind_inside = np.logical_not(np.any(abs_positions > semiaxes, axis=0))
+        mirrored_positions = np.copy(relative_positions)
+        if np.sum(ind_inside):
+            minimum_factor = np.max(abs_positions / semiaxes, axis=0)
+            mirrored_positions[:, ind_inside] = (
+                mirrored_positions[:, ind_inside] / minimum_factor[ind_inside] ** 2
+            )
+
+        ind_relevant = np.abs(mirrored_positions) > semiaxes
+        normals = np.where(
+            ind_relevant,
+            mirrored_positions - np.copysign(semiaxes, mirrored_positions),
+            0,
+        )
+        normals = self._normalize_normals(normals)
+
+        if np.sum(ind_surface):
+            abs_surface = abs_positions[:, ind_surface]
+            half_axes = np.tile(half_axes_margin, (1, 1, ind_surface.shape[1]))[
+                :, ind_surface
+            ]
+            ind_close = np.isclose(abs_surface, half_axes)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                normals_surface = np.where(
+                    np.any(ind_close, axis=0),
+                    ind_close * 1.0,
+                    1 / (abs_surface - half_axes),
+                )
+            normals_surface = normals_surface / LA.norm(normals_surface, axis=0)
+            normals[:, ind_surface] = np.copysign(
+                normals_surface, relative_positions[:, ind_surface]
+            )
+
+        return normals
+
+    @staticmethod
+    def _normalize_normals(normals: np.ndarray) -> np.ndarray:
+        """Normalize along the first axis; zero normals are set to the first axis."""
+        normal_norm = LA.norm(normals, axis=0)
+        ind_nonzero = normal_norm > 0
+        normals[:, ind_nonzero] = normals[:, ind_nonzero] / normal_norm[ind_nonzero]
+
+        ind_zero = np.logical_not(ind_nonzero)
+        normals[:, ind_zero] = 0
+        normals[0, ind_zero] = 1
+        return normals
@@ -8,14 +8,18 @@ Container to describe obstacles & wall environemnt.
 from abc import ABC, abstractmethod
 
 import numpy as np
+from numpy import linalg as LA
 import warnings
 
 from dynamic_obstacle_avoidance.utils import *
 
+from .spatial_index import SpatialIndex
+
 
 class BaseContainer(ABC):
     def __init__(self, obs_list=None):
         self._obstacle_list = []
+        self._spatial_index = None
 
         if obs_list is not None:
             # Add all obstacles
@@ -38,14 +42,17 @@ class BaseContainer(ABC):
 
     def __setitem__(self, key, value):
         self._obstacle_list[key] = value
+        self.reset_spatial_index()
 
     def append(self, value):  # Compatibility with normal list.
         """Add new elements to obstacles list. The wall obstacle is placed last."""
         self._obstacle_list.append(value)
+        self.reset_spatial_index()
 
     def __delitem__(self, key):
         """Obstacle is not part of the workspace anymore."""
         del self._obstacle_list[key]
+        self.reset_spatial_index()
 
     def add_obstacle(self, value):
         self.append(value)
@@ -92,6 +99,80 @@ class BaseContainer(ABC):
     def has_environment(self):
         return bool(len(self))
 
+    @property
+    def has_spatial_index(self) -> bool:
+        return getattr(self, "_spatial_index", None) is not None
+
+    def build_spatial_index(self, rebuild_slack: float = None) -> None:
+        """Enables the spatial index, which is used by the radius / nearest queries
+        and the collision checks to only evaluate close obstacles."""
+        self._spatial_index = SpatialIndex(self, rebuild_slack=rebuild_slack)
+        self._spatial_index_is_outdated = False
+
+    def reset_spatial_index(self) -> None:
+        """Marks the spatial index for a rebuild (e.g. after a change of the list)."""
+        self._spatial_index_is_outdated = True
+
+    def update_spatial_index(self, only_moved: bool = True) -> None:
+        """Update the obstacles which report 'has_moved' (or all obstacles)."""
+        if not self.has_spatial_index:
+            return
+
+        if self._spatial_index_is_outdated:
+            self._spatial_index.rebuild()
+            self._spatial_index_is_outdated = False
+        else:
+            self._spatial_index.update(only_moved=only_moved)
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        if self.has_spatial_index and self._spatial_index_is_outdated:
+            self._spatial_index.rebuild()
+            self._spatial_index_is_outdated = False
+        return self._spatial_index
+
+    def query_radius(self, position: np.ndarray, radius: float) -> np.ndarray:
+        """Returns the indices of the obstacles whose bounding sphere is within
+        radius of position. Boundaries and obstacles without bounding radius are
+        always part of it."""
+        if self.has_spatial_index:
+            return self.spatial_index.query_radius(position, radius)
+
+        indices = []
+        for ii, obs in enumerate(self._obstacle_list):
+            bounding_radius = None if obs.is_boundary else obs.get_bounding_radius()
+            if (
+                bounding_radius is None
+                or LA.norm(position - obs.center_position) - bounding_radius <= radius
+            ):
+                indices.append(ii)
+        return np.array(indices, dtype=int)
+
+    def query_nearest(self, position: np.ndarray, k: int = 1) -> np.ndarray:
+        """Returns the indices of the k obstacles with the closest bounding sphere
+        (boundaries and obstacles without bounding radius are not considered)."""
+        if self.has_spatial_index:
+            return self.spatial_index.query_nearest(position, k=k)
+
+        indices = []
+        distances = []
+        for ii, obs in enumerate(self._obstacle_list):
+            bounding_radius = None if obs.is_boundary else obs.get_bounding_radius()
+            if bounding_radius is None:
+                continue
+            indices.append(ii)
+            distances.append(
+                max(LA.norm(position - obs.center_position) - bounding_radius, 0)
+            )
+        ind_sorted = np.argsort(distances, kind="stable")[:k]
+        return np.array(indices, dtype=int)[ind_sorted]
+
+    def _get_collision_candidates(self, position: np.ndarray) -> list:
+        """Obstacles which can contain the position (all without spatial index)."""
+        if not self.has_spatial_index:
+            return self._obstacle_list
+        return [self._obstacle_list[ii] for ii in self.query_radius(position, 0)]
+
     def get_multiobstacle_gamma(self, position: np.ndarray) -> float:
         gammas = np.zeros(self.n_obstacles)
 
@@ -101,7 +182,7 @@ class BaseContainer(ABC):
         return np.min(gammas)
 
     def is_collision_free(self, position: np.ndarray) -> bool:
-        for obs in self._obstacle_list:
+        for obs in self._get_collision_candidates(position):
             if obs.get_gamma(position, in_global_frame=True) < 1:
                 return False
 
@@ -119,10 +200,10 @@ class BaseContainer(ABC):
         > Boundaries are mutually subractive, i.e. collision free with at least one boundary.
         """
         gamma_list_boundary = []
-        for oo in range(self.n_obstacles):
-            gamma = self[oo].get_gamma(position, in_global_frame=True)
+        for obs in self._get_collision_candidates(position):
+            gamma = obs.get_gamma(position, in_global_frame=True)
 
-            if self[oo].is_boundary:
+            if obs.is_boundary:
                 gamma_list_boundary.append(gamma)
 
             elif gamma <= 1:
@@ -135,23 +216,34 @@ class BaseContainer(ABC):
         else:
             return False
 
+    def get_gamma_matrix(self, positions: np.ndarray) -> np.ndarray:
+        """Returns the gamma of all obstacles of shape (n_obstacles, n_points) for
+        positions of shape (dimension, n_points) given in the global frame."""
+        gamma_matrix = np.zeros((len(self._obstacle_list), positions.shape[1]))
+        for ii, obs in enumerate(self._obstacle_list):
+            gamma_matrix[ii, :] = obs.get_gamma_array(positions, in_global_frame=True)
+        return gamma_matrix
+
     def check_collision_array(self, positions: np.ndarray) -> np.ndarray:
-        """Return array of checked collisions of type bool."""
-        collision_array = np.zeros(positions.shape[1], dtype=bool)
-        for it in range(positions.shape[1]):
-            collision_array[it] = self.is_position_colliding(positions[:, it])
+        """Return array of checked collisions of type bool (with the same convention
+        as `is_position_colliding`)."""
+        gamma_matrix = self.get_gamma_matrix(positions)
+        is_boundary = np.array(
+            [obs.is_boundary for obs in self._obstacle_list], dtype=bool
+        )
+
+        collision_array = np.any(
+            gamma_matrix[np.logical_not(is_boundary), :] <= 1, axis=0
+        )
+        if np.any(is_boundary):
+            # At least one boundary
+            collision_array = np.logical_or(
+                collision_array, np.all(gamma_matrix[is_boundary, :] <= 1, axis=0)
+            )
         return collision_array
 
     def get_minimum_gamma_of_array(self, positions: np.ndarray) -> np.ndarray:
-        gamma_array = np.zeros((len(self._obstacle_list), positions.shape[1]))
-
-        for ii, obs in enumerate(self._obstacle_list):
-            for jj in range(positions.shape[1]):
-                gamma_array[ii, jj] = obs.get_gamma(
-                    positions[:, jj], in_global_frame=True
-                )
-
-        return np.min(gamma_array, axis=0)
+        return np.min(self.get_gamma_matrix(positions), axis=0)
 
     def get_minimum_gamma(self, position: np.ndarray) -> float:
         gamma_array = np.zeros((len(self._obstacle_list)))
@@ -161,10 +253,15 @@ class BaseContainer(ABC):
 
         return np.min(gamma_array)
 
+    def get_obstacles_at_time(self, delta_time: float) -> list:
+        """Returns a list of the (copied) obstacles moved to the pose after
+        delta_time, the obstacles of the container are not changed."""
+        return [obs.get_obstacle_at_time(delta_time) for obs in self._obstacle_list]
+
     def is_collision_free(self, position: np.ndarray) -> bool:
         """Checks if any of the (normal) obstacles is colliding
         Note, that this is overwritten for multi-boundary obstacles."""
-        for obs in self._obstacle_list:
+        for obs in self._get_collision_candidates(position):
             if obs.get_gamma(position, in_global_frame=True) < 1:
                 return False
 
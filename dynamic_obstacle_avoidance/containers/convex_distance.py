@@ -0,0 +1,117 @@
+"""
+Closest points of two convex obstacles based on their support mappings (GJK).
+"""
+
+import itertools
+from typing import Optional
+
+import numpy as np
+from numpy import linalg as LA
+
+
+def get_closest_simplex_point(vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the weights and the indexes of the vertices (n_vertices, dimension)
+    which span the point of their convex hull closest to the origin.
+
+    The affine hull of each subset is evaluated (at most 2^(dimension+1) - 1 small
+    linear systems), and the closest point with non-negative weights is kept."""
+    n_vertices = vertices.shape[0]
+
+    best_weights = best_indexes = None
+    best_distance = np.inf
+    for n_subset in range(1, n_vertices + 1):
+        for indexes in itertools.combinations(range(n_vertices), n_subset):
+            indexes = np.array(indexes)
+            subset = vertices[indexes, :]
+
+            # Minimize |weights @ subset| subject to sum(weights) = 1
+            system = np.ones((n_subset + 1, n_subset + 1))
+            system[:n_subset, :n_subset] = subset @ subset.T
+            system[-1, -1] = 0
+            rhs = np.zeros(n_subset + 1)
+            rhs[-1] = 1
+            try:
+                weights = LA.solve(system, rhs)[:n_subset]
+            except LA.LinAlgError:
+                # Degenerate subset, i.e., the points are affinely dependent
+                continue
+
+            if np.any(weights < 0):
+                continue
+
+            distance = LA.norm(weights @ subset)
+            if distance < best_distance:
+                best_weights = weights
+                best_indexes = indexes
+                best_distance = distance
+
+    return best_weights, best_indexes
+
+
+def get_convex_closest_points(
+    obs0,
+    obs1,
+    direction: Optional[np.ndarray] = None,
+    convergence_err: float = 1e-6,
+    max_it: int = 100,
+) -> Optional[tuple[float, np.ndarray, np.ndarray, int]]:
+    """Closest points of two convex obstacles found with the Gilbert-Johnson-Keerthi
+    (GJK) distance algorithm, i.e., the point of the Minkowski difference
+    (obs0 - obs1) closest to the origin is searched using the support mappings of the
+    obstacles (see `Obstacle.get_support_point`).
+
+    The search starts in direction (from obs0 towards obs1), e.g., the difference of
+    the last closest points; the direction between the centers is used by default.
+
+    Returns
+    -------
+    None if either obstacle does not provide a support mapping, otherwise the tuple
+    (distance, point0, point1, n_iterations) with the closest points (in the global
+    frame) on the surface of obs0 and obs1. Intersecting obstacles have distance=0
+    and no closest points (None).
+    """
+    if direction is None:
+        direction = obs1.center_position - obs0.center_position
+    if not LA.norm(direction):
+        direction = np.ones(direction.shape[0])
+
+    point0 = obs0.get_support_point(direction, in_global_frame=True)
+    point1 = obs1.get_support_point((-1) * direction, in_global_frame=True)
+    if point0 is None or point1 is None:
+        return None
+
+    dimension = direction.shape[0]
+
+    # Simplex of the Minkowski difference, with the generating points of both obstacles
+    simplex_points0 = point0.reshape(1, -1)
+    simplex_points1 = point1.reshape(1, -1)
+    weights = np.ones(1)
+    closest_point = point0 - point1
+
+    for it_count in range(1, max_it + 1):
+        distance = LA.norm(closest_point)
+        if distance < convergence_err:
+            return 0.0, None, None, it_count
+
+        point0 = obs0.get_support_point((-1) * closest_point, in_global_frame=True)
+        point1 = obs1.get_support_point(closest_point, in_global_frame=True)
+
+        # The support point bounds the distance from below
+        distance_lower = closest_point.dot(point0 - point1) / distance
+        if distance - distance_lower <= convergence_err:
+            break
+
+        simplex_points0 = np.vstack((simplex_points0, point0))
+        simplex_points1 = np.vstack((simplex_points1, point1))
+        weights, indexes = get_closest_simplex_point(simplex_points0 - simplex_points1)
+        simplex_points0 = simplex_points0[indexes, :]
+        simplex_points1 = simplex_points1[indexes, :]
+        closest_point = weights @ (simplex_points0 - simplex_points1)
+
+        if indexes.shape[0] > dimension:
+            # The origin is enclosed by the simplex
+            return 0.0, None, None, it_count
+
+    point0 = weights @ simplex_points0
+    point1 = weights @ simplex_points1
+    return LA.norm(point0 - point1), point0, point1, it_count
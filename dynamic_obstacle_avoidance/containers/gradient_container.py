@@ -10,14 +10,23 @@ import warnings, sys
 import numpy as np
 import copy
 import time
+from dataclasses import dataclass
+from typing import Optional
 
+from scipy.spatial.transform import Rotation
 from shapely.ops import nearest_points
 
+from vartools.linalg import get_orthogonal_basis
+from vartools.directional_space import get_angle_space, get_angle_space_inverse
+
 from dynamic_obstacle_avoidance.utils import get_reference_weight
 
 from dynamic_obstacle_avoidance.obstacles import CircularObstacle
 
 from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.containers.convex_distance import (
+    get_convex_closest_points,
+)
 
 from dynamic_obstacle_avoidance.avoidance.obs_common_section import *
 from dynamic_obstacle_avoidance.avoidance.obs_dynamic_center_3d import *
@@ -28,6 +37,62 @@ from dynamic_obstacle_avoidance.avoidance.obs_dynamic_center_3d import *
 #    - Gradient descent: change function
 
 
+@dataclass
+class PairSearchState:
+    """State of the closest-point search of an obstacle pair, which is kept between
+    the updates of the reference points. The last closest points themselves are
+    stored as boundary reference points in the container.
+
+    Attributes
+    ----------
+    n_iterations: gradient-descent iterations of the last search
+    n_iterations_cold: iterations of the first (cold-started) search of the pair
+    intersection_point: common point if the obstacles intersect, None otherwise
+    poses: poses (see `GradientContainer.get_pose_vector`) of both obstacles at the
+        last search, the stored result is only valid while they are unchanged
+    """
+
+    n_iterations: int = 0
+    n_iterations_cold: int = 0
+    intersection_point: Optional[np.ndarray] = None
+    poses: Optional[tuple] = None
+
+    def is_pose_unchanged(self, pose0: np.ndarray, pose1: np.ndarray) -> bool:
+        return (
+            self.poses is not None
+            and np.array_equal(self.poses[0], pose0)
+            and np.array_equal(self.poses[1], pose1)
+        )
+
+
+@dataclass
+class PairSearchTelemetry:
+    """Accumulated statistics of the closest-point searches of a container.
+
+    Attributes
+    ----------
+    n_searches: number of (warm- or cold-started) pair searches
+    n_warm_starts: number of searches started from the last closest points
+    n_pairs_skipped: number of pairs skipped since neither obstacle has moved
+    n_iterations: total gradient-descent iterations
+    n_iterations_saved: iterations saved compared to cold-starting every search,
+        estimated with the iterations of the first search of each pair
+    """
+
+    n_searches: int = 0
+    n_warm_starts: int = 0
+    n_pairs_skipped: int = 0
+    n_iterations: int = 0
+    n_iterations_saved: int = 0
+
+    def reset(self) -> None:
+        self.n_searches = 0
+        self.n_warm_starts = 0
+        self.n_pairs_skipped = 0
+        self.n_iterations = 0
+        self.n_iterations_saved = 0
+
+
 class GradientContainer(ObstacleContainer):
     """Obstacle Container which can be used with gradient search. It additionally stores
     the closest boundary point between obstacles."""
@@ -49,6 +114,16 @@ class GradientContainer(ObstacleContainer):
             self._distance_matrix = None
             # self._are_close_for_first_time = None
 
+        # Obstacle pairs (ii < jj) which passed the last broad phase
+        self._candidate_pairs = set()
+
+        # Search state of the obstacle pairs (ii < jj) which have been evaluated
+        self._pair_search_states = {}
+        self.search_telemetry = PairSearchTelemetry()
+
+        # Clusters of intersecting obstacles, updated with the changed intersections
+        self._intersection_clusters = None
+
     def append(self, value):  # Compatibility with normal list.
         """Add new obstacle to the end of the container."""
         if sys.version_info > (3, 0):  # Python 3
@@ -62,6 +137,9 @@ class GradientContainer(ObstacleContainer):
             self._boundary_reference_points = np.zeros((self.dim, len(self), len(self)))
             self._distance_matrix = DistanceMatrix(n_obs=len(self))
             # self._are_close_for_first_time = np.zeros()
+            self._candidate_pairs = set()
+            self._pair_search_states = {}
+            self._intersection_clusters = None
         else:
             # TODO: alternative for computational speed!
 
@@ -96,12 +174,20 @@ class GradientContainer(ObstacleContainer):
 
     def __delitem__(self, key):  # Compatibility with normal list.
         """Remove obstacle from container list."""
+        if isinstance(key, slice):
+            # Remove from the back, such that the remaining indexes stay valid
+            for index in sorted(range(len(self))[key], reverse=True):
+                del self[index]
+            return
 
         if sys.version_info > (3, 0):  # Python 3
             super().__delitem__(key)
         else:  # Python 2 compatibility
             super(GradientContainer, self).__delitem__(key)
 
+        # Negative index with respect to the list before the removal
+        key = key % (len(self) + 1)
+
         # update boundary reference point & distance matrix
         if len(self) == 0:
             self._boundary_reference_points = None
@@ -119,12 +205,24 @@ class GradientContainer(ObstacleContainer):
             distance_matrix = np.delete(distance_matrix, (key), axis=1)
 
             new_dist_matr = DistanceMatrix(n_obs=len(self))
-            for ii in range(len(self)):
-                for jj in range(ii + 1, len(self)):
-                    new_dist_matr[ii, jj] = self._distance_matrix[ii, jj]
+            rows, cols = new_dist_matr.triangle_indices
+            new_dist_matr[rows, cols] = distance_matrix[rows, cols]
 
             self._distance_matrix = new_dist_matr
 
+        # Shift the indexes of the remaining pairs
+        self._candidate_pairs = set(
+            (ii - (ii > key), jj - (jj > key))
+            for ii, jj in self._candidate_pairs
+            if key not in (ii, jj)
+        )
+        self._pair_search_states = {
+            (ii - (ii > key), jj - (jj > key)): search_state
+            for (ii, jj), search_state in self._pair_search_states.items()
+            if key not in (ii, jj)
+        }
+        self._intersection_clusters = None
+
     @property
     def index_wall(self):
         ind_wall = None
@@ -145,6 +243,14 @@ class GradientContainer(ObstacleContainer):
         """Distance between obstacles ii and jj"""
         self._distance_matrix[ii, jj] = value
 
+    @staticmethod
+    def get_pose_vector(obs) -> np.ndarray:
+        """Center position and orientation of the obstacle as one (flat) array."""
+        orientation = obs.orientation
+        if isinstance(orientation, Rotation):
+            orientation = orientation.as_quat()
+        return np.hstack((obs.center_position, np.ravel(orientation)))
+
     def reset_obstacles_have_moved(self):
         """Resets obstacles in list such that they have NOT moved."""
         for obs in self._obstacle_list:
@@ -170,52 +276,89 @@ class GradientContainer(ObstacleContainer):
         value = self[ii].transform_global2relative(value)
         self._boundary_reference_points[:, ii, jj] = value
 
-    def update_reference_points(self):
+    def get_candidate_pairs(self, distance_max=3):
+        """Broad phase of the reference point search: returns the (n_pairs, 2) array
+        of the obstacle indexes (ii < jj) whose bounding spheres are closer than
+        distance_max. Boundaries and obstacles without bounding radius are paired
+        with all other obstacles."""
+        centers = np.array([obs.center_position for obs in self])
+        radii = np.zeros(len(self))
+        for ii, obs in enumerate(self):
+            radius = None if obs.is_boundary else obs.get_bounding_radius()
+            radii[ii] = np.inf if radius is None else radius
+
+        dist_centers = np.linalg.norm(
+            centers[:, np.newaxis, :] - centers[np.newaxis, :, :], axis=2
+        )
+        # Lower bound of the distance between the surfaces
+        dist_surfaces = dist_centers - radii[:, np.newaxis] - radii[np.newaxis, :]
+
+        is_candidate = np.triu(dist_surfaces < distance_max, k=1)
+        return np.array(np.nonzero(is_candidate)).T
+
+    def update_reference_points(self, distance_max=3, need_for_speed=True):
         """Update the reference point for all obstacles stored in (this)
-        container based on distance"""
+        container based on distance.
+
+        Only the obstacle pairs which pass the broad phase (see `get_candidate_pairs`)
+        are evaluated, as pairs further apart than distance_max have zero weight.
+
+        need_for_speed: if True, the closest points of all pairs are approximated by
+            circles; otherwise, they are searched (warm-started) with the convex
+            closest points (GJK) or the gradient descent."""
 
         # No commen reference point
         if len(self) == 0:
             return
 
-        self.intersection_matrix = Intersection_matrix(len(self))
+        self.intersection_matrix = Intersection_matrix(len(self), dim=self.dim)
         self.reset_reference_points()
-        now = time.time()
-        self.update_boundary_reference_points()
-        delta_t = time.time() - now
+
+        candidate_pairs = self.get_candidate_pairs(distance_max=distance_max)
+        candidate_set = set(map(tuple, candidate_pairs.tolist()))
+        for ii, jj in self._candidate_pairs - candidate_set:
+            # Pruned pairs are 'far' again
+            self.set_distance(ii, jj, -1)
+            self._pair_search_states.pop((ii, jj), None)
+        self._candidate_pairs = candidate_set
+
+        self.update_boundary_reference_points(
+            need_for_speed=need_for_speed, candidate_pairs=candidate_pairs
+        )
 
         obs_reference_size = np.zeros(len(self))
 
         for ii in range(len(self)):
             obs_reference_size[ii] = self[ii].get_reference_length()
 
+        neighbours = [[] for ii in range(len(self))]
+        for ii, jj in candidate_pairs:
+            neighbours[ii].append(jj)
+            neighbours[jj].append(ii)
+
         for ii in range(len(self)):
             # Boundaries have constant center
-            if self[ii].is_boundary:
+            if self[ii].is_boundary or not len(neighbours[ii]):
                 continue
 
-            distances = np.zeros(len(self))
-            for jj in range(len(self)):
-                if ii == jj:
-                    # DistanceMatrix[ii, jj] = \
-                    distances[jj] = -1
-                else:
-                    # DistanceMatrix[ii, jj] =
-                    distances[jj] = self.get_distance(ii, jj)
-
-            weights = get_reference_weight(distances, obs_reference_size)
+            distances = np.array([self.get_distance(ii, jj) for jj in neighbours[ii]])
+            weights = get_reference_weight(
+                distances,
+                obs_reference_size[neighbours[ii]],
+                distance_max=distance_max,
+            )
 
             # print('weights', np.round(weights, 2))
             if np.sum(weights):
                 reference_point = np.zeros(self[ii].dim)
-                for jj in range(len(self)):
-                    if ii == jj or weights[jj]:
+                for jj, weight in zip(neighbours[ii], weights):
+                    if not weight:
                         continue
 
                     ref = self.get_boundary_reference_point(ii, jj)
                     reference_point = (
                         reference_point
-                        + self[ii].transform_global2relative(ref) * weights[jj]
+                        + self[ii].transform_global2relative(ref) * weight
                     )
                 self[ii].set_reference_point(reference_point, in_global_frame=False)
 
@@ -228,7 +371,14 @@ class GradientContainer(ObstacleContainer):
         # TODO: include the 'extended' hull as a deformation parameter
 
         # Combine reference points of obstacles in each cluster
-        intersecting_obs = get_intersection_cluster(self.intersection_matrix, self)
+        if (
+            self._intersection_clusters is None
+            or self._intersection_clusters.n_obstacles != len(self)
+        ):
+            self._intersection_clusters = IntersectionClusters(len(self))
+        intersecting_obs = get_intersection_cluster(
+            self.intersection_matrix, self, clusters=self._intersection_clusters
+        )
         # self.assign_sibling_groups(intersecting_obs)
 
         get_single_reference_point(self, intersecting_obs, self.intersection_matrix)
@@ -262,167 +412,234 @@ class GradientContainer(ObstacleContainer):
         step_size=2,
         mult_consideration_dist=3,
         need_for_speed=True,
+        candidate_pairs=None,
     ):
         """Boundary reference point refers to the closest point on the obstacle surface
-        to another obstacle."""
+        to another obstacle.
+
+        candidate_pairs: (n_pairs, 2) array of the obstacle indexes (ii < jj) which
+            are evaluated; all pairs are evaluated if None."""
         dim = self[0].dim
         if dim < 2:
             raise ValueError("No obstacle avoidance possible in d=2.")
 
+        if candidate_pairs is None:
+            candidate_pairs = np.array(np.triu_indices(len(self), k=1)).T
+
+        # The flag 'has_moved' is not set by the pose setters, hence, the poses are
+        # compared to the ones of the last search, too
+        poses = [self.get_pose_vector(obs) for obs in self]
+
+        # Iterate over the (candidate) obstacle pairs
+        for ii, jj in candidate_pairs:
+            ii, jj = int(ii), int(jj)
+            search_state = self._pair_search_states.get((ii, jj))
+            if (
+                search_state is not None
+                and not (self[ii].has_moved or self[jj].has_moved)
+                and search_state.is_pose_unchanged(poses[ii], poses[jj])
+            ):
+                # Neither obstacle has moved, i.e., the stored result is still valid
+                self.intersection_matrix[ii, jj] = search_state.intersection_point
+                self.search_telemetry.n_pairs_skipped += 1
+                self.search_telemetry.n_iterations_saved += (
+                    search_state.n_iterations_cold
+                )
+                continue
+
+            is_warm_start = search_state is not None and self.get_distance(ii, jj) >= 0
+            if search_state is None:
+                search_state = PairSearchState()
+                self._pair_search_states[(ii, jj)] = search_state
+
+            search_state.n_iterations = 0
+            self._update_boundary_reference_points_of_pair(
+                ii,
+                jj,
+                search_state=search_state,
+                mult_consideration_dist=mult_consideration_dist,
+                need_for_speed=need_for_speed,
+            )
+            search_state.intersection_point = self.intersection_matrix[ii, jj]
+            search_state.poses = (poses[ii], poses[jj])
+
+            self.search_telemetry.n_searches += 1
+            self.search_telemetry.n_iterations += search_state.n_iterations
+            if is_warm_start:
+                self.search_telemetry.n_warm_starts += 1
+                self.search_telemetry.n_iterations_saved += max(
+                    search_state.n_iterations_cold - search_state.n_iterations, 0
+                )
+            else:
+                search_state.n_iterations_cold = search_state.n_iterations
+
+    def _update_boundary_reference_points_of_pair(
+        self, ii, jj, search_state, mult_consideration_dist=3, need_for_speed=True
+    ):
+        """Updates the distance, boundary reference points and intersection of the
+        obstacle pair (ii < jj). The closest-point search is warm-started from the
+        stored boundary reference points if the pair has been close before."""
+        dim = self[ii].dim
+
         # Compare two (2) obstacles to each other
         n_com = 2
 
-        # Iterate over all obstacles (but last element, because nothing to compare to)
-        for ii in range(len(self) - 1):
-            size_ii = self[ii].get_reference_length()
-            for jj in range(ii + 1, len(self)):
-                # Only update if either of the obstacles has 'moved/updated' previously
-                # if not (self[ii].has_moved or self[jj].has_moved):
-                # continue
-
-                # Check if exeeds maximal distance
-                size_jj = self[ii].get_reference_length()
-                dist_ii2jj = np.linalg.norm(
-                    self[ii].center_position - self[jj].center_position
-                )
+        # Check if exeeds maximal distance
+        size_ii = self[ii].get_reference_length()
+        size_jj = self[ii].get_reference_length()
+        dist_ii2jj = np.linalg.norm(self[ii].center_position - self[jj].center_position)
+
+        # Don't calculate if obstacles are too far away from each other
+        if (
+            dist_ii2jj - (size_ii + size_jj)
+            > max(size_ii, size_jj) * mult_consideration_dist
+        ):
+            # print("Too far away")
+            return
 
-                # Don't calculate if obstacles are too far away from each other
-                if (
-                    dist_ii2jj - (size_ii + size_jj)
-                    > max(size_ii, size_jj) * mult_consideration_dist
-                ):
-                    # print("Too far away")
-                    continue
-
-                # Speed up process for circular obstacles
-                if (
-                    isinstance(self[ii], CircularObstacle)
-                    and isinstance(self[jj], CircularObstacle)
-                ) or need_for_speed:
-
-                    (
-                        dist,
-                        ref_point1,
-                        ref_point2,
-                    ) = self.get_boundary_reference_point_simplified(self[ii], self[jj])
-
-                    self.set_distance(ii, jj, dist)
-                    self.set_boundary_reference_point(ii, jj, ref_point1)
-                    if not ref_point2 is None:
-                        # Is a boundary with 'static reference point'
-                        self.set_boundary_reference_point(jj, ii, ref_point2)
-
-                    if dist <= 0:
-                        # Distance==0, i.e. intersecting & ref_point1==ref_point2
-                        self.intersection_matrix[ii, jj] = ref_point1
-                    continue
-
-                center_dists = np.zeros((self.dim, n_com))
-                center_dists[:, 1] = self[ii].center_position - self[jj].center_position
-
-                if self[jj].is_boundary:
-                    # If compare to the boundary, then the obstacle has to look outwards (wall)
-                    center_dists[:, 0] = center_dists[:, 1]
-                else:
-                    center_dists[:, 0] = (-1) * center_dists[:, 1]
+        # Speed up process for circular obstacles
+        if (
+            isinstance(self[ii], CircularObstacle)
+            and isinstance(self[jj], CircularObstacle)
+        ) or need_for_speed:
+
+            (
+                dist,
+                ref_point1,
+                ref_point2,
+            ) = self.get_boundary_reference_point_simplified(self[ii], self[jj])
+
+            self.set_distance(ii, jj, dist)
+            self.set_boundary_reference_point(ii, jj, ref_point1)
+            if not ref_point2 is None:
+                # Is a boundary with 'static reference point'
+                self.set_boundary_reference_point(jj, ii, ref_point2)
+
+            if dist <= 0:
+                # Distance==0, i.e. intersecting & ref_point1==ref_point2
+                self.intersection_matrix[ii, jj] = ref_point1
+            return
 
-                if np.linalg.norm(center_dists[:, 0]) > 1e10 and not self.is_boundary:
-                    # TODO: Check & Test this exception!
-                    self.set_distance(ii, jj, 0)  # TODO: check if 0 or -1 ?
-                    self.intersection_matrix[ii, jj] = self[ii].center_position
-                    continue
+        # Exact closest points if both obstacles are convex (support mapping)
+        direction = None
+        if self.get_distance(ii, jj) > 0:
+            # Warm start from the last closest points
+            direction = self.get_boundary_reference_point(
+                jj, ii
+            ) - self.get_boundary_reference_point(ii, jj)
 
-                elif self.get_distance(ii, jj) < 0:
-                    is_close_for_the_first_time = True
+        closest_points = get_convex_closest_points(
+            self[ii], self[jj], direction=direction
+        )
+        if closest_points is not None:
+            dist, ref_point1, ref_point2, search_state.n_iterations = closest_points
+            if dist > 0:
+                self.set_distance(ii, jj, dist)
+                self.set_boundary_reference_point(ii, jj, ref_point1)
+                self.set_boundary_reference_point(jj, ii, ref_point2)
+                return
+            # The common point of intersecting obstacles is found with the descent
+
+        center_dists = np.zeros((self.dim, n_com))
+        center_dists[:, 1] = self[ii].center_position - self[jj].center_position
+
+        if self[jj].is_boundary:
+            # If compare to the boundary, then the obstacle has to look outwards (wall)
+            center_dists[:, 0] = center_dists[:, 1]
+        else:
+            center_dists[:, 0] = (-1) * center_dists[:, 1]
 
-                else:
-                    is_close_for_the_first_time = False
+        if np.linalg.norm(center_dists[:, 0]) > 1e10 and not self.is_boundary:
+            # TODO: Check & Test this exception!
+            self.set_distance(ii, jj, 0)  # TODO: check if 0 or -1 ?
+            self.intersection_matrix[ii, jj] = self[ii].center_position
+            return
 
-                angles = np.zeros((dim - 1) * 2)
-                surf_points = np.zeros((dim, 2))
+        elif self.get_distance(ii, jj) < 0:
+            is_close_for_the_first_time = True
 
-                # Gamma based descent
-                if is_close_for_the_first_time:
-                    surf_points[:, 0] = self[ii].get_local_radius_point(
-                        direction=center_dists[:, 0], in_global_frame=True
-                    )
+        else:
+            is_close_for_the_first_time = False
 
-                    surf_points[:, 1] = self[jj].get_local_radius_point(
-                        direction=center_dists[:, 1], in_global_frame=True
-                    )
+        angles = np.zeros((dim - 1) * 2)
+        surf_points = np.zeros((dim, 2))
 
-                else:
-                    surf_points[:, 0] = self.get_boundary_reference_point(ii, jj)
-                    surf_points[:, 1] = self.get_boundary_reference_point(jj, ii)
-
-                # Check if any of the surface points is inside the other object
-                margin = 1e-4
-                if (
-                    self[ii].get_gamma(surf_points[:, 1], in_global_frame=True)
-                    <= 1 + margin
-                    or self[jj].get_gamma(surf_points[:, 0], in_global_frame=True)
-                    <= 1 + margin
-                ):
-                    # The obstacle is intersecting
-                    print("Touching initially -- Gamma Descent")
-
-                    self[ii].get_gamma(surf_points[:, 1], in_global_frame=True)
-
-                    reference_point = self.gamma_gradient_descent(
-                        self[ii],
-                        self[jj],
-                        common_point=np.mean(surf_points, axis=1),
-                    )
+        # Gamma based descent
+        if is_close_for_the_first_time:
+            surf_points[:, 0] = self[ii].get_local_radius_point(
+                direction=center_dists[:, 0], in_global_frame=True
+            )
 
-                    # Set the boundary reference point on for the obstacle-pair
-                    self.set_boundary_reference_point(ii, jj, reference_point)
-                    self.set_boundary_reference_point(jj, ii, reference_point)
-                    self.intersection_matrix[ii, jj] = reference_point
-                    self.set_distance(ii, jj, 0)
+            surf_points[:, 1] = self[jj].get_local_radius_point(
+                direction=center_dists[:, 1], in_global_frame=True
+            )
 
-                else:
-                    NullMatrices = np.zeros((n_com, dim, dim))
-                    NullMatrices[0, :, :] = get_orthogonal_basis(center_dists[:, 0])
-                    NullMatrices[1, :, :] = get_orthogonal_basis(center_dists[:, 1])
-
-                    # Get angles and do iteration
-                    if not is_close_for_the_first_time:
-                        for kk, obstacle in zip(range(2), (self[ii], self[jj])):
-                            angles[
-                                kk * (dim - 1) : (kk + 1) * (dim - 1)
-                            ] = get_angle_space(
-                                directions=surf_points[:, kk]
-                                - obstacle.center_position,
-                                OrthogonalBasisMatrix=NullMatrices[kk, :, :],
-                            )
-
-                            # Reset if too far out
-                            if (
-                                np.linalg.norm(
-                                    angles[kk * (dim - 1) : (kk + 1) * (dim - 1)]
-                                )
-                                > pi
-                            ):
-                                angles[kk * (dim - 1) : (kk + 1)(dim - 1)] = 0
-
-                    cent_points = np.zeros((dim, 2))
-
-                    dist, ref_point1, ref_point2 = self.angle_gradient_descent(
-                        self[ii],
-                        self[jj],
-                        angles=angles,
-                        NullMatrices=NullMatrices,
+        else:
+            surf_points[:, 0] = self.get_boundary_reference_point(ii, jj)
+            surf_points[:, 1] = self.get_boundary_reference_point(jj, ii)
+
+        # Check if any of the surface points is inside the other object
+        margin = 1e-4
+        if (
+            self[ii].get_gamma(surf_points[:, 1], in_global_frame=True) <= 1 + margin
+            or self[jj].get_gamma(surf_points[:, 0], in_global_frame=True) <= 1 + margin
+        ):
+            # The obstacle is intersecting
+            print("Touching initially -- Gamma Descent")
+
+            self[ii].get_gamma(surf_points[:, 1], in_global_frame=True)
+
+            reference_point = self.gamma_gradient_descent(
+                self[ii],
+                self[jj],
+                common_point=np.mean(surf_points, axis=1),
+            )
+
+            # Set the boundary reference point on for the obstacle-pair
+            self.set_boundary_reference_point(ii, jj, reference_point)
+            self.set_boundary_reference_point(jj, ii, reference_point)
+            self.intersection_matrix[ii, jj] = reference_point
+            self.set_distance(ii, jj, 0)
+
+        else:
+            NullMatrices = np.zeros((n_com, dim, dim))
+            NullMatrices[0, :, :] = get_orthogonal_basis(center_dists[:, 0])
+            NullMatrices[1, :, :] = get_orthogonal_basis(center_dists[:, 1])
+
+            # Get angles and do iteration
+            if not is_close_for_the_first_time:
+                for kk, obstacle in zip(range(2), (self[ii], self[jj])):
+                    angles[kk * (dim - 1) : (kk + 1) * (dim - 1)] = get_angle_space(
+                        surf_points[:, kk] - obstacle.center_position,
+                        OrthogonalBasisMatrix=NullMatrices[kk, :, :],
                     )
 
-                    self.set_distance(ii, jj, dist)
+                    # Reset if too far out
+                    if (
+                        np.linalg.norm(angles[kk * (dim - 1) : (kk + 1) * (dim - 1)])
+                        > pi
+                    ):
+                        angles[kk * (dim - 1) : (kk + 1) * (dim - 1)] = 0
+
+            cent_points = np.zeros((dim, 2))
+
+            dist, ref_point1, ref_point2 = self.angle_gradient_descent(
+                self[ii],
+                self[jj],
+                angles=angles,
+                NullMatrices=NullMatrices,
+                search_state=search_state,
+            )
+
+            self.set_distance(ii, jj, dist)
 
-                    # if dist>0:
-                    self.set_boundary_reference_point(ii, jj, ref_point1)
-                    self.set_boundary_reference_point(jj, ii, ref_point2)
+            # if dist>0:
+            self.set_boundary_reference_point(ii, jj, ref_point1)
+            self.set_boundary_reference_point(jj, ii, ref_point2)
 
-                    if dist <= 0:
-                        # Distance==0, i.e. intersecting & ref_point1==ref_point2
-                        self.intersection_matrix[ii, jj] = ref_point1
+            if dist <= 0:
+                # Distance==0, i.e. intersecting & ref_point1==ref_point2
+                self.intersection_matrix[ii, jj] = ref_point1
 
     def get_boundary_reference_point_simplified(self, obs0, obs1):
         """Accelerated calculation for circles.
@@ -481,9 +698,12 @@ class GradientContainer(ObstacleContainer):
         contact_err=1e-2,
         convergence_err=1e-3,
         max_it=100,
+        search_state=None,
     ):
         """Find closest point of obstacles using gradient descent in direction space.
-        Gradient Descent is performed in the angle space of the obstacle."""
+        Gradient Descent is performed in the angle space of the obstacle.
+
+        The number of iterations is stored in the (optional) search_state."""
 
         dim = obs0.dim
 
@@ -614,6 +834,9 @@ class GradientContainer(ObstacleContainer):
         delta_t = time.time() - t_start_graddescent
         print("Grad descent with dt={}s".format(delta_t))
 
+        if search_state is not None:
+            search_state.n_iterations = it_count
+
         # Do gamma descent if objects are interesecting
         if is_intersecting:
             reference_point = self.gamma_gradient_descent(
@@ -56,6 +56,9 @@ class ObstacleContainer(BaseContainer):
         for obs in self._obstacle_list:
             obs.do_velocity_step(delta_time)
 
+        # Obstacles can also be moved without setting 'has_moved'
+        self.update_spatial_index(only_moved=False)
+
     def reset_clusters(self):
         self.get_sibling_groups()
         # self.get_sibling_groups()
@@ -79,6 +82,7 @@ class ObstacleContainer(BaseContainer):
     def __setitem__(self, key, value):
         # Is this useful?
         self._obstacle_list[key] = value
+        self.reset_spatial_index()
 
         for jj in range(self.number):
             if jj == key:
@@ -0,0 +1,185 @@
+"""
+Spatial index of the obstacles of a container for radius and nearest queries.
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from scipy.spatial import cKDTree
+
+
+def get_position_change_counter() -> int:
+    # Imported at evaluation, since the obstacles-package imports the containers
+    from dynamic_obstacle_avoidance.obstacles import Obstacle
+
+    return Obstacle.position_change_counter
+
+
+class SpatialIndex:
+    """KD-tree over the center positions of the obstacles together with their
+    bounding radii (see `Obstacle.get_bounding_radius`).
+
+    The tree is 'loose': obstacles which have moved (i.e. report `has_moved` or
+    whose center differs from the stored one) only update their center and radius in
+    the arrays. The queries are extended by the maximal displacement since the last
+    build and the tree is only rebuilt once this displacement exceeds the
+    rebuild_slack. A query first updates the moved obstacles if any obstacle has been
+    moved through its position setters since the last update (see
+    `Obstacle.position_change_counter`), hence, it is evaluated with the current
+    center positions without comparing all of them at each query. Obstacles whose
+    position is changed in-place have to be updated with `update`.
+
+    Boundaries and obstacles without bounding radius are unbounded, i.e., they are
+    part of every radius query but not of the nearest-query.
+
+    Attributes
+    ----------
+    centers: (n_obstacles, dimension) array of the current center positions
+    radii: (n_obstacles) array of the bounding radii (inf if unbounded)
+    n_rebuilds: number of (full) builds of the tree
+    """
+
+    def __init__(self, obstacles, rebuild_slack: float = None):
+        self.obstacles = obstacles
+        self._rebuild_slack = rebuild_slack
+        self.n_rebuilds = 0
+        self.rebuild()
+
+    @property
+    def n_obstacles(self) -> int:
+        return self.radii.shape[0]
+
+    def _get_radius(self, obstacle) -> float:
+        if obstacle.is_boundary:
+            return np.inf
+
+        radius = obstacle.get_bounding_radius()
+        if radius is None:
+            return np.inf
+        return radius
+
+    def rebuild(self) -> None:
+        """Recreate all arrays and the tree from the obstacles."""
+        n_obs = len(self.obstacles)
+        if n_obs:
+            self.centers = np.array([obs.center_position for obs in self.obstacles])
+        else:
+            self.centers = np.zeros((0, 0))
+        self.radii = np.array([self._get_radius(obs) for obs in self.obstacles])
+
+        self._position_change_counter = get_position_change_counter()
+        self._tree_centers = np.copy(self.centers)
+        self._max_displacement = 0.0
+
+        self._ind_bounded = np.arange(n_obs)[np.isfinite(self.radii)]
+        self._ind_unbounded = np.arange(n_obs)[np.logical_not(np.isfinite(self.radii))]
+        if self._ind_bounded.shape[0]:
+            self._tree = cKDTree(self._tree_centers[self._ind_bounded, :])
+            self._max_radius = np.max(self.radii[self._ind_bounded])
+        else:
+            self._tree = None
+            self._max_radius = 0.0
+
+        if self._rebuild_slack is None:
+            if self._ind_bounded.shape[0]:
+                self.rebuild_slack = np.mean(self.radii[self._ind_bounded])
+            else:
+                self.rebuild_slack = 0.0
+        else:
+            self.rebuild_slack = self._rebuild_slack
+
+        self.n_rebuilds += 1
+
+    def update(self, only_moved: bool = True) -> None:
+        """Updates the obstacles which have moved (all if only_moved is False);
+        the tree is rebuilt if the obstacles were changed or have moved too far."""
+        if len(self.obstacles) != self.n_obstacles:
+            self.rebuild()
+            return
+
+        self._position_change_counter = get_position_change_counter()
+        if not self.n_obstacles:
+            return
+
+        # The center can be changed without setting 'has_moved'
+        centers = np.array([obs.center_position for obs in self.obstacles])
+        is_moved = np.logical_or(
+            np.any(centers != self.centers, axis=1),
+            [obs.has_moved for obs in self.obstacles],
+        )
+        if not only_moved:
+            is_moved[:] = True
+
+        for ii in np.flatnonzero(is_moved):
+            obs = self.obstacles[ii]
+            radius = self._get_radius(obs)
+            if np.isfinite(radius) != np.isfinite(self.radii[ii]):
+                # Obstacle changed its type (e.g. to a boundary)
+                self.rebuild()
+                return
+
+            self.centers[ii, :] = centers[ii, :]
+            self.radii[ii] = radius
+
+            if np.isfinite(radius):
+                self._max_radius = max(self._max_radius, radius)
+                self._max_displacement = max(
+                    self._max_displacement,
+                    LA.norm(self.centers[ii, :] - self._tree_centers[ii, :]),
+                )
+
+        if self._max_displacement > self.rebuild_slack:
+            self.rebuild()
+
+    def update_if_moved(self) -> None:
+        """Updates the obstacles if any obstacle has been moved (or the obstacles were
+        changed) since the last update."""
+        if (
+            self._position_change_counter != get_position_change_counter()
+            or len(self.obstacles) != self.n_obstacles
+        ):
+            self.update()
+
+    def _get_bounded_candidates(self, position: np.ndarray, radius: float):
+        if self._tree is None:
+            return np.zeros(0, dtype=int)
+
+        ind_tree = self._tree.query_ball_point(
+            position, radius + self._max_radius + self._max_displacement
+        )
+        return self._ind_bounded[np.array(ind_tree, dtype=int)]
+
+    def get_lower_distances(self, position: np.ndarray, indices: np.ndarray):
+        """Lower bound of the distance of position to the obstacles (zero if
+        the position is within the bounding sphere)."""
+        distances = LA.norm(self.centers[indices, :] - position, axis=1)
+        return np.maximum(distances - self.radii[indices], 0)
+
+    def query_radius(self, position: np.ndarray, radius: float) -> np.ndarray:
+        """Returns the (sorted) indices of all obstacles whose bounding sphere is
+        within radius of the position, including the unbounded obstacles."""
+        self.update_if_moved()
+        indices = self._get_bounded_candidates(position, radius)
+        indices = indices[self.get_lower_distances(position, indices) <= radius]
+        return np.sort(np.hstack((indices, self._ind_unbounded)))
+
+    def query_nearest(self, position: np.ndarray, k: int = 1) -> np.ndarray:
+        """Returns the indices of the k (bounded) obstacles with the closest
+        bounding spheres, sorted by increasing distance."""
+        self.update_if_moved()
+        n_bounded = self._ind_bounded.shape[0]
+        k = min(k, n_bounded)
+        if not k:
+            return np.zeros(0, dtype=int)
+
+        # The k closest centers give an upper bound of the k-th closest distance
+        _, ind_tree = self._tree.query(position, k=k)
+        indices = self._ind_bounded[np.atleast_1d(ind_tree)]
+        max_distance = np.max(
+            LA.norm(self.centers[indices, :] - position, axis=1) - self.radii[indices]
+        )
+
+        indices = self._get_bounded_candidates(position, max(max_distance, 0))
+        distances = self.get_lower_distances(position, indices)
+        ind_sorted = np.argsort(distances, kind="stable")[:k]
+        return indices[ind_sorted]
@@ -2,7 +2,7 @@
 The :mod:`obstacles` module implements various types of obstacles.
 """
 # Various Obstacle Descriptions
-from ._base import Obstacle, GammaType
+from ._base import Obstacle, GammaType, LocalGeometry
 from ._base import get_intersection_position
 from .ellipse import Ellipse, Sphere, CircularObstacle
 from .polygon import Polygon
@@ -13,6 +13,7 @@ from .human_ellipse import TrackedPedestrian, HumanEllipse
 from .boundary_cuboid_with_gap import BoundaryCuboidWithGaps
 from .flat_plane import FlatPlane
 from .double_blob_obstacle import DoubleBlob
+from .radius_lookup import AngularRadiusTable, RadiusLookupMixin
 
 # Multidimensional Obstacles
 from .cuboid_xd import CuboidXd
@@ -31,7 +32,10 @@ __all__ = [
     "StarshapedFlower",
     "FlatPlane",
     "DoubleBlob",
+    "AngularRadiusTable",
+    "RadiusLookupMixin",
     "GammaType",
+    "LocalGeometry",
     "CuboidXd",
     "EllipseWithAxes",
     "HyperSphere",
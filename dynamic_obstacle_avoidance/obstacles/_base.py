@@ -1,6 +1,7 @@
 """
 Basic class to represent obstacles
 """
+import copy
 import time
 import warnings
 import sys
@@ -9,7 +10,7 @@ from typing import Optional
 
 from abc import ABC, abstractmethod
 
-# from dataclasses import dataclass
+from dataclasses import dataclass
 from enum import Enum, auto
 
 # from functools import lru_cache
@@ -37,6 +38,7 @@ Vector = np.ndarray
 
 def do_velocity_step(obstacle, delta_time) -> None:
     obstacle.pose.position = delta_time * obstacle.twist.linear + obstacle.pose.position
+    Obstacle.position_change_counter += 1
     obstacle.pose.orientation = (
         delta_time * obstacle.twist.angular + obstacle.pose.orientation
     )
@@ -53,6 +55,26 @@ class GammaType(Enum):
     BARRIER = auto()
 
 
+@dataclass
+class LocalGeometry:
+    """Local geometry of an obstacle at a specific position, i.e., all values
+    needed by the modulation evaluated in one pass.
+
+    Attributes
+    ----------
+    gamma: distance value gamma of float
+    normal: normal direction of the surface
+    reference_direction: (normalized) direction towards the reference point
+    surface_point: point on the surface in direction of the position (seen from the
+        center); None if the obstacle does not provide it.
+    """
+
+    gamma: float
+    normal: np.ndarray
+    reference_direction: np.ndarray
+    surface_point: Optional[np.ndarray] = None
+
+
 class Obstacle(ABC):
     """(Virtual) base class of obstacles
     This class defines obstacles to modulate the DS around it
@@ -67,6 +89,8 @@ class Obstacle(ABC):
 
     id_counter = 0
     active_counter = 0
+    # Changes of the position of any obstacle (e.g. to detect an outdated index)
+    position_change_counter = 0
     # TODO: clean up & cohesion vs inhertiance! (decouble /lighten class)
 
     def old__repr__(self):
@@ -348,6 +372,7 @@ class Obstacle(ABC):
     @position.setter
     def position(self, value):
         self.pose.position = value
+        Obstacle.position_change_counter += 1
 
     @property
     def center_position(self) -> np.ndarray:
@@ -356,6 +381,7 @@ class Obstacle(ABC):
     @center_position.setter
     def center_position(self, value):
         self.pose.position = np.array(value)
+        Obstacle.position_change_counter += 1
 
     @property
     def timestamp(self):
@@ -615,6 +641,147 @@ class Obstacle(ABC):
     def get_gamma(self, position, with_reference_point_expansion=True):
         pass
 
+    def get_local_geometry(
+        self, position: np.ndarray, in_global_frame: bool = False
+    ) -> LocalGeometry:
+        """Returns gamma, normal and reference direction at position together.
+        The base-class evaluates them separately, child-classes can share the
+        intermediate results (e.g. the transformation or the surface point)."""
+        return LocalGeometry(
+            gamma=self.get_gamma(position, in_global_frame=in_global_frame),
+            normal=self.get_normal_direction(position, in_global_frame=in_global_frame),
+            reference_direction=self.get_reference_direction(
+                position, in_global_frame=in_global_frame
+            ),
+        )
+
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Returns gamma of shape (n_points) for positions of shape
+        (dimension, n_points). The base-class evaluates the points one by one,
+        child-classes implement a vectorized evaluation."""
+        gammas = np.zeros(positions.shape[1])
+        for ii in range(positions.shape[1]):
+            gammas[ii] = self.get_gamma(
+                positions[:, ii], in_global_frame=in_global_frame
+            )
+        return gammas
+
+    def get_normal_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Returns the normal directions of shape (dimension, n_points) for positions
+        of shape (dimension, n_points), see `get_gamma_array`."""
+        normals = np.zeros(positions.shape)
+        for ii in range(positions.shape[1]):
+            normals[:, ii] = self.get_normal_direction(
+                positions[:, ii], in_global_frame=in_global_frame
+            )
+        return normals
+
+    def get_reference_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Returns the reference directions of shape (dimension, n_points) for
+        positions of shape (dimension, n_points), see `get_reference_direction`."""
+        if type(self).get_reference_direction is not Obstacle.get_reference_direction:
+            # Child-class defines its own reference direction
+            references = np.zeros(positions.shape)
+            for ii in range(positions.shape[1]):
+                references[:, ii] = self.get_reference_direction(
+                    positions[:, ii], in_global_frame=in_global_frame
+                )
+            return references
+
+        if in_global_frame:
+            reference_point = self.pose.transform_position_from_relative(
+                self.reference_point
+            )
+        else:
+            reference_point = self.reference_point
+
+        references = reference_point[:, np.newaxis] - positions
+        norms_of_ref = LA.norm(references, axis=0)
+
+        ind_nonzero = norms_of_ref > 0
+        references[:, ind_nonzero] = (
+            references[:, ind_nonzero] / norms_of_ref[ind_nonzero]
+        )
+        # Dummy vector at the reference point
+        references[:, ~ind_nonzero] = 1.0 / self.dim
+        return references
+
+    def transform_positions_to_relative(self, positions: np.ndarray) -> np.ndarray:
+        """Transform positions of shape (dimension, n_points) from the global frame
+        to the obstacle frame."""
+        if self.dimension in [2, 3]:
+            return self.transform_global2relative(positions)
+
+        # Rotations in higher dimensions are not defined, only translate
+        return positions - np.reshape(self.center_position, (-1, 1))
+
+    def transform_positions_from_relative(self, positions: np.ndarray) -> np.ndarray:
+        """Transform positions of shape (dimension, n_points) from the obstacle frame
+        to the global frame."""
+        if self.dimension in [2, 3]:
+            return self.transform_relative2global(positions)
+
+        return positions + np.reshape(self.center_position, (-1, 1))
+
+    def transform_directions_from_relative(self, directions: np.ndarray) -> np.ndarray:
+        """Transform directions of shape (dimension, n_points) from the obstacle frame
+        to the global frame."""
+        if self.dimension in [2, 3]:
+            return self.transform_relative2global_dir(directions)
+
+        return directions
+
+    def _transform_position_to_relative(self, position: np.ndarray) -> np.ndarray:
+        """Transforms a single position with the pose or an array of shape
+        (dimension, n_points) with `transform_positions_to_relative`."""
+        if np.ndim(position) > 1:
+            return self.transform_positions_to_relative(position)
+        return self.pose.transform_position_to_relative(position)
+
+    def _transform_position_from_relative(self, position: np.ndarray) -> np.ndarray:
+        if np.ndim(position) > 1:
+            return self.transform_positions_from_relative(position)
+        return self.pose.transform_position_from_relative(position)
+
+    def _transform_direction_from_relative(self, direction: np.ndarray) -> np.ndarray:
+        if np.ndim(direction) > 1:
+            return self.transform_directions_from_relative(direction)
+        return self.pose.transform_direction_from_relative(direction)
+
+    def get_bounding_radius(self) -> Optional[float]:
+        """Returns the radius of a sphere around the center position, which contains
+        the obstacle (including margin and reference point).
+        None is returned if no (conservative) bound is known."""
+        return None
+
+    def get_support_point(
+        self, direction: np.ndarray, in_global_frame: bool = False
+    ) -> Optional[np.ndarray]:
+        """Returns the point of the (margin-extended) obstacle which lies furthest in
+        the given direction, i.e., the support mapping of a convex obstacle.
+        None is returned for boundaries and obstacles without support mapping."""
+        if self.is_boundary:
+            return None
+
+        if in_global_frame:
+            direction = self.pose.transform_direction_to_relative(direction)
+
+        support_point = self._get_local_support_point(direction)
+        if in_global_frame and support_point is not None:
+            support_point = self.pose.transform_position_from_relative(support_point)
+        return support_point
+
+    def _get_local_support_point(self, direction: np.ndarray) -> Optional[np.ndarray]:
+        """Support mapping in the obstacle frame; None if the obstacle is not convex
+        (or the mapping is not known)."""
+        return None
+
     def get_baundary_normal_direction(self, *args, **kwargs):
         return (-1) * self.get_normal_direction(*args, **kwargs)
 
@@ -780,15 +947,52 @@ class Obstacle(ABC):
         raise NotImplementedError("Implement for fully functional child class.")
 
     def do_velocity_step(self, delta_time: float) -> None:
-        if self.linear_velocity is not None:
+        if self.linear_velocity is not None and np.any(self.linear_velocity):
             self.position = self.position + self.linear_velocity * delta_time
+            self.has_moved = True
 
         if self.angular_velocity:
             if self.dimension == 2:
                 self.orientation = self.orientation + self.angular_velocity * delta_time
+                self.has_moved = True
             else:
                 raise NotImplementedError("Angular velocity step not defined for d>2")
 
+    def get_pose_at_time(self, delta_time: float) -> Pose:
+        """Returns the (predicted) pose after delta_time, assuming a constant twist.
+        The obstacle itself is not changed; child-classes can override this, e.g.,
+        with a precomputed trajectory."""
+        position = self.pose.position
+        if self.linear_velocity is not None:
+            position = position + self.linear_velocity * delta_time
+
+        orientation = self.pose.orientation
+        angular_velocity = self.angular_velocity
+        if angular_velocity is not None and np.any(angular_velocity):
+            if self.dimension == 2:
+                orientation = self.orientation + angular_velocity * delta_time
+            elif self.dimension == 3:
+                # Angular velocity in the global frame
+                orientation = (
+                    Rotation.from_rotvec(np.array(angular_velocity) * delta_time)
+                    * self.orientation
+                )
+            else:
+                raise NotImplementedError("Angular velocity step not defined for d>3")
+
+        return Pose(position=position, orientation=orientation)
+
+    def get_obstacle_at_time(self, delta_time: float) -> "Obstacle":
+        """Returns a (shallow) copy of the obstacle with the pose after delta_time,
+        e.g., to evaluate the intermediate stages of an integration step without
+        moving the obstacle."""
+        obstacle = copy.copy(self)
+        obstacle.pose = self.get_pose_at_time(delta_time)
+
+        # The copy is deleted as any other obstacle
+        Obstacle.active_counter += 1
+        return obstacle
+
     def move_obstacle_to_referencePoint(self, position, in_global_frame=True):
         if not in_global_frame:
             position = self.transform_relative2global(position)
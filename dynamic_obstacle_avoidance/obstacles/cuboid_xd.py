@@ -60,6 +60,22 @@ class CuboidXd(obstacles.Obstacle):
         For an ellipse obstacle,the longest axes."""
         return np.prod(self.semiaxes + self.margin_absolut) ** (1 / self.dimension)
 
+    def get_bounding_radius(self) -> float:
+        return max(
+            LA.norm(self.semiaxes) + self.margin_absolut,
+            LA.norm(self.reference_point),
+        )
+
+    def _get_local_support_point(self, direction: np.ndarray) -> np.ndarray:
+        """Corner of the cuboid in direction, extended by the (rounded) margin."""
+        support_point = np.copysign(self.semiaxes, direction)
+        norm_direction = LA.norm(direction)
+        if norm_direction:
+            support_point = support_point + direction * (
+                self.margin_absolut / norm_direction
+            )
+        return support_point
+
     def set_reference_point(
         self,
         position: np.ndarray,
@@ -127,17 +143,40 @@ class CuboidXd(obstacles.Obstacle):
     def get_normal_direction(
         self, position, in_obstacle_frame: bool = True, in_global_frame: bool = None
     ):
+        """The position can be a single point or of shape (dimension, n_points)."""
         if in_global_frame is not None:
             # Legacy value
             in_obstacle_frame = not (in_global_frame)
 
         if not in_obstacle_frame:
             # Do everything in local frame
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
+
+        if np.ndim(position) > 1:
+            normal = self._get_local_normal_directions(
+                position, gammas=self.get_gamma(position, in_global_frame=False)
+            )
+        else:
+            normal = self._get_local_normal_direction(
+                position, gamma=self.get_gamma(position, in_global_frame=False)
+            )
+
+        if not in_obstacle_frame:
+            normal = self._transform_direction_from_relative(normal)
+
+        if self.is_boundary:
+            return (-1) * normal
+
+        return normal
 
+    def _get_local_normal_direction(
+        self, position: np.ndarray, gamma: float
+    ) -> np.ndarray:
+        """Normal in the obstacle frame (not inverted for boundaries), the gamma of
+        the position is passed to detect the surface case."""
         ind_relevant = np.abs(position) > self.semiaxes
 
-        if np.isclose(self.get_gamma(position, in_global_frame=False), 1.0):
+        if np.isclose(gamma, 1.0):
             ind_close = np.isclose(np.abs(position), self.axes_with_margin * 0.5)
             if not np.any(ind_close):
                 normal = 1 / (np.abs(position) - self.axes_with_margin * 0.5)
@@ -146,17 +185,16 @@ class CuboidXd(obstacles.Obstacle):
             else:
                 normal = np.copysign((ind_close / LA.norm(ind_close)), position)
 
-            if self.is_boundary:
-                normal = (-1) * normal
-
-            if in_obstacle_frame:
-                return normal
-            else:
-                return self.pose.transform_direction_from_relative(normal)
+            return normal
 
         if not any(ind_relevant):
             # Mirror at the boundary (Take the inverse)
             minimum_factor = max(np.abs(position) / self.semiaxes)
+            if not minimum_factor:
+                # At the center - return the first axis (as the array version)
+                normal = np.zeros(position.shape)
+                normal[0] = 1.0
+                return normal
 
             # gamma = self.get_gamma(
             # position, in_obstacle_frame=True, is_boundary=False, margin_absolut=0)
@@ -177,26 +215,77 @@ class CuboidXd(obstacles.Obstacle):
             # No normalization chack needed, since at least one axes was relevatn
             normal = normal / normal_norm
 
-        if not in_obstacle_frame:
-            normal = self.pose.transform_direction_from_relative(normal)
+        return normal
+
+    def _get_local_normal_directions(
+        self, positions: np.ndarray, gammas: np.ndarray
+    ) -> np.ndarray:
+        """Array version of `_get_local_normal_direction` for positions of shape
+        (dimension, n_points); the branches are evaluated as masks."""
+        semiaxes = self.semiaxes.reshape(-1, 1)
+        semiaxes_with_margin = 0.5 * self.axes_with_margin.reshape(-1, 1)
+        abs_positions = np.abs(positions)
+
+        # Inside the (margin-less) cuboid -> mirror at the boundary
+        ind_mirror = np.logical_not(np.any(abs_positions > semiaxes, axis=0))
+        mirrored_positions = np.copy(positions)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            minimum_factors = np.max(abs_positions[:, ind_mirror] / semiaxes, axis=0)
+            mirrored_positions[:, ind_mirror] = (
+                positions[:, ind_mirror] / minimum_factors**2
+            )
 
-        if np.any(np.isnan(normal)):
-            breakpoint()
+        ind_relevant = np.abs(mirrored_positions) > semiaxes
+        normals = np.where(
+            ind_relevant,
+            mirrored_positions - np.copysign(semiaxes, mirrored_positions),
+            0.0,
+        )
+        normals = self._normalize_or_first_axis(normals)
+
+        # Positions on the surface (of the margin)
+        ind_surface = np.isclose(gammas, 1.0)
+        if np.any(ind_surface):
+            surface_positions = abs_positions[:, ind_surface]
+            ind_close = np.isclose(surface_positions, semiaxes_with_margin)
+            has_close = np.any(ind_close, axis=0)
+
+            with np.errstate(divide="ignore"):
+                surface_normals = np.where(
+                    has_close,
+                    ind_close,
+                    1 / (surface_positions - semiaxes_with_margin),
+                )
+            surface_normals = surface_normals / LA.norm(surface_normals, axis=0)
+            normals[:, ind_surface] = np.copysign(
+                surface_normals, positions[:, ind_surface]
+            )
 
-        if self.is_boundary:
-            return (-1) * normal
+        return normals
 
-        return normal
+    @staticmethod
+    def _normalize_or_first_axis(directions: np.ndarray) -> np.ndarray:
+        """Normalizes the columns, zero columns are set to the first axis."""
+        norms = LA.norm(directions, axis=0)
+        ind_zero = norms == 0
+        directions[:, ind_zero] = 0
+        directions[0, ind_zero] = 1.0
+        norms[ind_zero] = 1.0
+        return directions / norms
 
     def get_distance_to_surface(
         self, position, in_obstacle_frame: bool = True, margin_absolut: float = None
     ):
+        """The position can be a single point or of shape (dimension, n_points)."""
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         if margin_absolut is None:
             margin_absolut = self.margin_absolut
 
+        if np.ndim(position) > 1:
+            return self._get_distance_to_surface_array(position, margin_absolut)
+
         relative_position = np.abs(position) - self.semiaxes
 
         if any(relative_position > 0):
@@ -230,20 +319,49 @@ class CuboidXd(obstacles.Obstacle):
         is_boundary=None,
         boundary_power_factor: int | float = 1,
     ) -> float:
+        """The position can be a single point or of shape (dimension, n_points)."""
+        if in_global_frame is not None:
+            in_obstacle_frame = not (in_global_frame)
+
+        if np.ndim(position) > 1:
+            return self._get_gamma_of_array(
+                position,
+                in_obstacle_frame=in_obstacle_frame,
+                margin_absolut=margin_absolut,
+                is_boundary=is_boundary,
+                boundary_power_factor=boundary_power_factor,
+            )
+
         if np.linalg.norm(position) > 1e100:
             # If it's too far away -> just zero to avoid numerical errors
             warnings.warn("Far away position set to zero.")
             return 1e100
 
-        if in_global_frame is not None:
-            in_obstacle_frame = not (in_global_frame)
+        if not in_obstacle_frame:
+            # The center distance needs the position in the obstacle frame, too
+            position = self.pose.transform_position_to_relative(position)
 
         distance_surface = self.get_distance_to_surface(
             position=position,
-            in_obstacle_frame=in_obstacle_frame,
+            in_obstacle_frame=True,
             margin_absolut=margin_absolut,
         )
 
+        return self._get_gamma_from_distance(
+            position,
+            distance_surface,
+            is_boundary=is_boundary,
+            boundary_power_factor=boundary_power_factor,
+        )
+
+    def _get_gamma_from_distance(
+        self,
+        position: np.ndarray,
+        distance_surface: float,
+        is_boundary=None,
+        boundary_power_factor: int | float = 1,
+    ) -> float:
+        """Gamma of a position (in the obstacle frame) with its surface distance."""
         # Apply distance scaling beforehand
         distance_surface = distance_surface * self.distance_scaling
 
@@ -262,6 +380,126 @@ class CuboidXd(obstacles.Obstacle):
 
         return gamma
 
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_gamma` for positions of shape (dimension, n_points)."""
+        return self.get_gamma(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
+    def get_normal_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_normal_direction` for positions of shape
+        (dimension, n_points)."""
+        return self.get_normal_direction(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
+    def _get_gamma_of_array(
+        self,
+        positions: np.ndarray,
+        in_obstacle_frame: bool = True,
+        margin_absolut: Optional[float] = None,
+        is_boundary=None,
+        boundary_power_factor: int | float = 1,
+    ) -> np.ndarray:
+        """Array version of `get_gamma` for positions of shape (dimension, n_points)."""
+        # If it's too far away -> just zero to avoid numerical errors
+        ind_far = LA.norm(positions, axis=0) > 1e100
+        if np.any(ind_far):
+            warnings.warn("Far away position set to zero.")
+
+        if not in_obstacle_frame:
+            positions = self.transform_positions_to_relative(positions)
+
+        if margin_absolut is None:
+            margin_absolut = self.margin_absolut
+
+        distances = self._get_distance_to_surface_array(positions, margin_absolut)
+        distances = distances * self.distance_scaling
+
+        gammas = distances + 1
+        ind_inside = distances < 0
+        center_distances = LA.norm(positions[:, ind_inside], axis=0)
+        gammas[ind_inside] = (
+            center_distances / (center_distances - distances[ind_inside])
+        ) ** boundary_power_factor
+
+        if is_boundary or self.is_boundary:
+            with np.errstate(divide="ignore"):
+                gammas = 1 / gammas
+
+        gammas[ind_far] = 1e100
+        return gammas
+
+    def _get_distance_to_surface_array(
+        self, positions: np.ndarray, margin_absolut: float
+    ) -> np.ndarray:
+        """Vectorized `get_distance_to_surface` for positions of shape
+        (dimension, n_points) in the obstacle frame."""
+        relative_positions = np.abs(positions) - self.semiaxes.reshape(-1, 1)
+
+        # Corner case is treated separately
+        ind_outside = np.any(relative_positions > 0, axis=0)
+        corner_distances = LA.norm(np.maximum(relative_positions, 0), axis=0)
+        ind_far = np.logical_and(ind_outside, corner_distances > margin_absolut)
+
+        distances = np.where(
+            ind_outside,
+            margin_absolut - corner_distances,
+            margin_absolut + (-1) * np.max(relative_positions, axis=0),
+        )
+
+        # Case: within margin but outside boundary -> edges have to be rounded
+        pos_norm = LA.norm(positions, axis=0)
+        distances_inside = (-1) * distances / (pos_norm + distances)
+
+        return np.where(ind_far, (-1) * distances, distances_inside)
+
+    def get_local_geometry(
+        self, position: np.ndarray, in_global_frame: bool = False
+    ) -> obstacles.LocalGeometry:
+        """Returns gamma, normal, reference direction and surface point with a
+        single transformation and a single surface-distance evaluation."""
+        if in_global_frame:
+            position = self.pose.transform_position_to_relative(position)
+
+        if np.linalg.norm(position) > 1e100:
+            # Keep the far-away treatment of the gamma
+            gamma = self.get_gamma(position, in_global_frame=False)
+        else:
+            distance_surface = self.get_distance_to_surface(
+                position=position, in_obstacle_frame=True
+            )
+            gamma = self._get_gamma_from_distance(position, distance_surface)
+
+        normal = self._get_local_normal_direction(position, gamma=gamma)
+        if self.is_boundary:
+            normal = (-1) * normal
+
+        reference_direction = self.get_reference_direction(
+            position, in_global_frame=False
+        )
+        surface_point = self.get_point_on_surface(position, in_obstacle_frame=True)
+
+        if in_global_frame:
+            normal = self.pose.transform_direction_from_relative(normal)
+            reference_direction = self.pose.transform_direction_from_relative(
+                reference_direction
+            )
+            surface_point = self.pose.transform_position_from_relative(surface_point)
+
+        return obstacles.LocalGeometry(
+            gamma=gamma,
+            normal=normal,
+            reference_direction=reference_direction,
+            surface_point=surface_point,
+        )
+
     def get_point_on_surface(
         self,
         position: np.ndarray,
@@ -274,13 +512,19 @@ class CuboidXd(obstacles.Obstacle):
             in_obstacle_frame = not (in_global_frame)
 
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         if margin_absolut is None:
             semiaxes = self.semiaxes_with_magin
         else:
             semiaxes = self.semiaxes + margin_absolut
 
+        if np.ndim(position) > 1:
+            surface_points = self._get_points_on_surface(position, semiaxes)
+            if not in_obstacle_frame:
+                return self.transform_positions_from_relative(surface_points)
+            return surface_points
+
         if not LA.norm(position):
             # At the center
             surface_point = np.zeros(self.dimension)
@@ -292,11 +536,31 @@ class CuboidXd(obstacles.Obstacle):
         cube_position = position / semiaxes
         ind_max = np.argmax(np.abs(cube_position))
 
-        surface_point = position * semiaxes[ind_max] / position[ind_max]
+        surface_point = position * semiaxes[ind_max] / np.abs(position[ind_max])
         if not in_obstacle_frame:
             return self.pose.transform_position_from_relative(surface_point)
         return surface_point
 
+    @staticmethod
+    def _get_points_on_surface(
+        positions: np.ndarray, semiaxes: np.ndarray
+    ) -> np.ndarray:
+        """Surface points of positions of shape (dimension, n_points) in the
+        obstacle frame."""
+        surface_points = np.zeros(positions.shape)
+        ind_center = LA.norm(positions, axis=0) == 0
+        surface_points[0, ind_center] = semiaxes[0]
+
+        ind_nonzero = np.logical_not(ind_center)
+        positions = positions[:, ind_nonzero]
+        ind_max = np.argmax(np.abs(positions / semiaxes.reshape(-1, 1)), axis=0)
+        surface_points[:, ind_nonzero] = (
+            positions
+            * semiaxes[ind_max]
+            / np.abs(positions[ind_max, np.arange(positions.shape[1])])
+        )
+        return surface_points
+
     def get_local_radius(
         self,
         position: np.ndarray,
@@ -309,7 +573,7 @@ class CuboidXd(obstacles.Obstacle):
 
         if not in_relative_frame:
             in_relative_frame = True
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         surface_point = self.get_point_on_surface(
             position=position,
@@ -318,6 +582,8 @@ class CuboidXd(obstacles.Obstacle):
         )
         # if np.isnan(LA.norm(surface_point)):
         #     breakpoint()
+        if np.ndim(surface_point) > 1:
+            return LA.norm(surface_point, axis=0)
         return LA.norm(surface_point)
 
     def get_intersection_with_surface(
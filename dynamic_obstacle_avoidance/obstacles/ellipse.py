@@ -20,7 +20,7 @@ from vartools.angle_math import angle_modulo, angle_difference_directional_2pi
 from vartools.directional_space import get_directional_weighted_sum
 
 from dynamic_obstacle_avoidance.utils import *
-from dynamic_obstacle_avoidance.obstacles import Obstacle
+from dynamic_obstacle_avoidance.obstacles import Obstacle, LocalGeometry
 
 
 class Ellipse(Obstacle):
@@ -162,6 +162,22 @@ class Ellipse(Obstacle):
         """Minimal distance or maximal radius."""
         return np.sqrt(np.sum(self.axes_length * 2))
 
+    def get_bounding_radius(self):
+        """The ellipse is contained in the box of the axes (for any curvature)."""
+        return max(LA.norm(self.axes_with_margin), LA.norm(self.reference_point))
+
+    def _get_local_support_point(self, direction):
+        """The surface (see `get_local_radius_point`) is the ellipse with the
+        axes_with_margin as semi-axes; None for curvature other than one."""
+        if np.any(np.asarray(self.curvature) != 1):
+            return None
+
+        axes_direction = self.axes_with_margin * direction
+        norm_direction = LA.norm(axes_direction)
+        if not norm_direction:
+            return np.zeros(self.dim)
+        return self.axes_with_margin * axes_direction / norm_direction
+
     def get_characteristic_length(self):
         """Get a characeteric (or maximal) length of the obstacle.
         For an ellipse obstacle,the longest axes."""
@@ -426,6 +442,65 @@ class Ellipse(Obstacle):
 
         return normal_vector
 
+    def get_local_geometry(self, position, in_global_frame=False):
+        """Returns gamma, normal and reference direction with a single
+        transformation to the obstacle frame. Gamma, the ellipse normal and the
+        surface point share the position scaled by the axes."""
+        if self.has_relative_gamma or self.hull_with_respect_to_reference:
+            # Relative gamma is evaluated in the frame of the input
+            return super().get_local_geometry(position, in_global_frame=in_global_frame)
+
+        if in_global_frame:
+            position = self.transform_global2relative(position)
+
+        # Gamma and normal of the (super-) ellipse, see `get_gamma` and
+        # `get_normal_ellipse`
+        scaled_position = position / self.axes_with_margin
+        gamma = np.sum(np.abs(scaled_position) ** (2 * self.curvature)) ** (
+            1.0 / (2 * np.mean(self.curvature))
+        )
+
+        surface_point = None
+        if gamma and np.all(self.curvature == np.mean(self.curvature)):
+            # Gamma scales linearly along the rays from the center
+            surface_point = position / gamma
+
+        if self.reference_point_is_inside or self.position_is_in_direction_of_ellipse(
+            position
+        ):
+            normal = (
+                2
+                * self.curvature
+                / self.axes_with_margin
+                * scaled_position ** (2 * self.curvature - 1)
+            )
+            if mag_norm := LA.norm(normal):
+                normal = normal / mag_norm
+        else:
+            normal = self.get_normal_direction(position, in_global_frame=False)
+
+        if self.is_boundary:
+            gamma = 1.0 / gamma
+
+        reference_direction = self.get_reference_direction(
+            position, in_global_frame=False
+        )
+
+        if in_global_frame:
+            normal = self.transform_relative2global_dir(normal)
+            reference_direction = self.transform_relative2global_dir(
+                reference_direction
+            )
+            if surface_point is not None:
+                surface_point = self.transform_relative2global(surface_point)
+
+        return LocalGeometry(
+            gamma=gamma,
+            normal=normal,
+            reference_direction=reference_direction,
+            surface_point=surface_point,
+        )
+
     def get_gamma_ellipse(
         self, position, in_global_frame=False, axes=None, curvature=None
     ):
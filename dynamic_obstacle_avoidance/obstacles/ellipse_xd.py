@@ -105,6 +105,26 @@ class EllipseWithAxes(obstacles.Obstacle):
         For an ellipse obstacle,the longest axes."""
         return np.prod(self.semiaxes + self.margin_absolut) ** (1 / self.dimension)
 
+    def get_bounding_radius(self) -> float:
+        """The ellipse is contained in the box of the semiaxes (for any curvature)."""
+        return max(
+            LA.norm(self.semiaxes) + self.margin_absolut,
+            LA.norm(self.reference_point),
+        )
+
+    def _get_local_support_point(self, direction: np.ndarray) -> Optional[np.ndarray]:
+        """Support mapping of the (margin-extended) ellipse; None for curvature other
+        than one."""
+        if self.curvature != 1:
+            return None
+
+        semiaxes = self.semiaxes_with_magin
+        axes_direction = semiaxes * direction
+        norm_direction = LA.norm(axes_direction)
+        if not norm_direction:
+            return np.zeros(self.dimension)
+        return semiaxes * axes_direction / norm_direction
+
     def get_shapely(self, semiaxes: np.ndarray = None):
         if semiaxes is None:
             semiaxes = self.semiaxes
@@ -145,12 +165,13 @@ class EllipseWithAxes(obstacles.Obstacle):
         in_global_frame: Optional[bool] = None,
         margin_absolut: Optional[float] = None,
     ):
-        """Gets a gamma which is not directly related to the axes length."""
+        """Gets a gamma which is not directly related to the axes length.
+        The position can be a single point or of shape (dimension, n_points)."""
         if in_global_frame is not None:
             in_obstacle_frame = not (in_global_frame)
 
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         if margin_absolut is None:
             margin_absolut = self.margin_absolut
@@ -161,6 +182,17 @@ class EllipseWithAxes(obstacles.Obstacle):
             margin_absolut=margin_absolut,
         )
 
+        # if np.any(np.isnan(gamma)):
+        #     breakpoint()
+        return self._get_gamma_from_surface_point(position, surface_point)
+
+    def _get_gamma_from_surface_point(
+        self, position: np.ndarray, surface_point: np.ndarray
+    ) -> float:
+        """Gamma of a position with its surface point (both in the obstacle frame)."""
+        if np.ndim(position) > 1:
+            return self._get_gamma_from_surface_points(position, surface_point)
+
         distance_surface = LA.norm(surface_point) * self.distance_scaling
         distance_position = LA.norm(position) * self.distance_scaling
 
@@ -173,10 +205,47 @@ class EllipseWithAxes(obstacles.Obstacle):
         if self.is_boundary:
             gamma = 1 / gamma
 
-        # if np.any(np.isnan(gamma)):
-        #     breakpoint()
         return gamma
 
+    def _get_gamma_from_surface_points(
+        self, positions: np.ndarray, surface_points: np.ndarray
+    ) -> np.ndarray:
+        """Array version of `_get_gamma_from_surface_point` for (dimension, n_points)."""
+        distance_surface = LA.norm(surface_points, axis=0) * self.distance_scaling
+        distance_position = LA.norm(positions, axis=0) * self.distance_scaling
+
+        distances = distance_position / distance_surface - 1
+        ind_outside = distance_position > distance_surface
+        distances[ind_outside] = LA.norm(
+            positions[:, ind_outside] - surface_points[:, ind_outside], axis=0
+        )
+
+        gammas = distances * self.distance_scaling + 1
+        if self.is_boundary:
+            with np.errstate(divide="ignore"):
+                gammas = 1 / gammas
+
+        return gammas
+
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_gamma` for positions of shape (dimension, n_points)."""
+        return self.get_gamma(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
+    def get_normal_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_normal_direction` for positions of shape
+        (dimension, n_points)."""
+        return self.get_normal_direction(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
     def get_local_radius(
         self,
         position: np.ndarray,
@@ -189,7 +258,7 @@ class EllipseWithAxes(obstacles.Obstacle):
 
         if not in_relative_frame:
             in_relative_frame = True
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         surface_point = self.get_point_on_surface(
             position=position,
@@ -197,6 +266,8 @@ class EllipseWithAxes(obstacles.Obstacle):
             margin_absolut=margin_absolut,
         )
 
+        if np.ndim(surface_point) > 1:
+            return LA.norm(surface_point, axis=0)
         return LA.norm(surface_point)
 
     def get_normal_direction(
@@ -210,15 +281,40 @@ class EllipseWithAxes(obstacles.Obstacle):
             in_obstacle_frame = not (in_global_frame)
 
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
+
+        normal = self._get_local_normal_direction(position)
+
+        if not in_obstacle_frame:
+            normal = self._transform_direction_from_relative(normal)
+
+        if self.is_boundary:
+            normal = (-1) * normal
+
+        return normal
+
+    def _get_local_normal_direction(self, position: np.ndarray) -> np.ndarray:
+        """Normalized normal in the obstacle frame (not inverted for boundaries)."""
+        if np.ndim(position) > 1:
+            axes_with_margin = self.axes_with_margin.reshape(-1, 1)
+        else:
+            axes_with_margin = self.axes_with_margin
 
         normal = (
             2
             * self.curvature
-            / self.axes_with_margin
-            * (position / self.axes_with_margin) ** (2 * self.curvature - 1)
+            / axes_with_margin
+            * (position / axes_with_margin) ** (2 * self.curvature - 1)
         )
 
+        if np.ndim(position) > 1:
+            normal_norm = LA.norm(normal, axis=0)
+            ind_nonzero = normal_norm > 0
+            normal[:, ind_nonzero] = normal[:, ind_nonzero] / normal_norm[ind_nonzero]
+            normal[:, np.logical_not(ind_nonzero)] = 0
+            normal[0, np.logical_not(ind_nonzero)] = 1
+            return normal
+
         # Normalize
         normal_norm = LA.norm(normal)
         if normal_norm:
@@ -226,13 +322,44 @@ class EllipseWithAxes(obstacles.Obstacle):
         else:
             normal[0] = 1
 
-        if not in_obstacle_frame:
-            normal = self.pose.transform_direction_from_relative(normal)
+        return normal
 
+    def get_local_geometry(
+        self, position: np.ndarray, in_global_frame: bool = False
+    ) -> obstacles.LocalGeometry:
+        """Returns gamma, normal, reference direction and surface point (the one
+        used for the gamma evaluation) with a single transformation."""
+        if in_global_frame:
+            position = self.pose.transform_position_to_relative(position)
+
+        surface_point = self.get_point_on_surface(
+            position=position,
+            in_obstacle_frame=True,
+            margin_absolut=self.margin_absolut,
+        )
+        gamma = self._get_gamma_from_surface_point(position, surface_point)
+
+        normal = self._get_local_normal_direction(position)
         if self.is_boundary:
             normal = (-1) * normal
 
-        return normal
+        reference_direction = self.get_reference_direction(
+            position, in_global_frame=False
+        )
+
+        if in_global_frame:
+            normal = self.pose.transform_direction_from_relative(normal)
+            reference_direction = self.pose.transform_direction_from_relative(
+                reference_direction
+            )
+            surface_point = self.pose.transform_position_from_relative(surface_point)
+
+        return obstacles.LocalGeometry(
+            gamma=gamma,
+            normal=normal,
+            reference_direction=reference_direction,
+            surface_point=surface_point,
+        )
 
     def get_surface_intersection_with_line(
         self, point0: np.ndarray, point1: np.ndarray, in_global_frame: bool = False
@@ -260,38 +387,59 @@ class EllipseWithAxes(obstacles.Obstacle):
         margin_absolut: float = None,
         in_global_frame: float = None,
     ):
-        """Returns the point on the surface from the center with respect to position."""
+        """Returns the point on the surface from the center with respect to position.
+        The position can be a single point or of shape (dimension, n_points)."""
         if in_global_frame is not None:
             # Legacy value
             in_obstacle_frame = not (in_global_frame)
 
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
-        # Position in the circle-world
         if margin_absolut is None:
-            circle_position = position / self.semiaxes_with_magin
+            semiaxes = self.semiaxes_with_magin
         else:
-            circle_position = position / (self.semiaxes + margin_absolut)
+            semiaxes = self.semiaxes + margin_absolut
 
-        pos_norm = LA.norm(circle_position)
-        if not pos_norm:
-            surface_point = np.zeros(position.shape)
-            if margin_absolut is None:
-                surface_point[0] = self.semiaxes_with_magin[0]
-            else:
-                surface_point[0] = self.semiaxes[0] + margin_absolut
+        if np.ndim(position) > 1:
+            surface_point = self._get_points_on_surface(position, semiaxes)
 
         else:
-            surface_point = position / pos_norm
+            # Position in the circle-world
+            circle_position = position / semiaxes
+
+            pos_norm = LA.norm(circle_position)
+            if not pos_norm:
+                surface_point = np.zeros(position.shape)
+                surface_point[0] = semiaxes[0]
+
+            else:
+                surface_point = position / pos_norm
 
         # surface_point = surface_point * self.semiaxes
 
         if not in_obstacle_frame:
-            surface_point = self.pose.transform_position_from_relative(surface_point)
+            surface_point = self._transform_position_from_relative(surface_point)
 
         return surface_point
 
+    @staticmethod
+    def _get_points_on_surface(
+        positions: np.ndarray, semiaxes: np.ndarray
+    ) -> np.ndarray:
+        """Surface points of positions of shape (dimension, n_points) in the
+        obstacle frame."""
+        circle_norm = LA.norm(positions / semiaxes.reshape(-1, 1), axis=0)
+
+        surface_points = np.zeros(positions.shape)
+        ind_center = circle_norm == 0
+        ind_nonzero = np.logical_not(ind_center)
+        surface_points[:, ind_nonzero] = (
+            positions[:, ind_nonzero] / circle_norm[ind_nonzero]
+        )
+        surface_points[0, ind_center] = semiaxes[0]
+        return surface_points
+
     def get_intersection_with_surface(
         self,
         start_position: np.ndarray,
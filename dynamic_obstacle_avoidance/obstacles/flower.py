@@ -250,7 +250,10 @@ class StarshapedFlower(Obstacle):
             in_global_frame = not (in_obstacle_frame)
 
         if in_global_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
+
+        if np.ndim(position) > 1:
+            return self._get_gamma_of_array(position)
 
         if not (mag_position := np.linalg.norm(position)):
             if self.is_boundary:
@@ -279,9 +282,46 @@ class StarshapedFlower(Obstacle):
 
         return gamma
 
+    def _get_gamma_of_array(self, positions: np.ndarray) -> np.ndarray:
+        """Array version of `get_gamma` for positions (2, n_points) in the local frame."""
+        mag_positions = np.linalg.norm(positions, axis=0)
+        radii = self.get_radius_of_angle(np.arctan2(positions[1, :], positions[0, :]))
+
+        ind_center = mag_positions == 0
+        if self.is_boundary:
+            with np.errstate(divide="ignore"):
+                gammas = (radii / mag_positions) ** self.distance_scaling
+            gammas[ind_center] = sys.float_info.max
+            return gammas
+
+        ind_inside = mag_positions < radii
+        gammas = (mag_positions - radii) * self.distance_scaling + 1
+        gammas[ind_inside] = (
+            mag_positions[ind_inside] / radii[ind_inside]
+        ) ** self.distance_scaling
+        return gammas
+
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_gamma` for positions of shape (2, n_points)."""
+        return self.get_gamma(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
     def get_normal_direction(self, position, in_global_frame=False):
         if in_global_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
+
+        if np.ndim(position) > 1:
+            normals = self._get_normal_direction_of_array(position)
+            if in_global_frame:
+                normals = self._transform_direction_from_relative(normals)
+
+            # Just return one direction at the center
+            normals[:, np.linalg.norm(position, axis=0) == 0] = 1.0 / self.dim
+            return normals
 
         mag_position = np.linalg.norm(position)
         if not mag_position:
@@ -308,3 +348,29 @@ class StarshapedFlower(Obstacle):
             normal_vector = self.pose.transform_direction_from_relative(normal_vector)
 
         return normal_vector
+
+    def _get_normal_direction_of_array(self, positions: np.ndarray) -> np.ndarray:
+        """Array version of `get_normal_direction` for (nonzero) positions
+        (2, n_points) in the local frame."""
+        directions = np.arctan2(positions[1, :], positions[0, :])
+        derivatives_radius = self.get_radiusDerivative_of_angle(directions)
+        radii = self.get_radius_of_angle(directions)
+
+        cos_directions = np.cos(directions)
+        sin_directions = np.sin(directions)
+        normals = np.vstack(
+            (
+                derivatives_radius * sin_directions + radii * cos_directions,
+                -derivatives_radius * cos_directions + radii * sin_directions,
+            )
+        )
+        return normals / LA.norm(normals, axis=0)
+
+    def get_normal_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_normal_direction` for positions of shape (2, n_points)."""
+        return self.get_normal_direction(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
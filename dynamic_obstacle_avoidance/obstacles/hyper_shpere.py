@@ -18,24 +18,58 @@ class HyperSphere(obstacles.Obstacle):
 
         self.radius = radius
 
-    def get_gamma(self, position: np.ndarray, in_obstacle_frame: bool = True):
+    def get_gamma(
+        self,
+        position: np.ndarray,
+        in_obstacle_frame: bool = True,
+        in_global_frame: Optional[bool] = None,
+    ):
         """Gets a gamma which is not directly related to the axes length."""
-        distance = self.get_point_on_surface(
-            position=position, in_obstacle_frame=in_obstacle_frame
+        if in_global_frame is not None:
+            in_obstacle_frame = not (in_global_frame)
+
+        if not in_obstacle_frame:
+            position = self._transform_position_to_relative(position)
+
+        surface_point = self.get_point_on_surface(
+            position=position, in_obstacle_frame=True
         )
 
-        gamma = distance + 1
+        distance_surface = LA.norm(surface_point)
+        distance_position = LA.norm(position)
+
+        if distance_position > distance_surface:
+            distance = LA.norm(position - surface_point)
+        else:
+            distance = distance_position / distance_surface - 1
+
+        gamma = distance * self.distance_scaling + 1
 
         if self.is_boundary:
             gamma = 1 / gamma
 
         return gamma
 
+    def get_bounding_radius(self) -> float:
+        return max(self.radius + self.margin_absolut, LA.norm(self.reference_point))
+
+    def _get_local_support_point(self, direction: np.ndarray) -> np.ndarray:
+        norm_direction = LA.norm(direction)
+        if not norm_direction:
+            return np.zeros(direction.shape)
+        return direction * ((self.radius + self.margin_absolut) / norm_direction)
+
     def get_normal_direction(
-        self, position: np.ndarray, in_obstacle_frame: bool = True
+        self,
+        position: np.ndarray,
+        in_obstacle_frame: bool = True,
+        in_global_frame: Optional[bool] = None,
     ):
+        if in_global_frame is not None:
+            in_obstacle_frame = not (in_global_frame)
+
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
 
         pos_norm = LA.norm(position)
         if not pos_norm:
@@ -44,7 +78,10 @@ class HyperSphere(obstacles.Obstacle):
         normal = position / pos_norm
 
         if not in_obstacle_frame:
-            normal = self.pose.transform_position_from_relative(normal)
+            normal = self._transform_direction_from_relative(normal)
+
+        if self.is_boundary:
+            normal = (-1) * normal
 
         return normal
 
@@ -56,17 +93,19 @@ class HyperSphere(obstacles.Obstacle):
         """Returns the point on the surface from the center with respect to position."""
 
         if not in_obstacle_frame:
-            position = self.pose.transform_position_to_relative(position)
+            position = self._transform_position_to_relative(position)
+
+        radius = self.radius + self.margin_absolut
 
         pos_norm = LA.norm(position)
         if not pos_norm:
             surface_point = np.zeros(position.shape)
-            surface_point[0] = self.semiaxes[0]
+            surface_point[0] = radius
 
         else:
-            surface_point = position / pos_norm
+            surface_point = position / pos_norm * radius
 
         if not in_obstacle_frame:
-            surface_point = self.pose.transform_position_from_relative(surface_point)
+            surface_point = self._transform_position_from_relative(surface_point)
 
         return surface_point
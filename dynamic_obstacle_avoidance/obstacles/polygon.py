@@ -34,7 +34,7 @@ from vartools.angle_math import *
 
 from dynamic_obstacle_avoidance.utils import get_tangents2ellipse
 
-from ._base import Obstacle, GammaType
+from ._base import Obstacle, GammaType, LocalGeometry
 
 
 def is_one_point(point1, point2, margin=1e-9):
@@ -108,6 +108,9 @@ class Polygon(Obstacle):
                 "Not yet implemented for dimensions higher than 3"
             )
 
+        # Edge start-points and directions of the local hulls (see `_get_hull_edges`)
+        self._hull_edges = {}
+
         super().__init__(*args, **kwargs)
 
         # No go zone assuming a uniform margin around the obstacle
@@ -164,6 +167,29 @@ class Polygon(Obstacle):
         )
         return np.max(dist_edges)
 
+    def get_bounding_radius(self):
+        """Maximal distance of the (reference-extended) hull to the center."""
+        return max(
+            np.max(LA.norm(self.edge_reference_points, axis=0)) + self.margin_absolut,
+            LA.norm(self.reference_point),
+        )
+
+    def _get_local_support_point(self, direction):
+        """Vertex of the local margin-hull furthest in direction; None if the hull is
+        not convex."""
+        edge_starts, edge_directions, _ = self._get_hull_edges(
+            with_reference_point_expansion=False
+        )
+        # Consecutive edges turn all in the same direction for a convex polygon
+        turns = edge_directions[0, :] * np.roll(edge_directions[1, :], -1) - (
+            edge_directions[1, :] * np.roll(edge_directions[0, :], -1)
+        )
+        margin = 1e-9 * np.max(np.abs(turns))
+        if np.any(turns < -margin) and np.any(turns > margin):
+            return None
+
+        return edge_starts[:, np.argmax(direction @ edge_starts)]
+
     def get_minimal_distance(self):
         dist_edges = np.linalg.norm(
             self.edge_points
@@ -206,6 +232,60 @@ class Polygon(Obstacle):
         )
 
         self.shapely.set(in_global_frame=True, margin=True, value=shapely_)
+        self._update_hull_edges()
+
+    def _update_hull_edges(self) -> None:
+        """Precomputes the edge arrays of the local margin-hull and of the
+        reference-extended hull; needs to be called whenever a hull is (re)set."""
+        self._hull_edges = {}
+        for with_reference_point_expansion in [False, True]:
+            hull = None
+            if with_reference_point_expansion:
+                hull = self.shapely.get(
+                    in_global_frame=False, margin=True, reference_extended=True
+                )
+
+            if hull is None:
+                hull = self.shapely.get(
+                    in_global_frame=False, margin=True, reference_extended=False
+                )
+
+            if hull is None:
+                continue
+
+            if hull.geom_type == "Polygon":
+                hull_points = np.array(hull.exterior.coords).T
+            else:
+                hull_points = np.array(hull.coords).T
+
+            # Make sure that the hull is closed
+            if not np.allclose(hull_points[:, 0], hull_points[:, -1]):
+                hull_points = np.hstack((hull_points, hull_points[:, :1]))
+
+            edge_starts = hull_points[:, :-1]
+            edge_directions = hull_points[:, 1:] - hull_points[:, :-1]
+            self._hull_edges[with_reference_point_expansion] = (
+                edge_starts,
+                edge_directions,
+                # 2D cross product, i.e., the numerator of the ray intersection
+                edge_starts[0, :] * edge_directions[1, :]
+                - edge_starts[1, :] * edge_directions[0, :],
+            )
+
+    def _get_hull_edges(
+        self, with_reference_point_expansion: bool = True
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the start-points and the directions (each of shape (2, n_edges))
+        of the edges of the local margin-hull, i.e., the edge ii goes from
+        starts[:, ii] to starts[:, ii] + directions[:, ii], and the cross product
+        of the two of shape (n_edges)."""
+        if with_reference_point_expansion not in self._hull_edges:
+            self._update_hull_edges()
+
+            if with_reference_point_expansion not in self._hull_edges:
+                raise Exception("No fitting shape for radius point found.")
+
+        return self._hull_edges[with_reference_point_expansion]
 
     def draw_obstacle(
         self,
@@ -405,6 +485,16 @@ class Polygon(Obstacle):
         if in_global_frame:
             position = self.transform_global2relative(position)
 
+        normal_vector = self._get_local_normal_direction(position)
+
+        if in_global_frame:
+            normal_vector = self.transform_relative2global_dir(normal_vector)
+
+        return normal_vector
+
+    def _get_local_normal_direction(self, position, gamma=None):
+        """Normal direction in the obstacle frame. The (Polygon) gamma can be passed
+        if it is already known."""
         if self.margin_absolut:
             raise NotImplementedError("Not implemented for nonzero margin.")
 
@@ -413,8 +503,11 @@ class Polygon(Obstacle):
             return np.ones(self.dim) / self.dim
 
         if self.is_boundary:
-            # Child and Current Class have to call Polygon
-            Gamma = Polygon.get_gamma(self, position)
+            if gamma is None:
+                # Child and Current Class have to call Polygon
+                Gamma = Polygon.get_gamma(self, position)
+            else:
+                Gamma = gamma
 
             if Gamma < 0:
                 return -self.get_reference_direction(position)
@@ -471,12 +564,7 @@ class Polygon(Obstacle):
             normal_vector = self.adapt_normal_to_arc_extension(position, normal_vector)
 
         # Invert to ensure pointing away from surface
-        normal_vector = normal_vector / LA.norm(normal_vector)
-
-        if in_global_frame:
-            normal_vector = self.transform_relative2global_dir(normal_vector)
-
-        return normal_vector
+        return normal_vector / LA.norm(normal_vector)
 
     def get_tangents_and_normals_of_edge(self, edge_points: np.ndarray):
         """Returns normal and tangent vector of tiles.
@@ -589,6 +677,7 @@ class Polygon(Obstacle):
             reference_extended=True,
             value=new_polygon,
         )
+        self._update_hull_edges()
 
     def get_local_radius(
         self,
@@ -596,17 +685,24 @@ class Polygon(Obstacle):
         in_global_frame: bool = False,
         with_reference_point_expansion: bool = True,
     ) -> float:
-        """Get local / radius or the surface intersection point by using shapely."""
+        """Get local / radius or the surface intersection point; position can be
+        a single point or an array of shape (2, n_points)."""
         if in_global_frame:
             position = self.transform_global2relative(position)
 
+        if np.ndim(position) > 1:
+            return LA.norm(
+                self.get_local_radius_point(
+                    position,
+                    with_reference_point_expansion=with_reference_point_expansion,
+                ),
+                axis=0,
+            )
+
         local_radius_point = self.get_local_radius_point(
             position, with_reference_point_expansion=with_reference_point_expansion
         )
-        try:
-            return LA.norm(local_radius_point)
-        except:
-            breakpoint()
+        return LA.norm(local_radius_point)
 
     def get_local_radius_point(
         self,
@@ -618,43 +714,66 @@ class Polygon(Obstacle):
         if in_global_frame:
             position = self.transform_global2relative(position)
 
-        line_shapely = shapely.geometry.LineString([[0, 0], position])
-
-        my_shapely = None
-
-        if with_reference_point_expansion:
-            my_shapely = self.shapely.get(
-                in_global_frame=False, margin=True, reference_extended=True
-            )
+        if np.ndim(position) > 1:
+            # Positions at the center are evaluated along the first axis
+            position = np.array(position, dtype=float)
+            ind_center = np.logical_not(np.any(position, axis=0))
+            position[:, ind_center] = 0
+            position[0, ind_center] = 1
 
-        if my_shapely is None:
-            my_shapely = self.shapely.get(
-                in_global_frame=False, margin=True, reference_extended=False
+            return self._get_local_radius_points(
+                position, with_reference_point_expansion=with_reference_point_expansion
             )
 
-        if my_shapely is None:
-            raise Exception("No fitting shape for radius point found.")
+        if not np.any(position):
+            # Return nonzero value to avoid 0-division conflicts
+            return self.get_minimal_distance()
 
-        intersection = line_shapely.intersection(my_shapely)
+        return self._get_local_radius_points(
+            np.reshape(position, (-1, 1)),
+            with_reference_point_expansion=with_reference_point_expansion,
+        )[:, 0]
 
-        # If position is inside, the intersection point is equal to the
-        # position-point, in that case redo the calulation with an extended line
-        # to obtain the actual radius-point
-        if intersection.is_empty:
-            # if np.allclose(intersection[-1], position):
-            # Point is assumed to be inside
-            point_dist = LA.norm(position)
-            if not point_dist:
-                # Return nonzero value to avoid 0-division conflicts
-                return self.get_minimal_distance()
+    def _get_local_radius_points(
+        self, positions: np.ndarray, with_reference_point_expansion: bool = True
+    ) -> np.ndarray:
+        """Returns the surface points of shape (2, n_points) in direction of the
+        (nonzero) positions in the local frame by intersecting the rays from the
+        center (origin) with all edges of the hull at once."""
+        edge_starts, edge_directions, edge_crosses = self._get_hull_edges(
+            with_reference_point_expansion
+        )
 
-            # Make sure position is outside the boundary (random mutiple factor)
-            position = position / point_dist * self.get_maximal_distance() * 5.0
+        # Solve (ray_factor * position = edge_start + edge_factor * edge_direction)
+        # for each (position, edge) pair using the 2D cross products
+        denominators = (
+            positions[0, :, np.newaxis] * edge_directions[1, :]
+            - positions[1, :, np.newaxis] * edge_directions[0, :]
+        )
+        # Parallel edges are never intersected (nan-comparisons are False)
+        denominators[denominators == 0] = np.nan
+
+        ray_factors = edge_crosses / denominators
+        edge_factors = (
+            positions[1, :, np.newaxis] * edge_starts[0, :]
+            - positions[0, :, np.newaxis] * edge_starts[1, :]
+        ) / denominators
+
+        margin = 1e-9
+        ray_factors[
+            np.logical_not(
+                (ray_factors > 0)
+                & (edge_factors >= -margin)
+                & (edge_factors <= 1 + margin)
+            )
+        ] = 0
 
-            line_shapely = shapely.geometry.LineString([[0, 0], position])
-            intersection = my_shapely.intersection(line_shapely)
+        # Take the outermost intersection (edges with a common corner both intersect)
+        ray_factors = np.max(ray_factors, axis=1)
+        if not np.all(ray_factors):
+            raise ValueError("Hull is not star-shaped around the reference point.")
 
-        return np.array([intersection.x, intersection.y])
+        return positions * ray_factors
 
     def get_gamma(
         self,
@@ -673,6 +792,32 @@ class Polygon(Obstacle):
         local_radius = self.get_local_radius(
             position, with_reference_point_expansion=with_reference_point_expansion
         )
+        if np.ndim(position) > 1:
+            return self._get_gamma_from_local_radii(
+                position, local_radius, gamma_type=gamma_type
+            )
+
+        return self._get_gamma_from_local_radius(
+            position, local_radius, gamma_type=gamma_type
+        )
+
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        """Vectorized `get_gamma` for positions of shape (2, n_points)."""
+        if type(self).get_gamma is not Polygon.get_gamma:
+            # Child-classes with a different surface description
+            return super().get_gamma_array(positions, in_global_frame=in_global_frame)
+
+        return self.get_gamma(
+            np.asarray(positions).reshape(self.dimension, -1),
+            in_global_frame=in_global_frame,
+        )
+
+    def _get_gamma_from_local_radius(
+        self, position, local_radius, gamma_type=GammaType.EUCLEDIAN
+    ):
+        """Gamma of a position (in the obstacle frame) with its local radius."""
         dist_center = LA.norm(position)
 
         if self.is_boundary:
@@ -695,3 +840,66 @@ class Polygon(Obstacle):
             return 1 / gamma
 
         return gamma
+
+    def _get_gamma_from_local_radii(
+        self, positions, local_radii, gamma_type=GammaType.EUCLEDIAN
+    ):
+        """Array version of `_get_gamma_from_local_radius` for (2, n_points)."""
+        if gamma_type != GammaType.EUCLEDIAN:
+            raise NotImplementedError("Implement othr gamma-types if desire.")
+
+        dist_center = LA.norm(positions, axis=0)
+        gammas = np.where(
+            dist_center < local_radii,
+            dist_center / local_radii,
+            dist_center - local_radii + 1,
+        )
+
+        if self.is_boundary:
+            with np.errstate(divide="ignore"):
+                return 1 / gammas
+
+        return gammas
+
+    def get_local_geometry(self, position, in_global_frame=False):
+        """Returns gamma, normal, reference direction and the local radius point
+        with a single transformation and a single radius evaluation (ray casting on
+        the hull edges, see `_get_hull_edges`)."""
+        if (
+            type(self).get_gamma is not Polygon.get_gamma
+            or type(self).get_normal_direction is not Polygon.get_normal_direction
+        ):
+            # Child-classes with a different surface description
+            return super().get_local_geometry(position, in_global_frame=in_global_frame)
+
+        if in_global_frame:
+            position = self.transform_global2relative(position)
+
+        surface_point = self.get_local_radius_point(position)
+        if np.ndim(surface_point):
+            local_radius = LA.norm(surface_point)
+        else:
+            # At the center only the (minimal) radius is returned
+            local_radius = surface_point
+            surface_point = None
+        gamma = self._get_gamma_from_local_radius(position, local_radius)
+
+        normal = self._get_local_normal_direction(position, gamma=gamma)
+        reference_direction = self.get_reference_direction(
+            position, in_global_frame=False
+        )
+
+        if in_global_frame:
+            normal = self.transform_relative2global_dir(normal)
+            reference_direction = self.transform_relative2global_dir(
+                reference_direction
+            )
+            if surface_point is not None:
+                surface_point = self.transform_relative2global(surface_point)
+
+        return LocalGeometry(
+            gamma=gamma,
+            normal=normal,
+            reference_direction=reference_direction,
+            surface_point=surface_point,
+        )
@@ -0,0 +1,382 @@
+"""
+Tabulated (angular) local radius of star-shaped obstacles.
+"""
+
+import sys
+import warnings
+from math import pi
+from typing import Callable, Optional
+
+import numpy as np
+from numpy import linalg as LA
+
+from scipy.interpolate import CubicSpline, RectSphereBivariateSpline
+
+
+class AngularRadiusTable:
+    """Periodic interpolant of the local radius of a star-shaped obstacle over the
+    direction (angle in 2D, colatitude & longitude in 3D), in the obstacle frame.
+
+    The table is sampled until the interpolation error at the midpoints between the
+    samples is below the radius_tolerance [m] (or the maximum number of samples
+    is reached).
+
+    Attributes
+    ----------
+    dimension: 2 or 3
+    n_samples: number of samples per angle (half of it for the 3D colatitude)
+    max_error: largest radius error at the evaluated midpoints
+    """
+
+    def __init__(
+        self,
+        radius_function: Callable[[np.ndarray], np.ndarray],
+        dimension: int = 2,
+        radius_tolerance: float = 1e-3,
+        n_initial_samples: int = 64,
+        n_max_samples: int = 4096,
+    ):
+        """
+        Arguments
+        ---------
+        radius_function: function returning the radii (n_points) of the unit
+            directions (dimension, n_points) given in the obstacle frame
+        """
+        if dimension not in [2, 3]:
+            raise NotImplementedError(
+                f"Radius table not defined for dimension={dimension}."
+            )
+        self.dimension = dimension
+
+        n_samples = n_initial_samples
+        while True:
+            self._create_interpolant(radius_function, n_samples)
+            self.n_samples = n_samples
+
+            if self.max_error <= radius_tolerance:
+                break
+
+            if 2 * n_samples > n_max_samples:
+                warnings.warn(
+                    f"Radius table error {self.max_error:.2e} is above the tolerance "
+                    + f"{radius_tolerance:.2e} with {n_samples} samples."
+                )
+                break
+            n_samples = 2 * n_samples
+
+    def _create_interpolant(self, radius_function, n_samples: int) -> None:
+        if self.dimension == 2:
+            angles = np.linspace(0, 2 * pi, n_samples + 1)
+            radii = radius_function(self._get_directions(angles[:-1]))
+            # Periodic spline requires the (identical) value at both ends
+            spline = CubicSpline(
+                angles, np.hstack((radii, radii[0])), bc_type="periodic"
+            )
+            # The polynomial coefficients (highest order first) of each interval
+            # are evaluated directly, since the grid is uniform
+            self._coefficients = spline.c
+            self._delta_angle = 2 * pi / n_samples
+
+            angles_mid = angles[:-1] + pi / n_samples
+            error = self._evaluate_polynomial(angles_mid)[0] - radius_function(
+                self._get_directions(angles_mid)
+            )
+
+        else:
+            # Colatitudes have to lie strictly within (0, pi)
+            n_colatitudes = n_samples // 2
+            colatitudes = (np.arange(n_colatitudes) + 0.5) * pi / n_colatitudes
+            longitudes = np.arange(n_samples) * 2 * pi / n_samples
+
+            grid = np.meshgrid(colatitudes, longitudes, indexing="ij")
+            radii = radius_function(self._get_directions(*grid))
+            pole_radii = radius_function(np.array([[0, 0], [0, 0], [1.0, -1.0]]))
+            self._spline = RectSphereBivariateSpline(
+                colatitudes,
+                longitudes,
+                radii.reshape(grid[0].shape),
+                pole_values=tuple(pole_radii),
+                pole_exact=True,
+            )
+
+            # Midpoints including the poles
+            grid = np.meshgrid(
+                np.hstack((0, colatitudes[:-1] + 0.5 * pi / n_colatitudes, pi)),
+                longitudes + pi / n_samples,
+                indexing="ij",
+            )
+            error = self._spline.ev(*grid) - radius_function(
+                self._get_directions(*grid)
+            ).reshape(grid[0].shape)
+
+        self.max_error = np.max(np.abs(error))
+
+    def _evaluate_polynomial(self, angles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the radii and their derivatives with respect to the angles."""
+        if not np.ndim(angles):
+            # Avoid the array-overhead for single evaluations
+            angle = angles % (2 * pi)
+            index = min(int(angle / self._delta_angle), self._coefficients.shape[1] - 1)
+            delta = angle - index * self._delta_angle
+
+            c0, c1, c2, c3 = self._coefficients[:, index]
+            radius = ((c0 * delta + c1) * delta + c2) * delta + c3
+            return radius, (3 * c0 * delta + 2 * c1) * delta + c2
+
+        angles = np.mod(angles, 2 * pi)
+        indices = np.minimum(
+            (angles / self._delta_angle).astype(int), self._coefficients.shape[1] - 1
+        )
+        delta = angles - indices * self._delta_angle
+
+        cc = self._coefficients[:, indices]
+        radii = ((cc[0] * delta + cc[1]) * delta + cc[2]) * delta + cc[3]
+        derivatives = (3 * cc[0] * delta + 2 * cc[1]) * delta + cc[2]
+        return radii, derivatives
+
+    @staticmethod
+    def _get_directions(
+        angles: np.ndarray, longitudes: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Unit directions of shape (dimension, n_points) of the angle(s); the
+        angles are the colatitudes if the longitudes are given."""
+        if longitudes is None:
+            return np.vstack((np.cos(angles), np.sin(angles)))
+
+        angles = angles.flatten()
+        longitudes = longitudes.flatten()
+        return np.vstack(
+            (
+                np.sin(angles) * np.cos(longitudes),
+                np.sin(angles) * np.sin(longitudes),
+                np.cos(angles),
+            )
+        )
+
+    def get_radius(self, positions: np.ndarray) -> np.ndarray:
+        """Radius in direction of the position(s) of shape (dimension) or
+        (dimension, n_points)."""
+        if self.dimension == 2:
+            return self._evaluate_polynomial(
+                np.arctan2(positions[1, ...], positions[0, ...])
+            )[0]
+
+        if np.ndim(positions) == 1:
+            return self.get_radius(np.reshape(positions, (-1, 1)))[0]
+
+        colatitudes, longitudes = self._get_spherical_angles(positions)
+        return self._spline.ev(colatitudes, longitudes)
+
+    def get_radius_and_normal(
+        self, positions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the radii (n_points) and the (outwards pointing) unit normals
+        (dimension, n_points) of the surface in direction of the positions."""
+        if self.dimension == 2:
+            angles = np.arctan2(positions[1, :], positions[0, :])
+            radii, derivatives = self._evaluate_polynomial(angles)
+
+            # Surface point: r * e_r -> normal ~ r * e_r - dr/dangle * e_angle
+            normals = radii * self._get_directions(angles) - derivatives * np.vstack(
+                (-np.sin(angles), np.cos(angles))
+            )
+
+        else:
+            colatitudes, longitudes = self._get_spherical_angles(positions)
+            radii = self._spline.ev(colatitudes, longitudes)
+            derivatives_colatitude = self._spline.ev(colatitudes, longitudes, dtheta=1)
+            derivatives_longitude = self._spline.ev(colatitudes, longitudes, dphi=1)
+
+            sin_colatitudes = np.sin(colatitudes)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # The longitude-derivative vanishes towards the poles
+                derivatives_longitude = np.where(
+                    sin_colatitudes > 1e-12,
+                    derivatives_longitude / sin_colatitudes,
+                    0,
+                )
+
+            directions_colatitude = np.vstack(
+                (
+                    np.cos(colatitudes) * np.cos(longitudes),
+                    np.cos(colatitudes) * np.sin(longitudes),
+                    (-1) * sin_colatitudes,
+                )
+            )
+            directions_longitude = np.vstack(
+                (-np.sin(longitudes), np.cos(longitudes), np.zeros(longitudes.shape))
+            )
+            normals = (
+                radii * self._get_directions(colatitudes, longitudes)
+                - derivatives_colatitude * directions_colatitude
+                - derivatives_longitude * directions_longitude
+            )
+
+        return radii, normals / LA.norm(normals, axis=0)
+
+    @staticmethod
+    def _get_spherical_angles(positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        colatitudes = np.arctan2(LA.norm(positions[:2, :], axis=0), positions[2, :])
+        longitudes = np.mod(np.arctan2(positions[1, :], positions[0, :]), 2 * pi)
+        return colatitudes, longitudes
+
+
+class RadiusLookupMixin:
+    """Mixin for star-shaped obstacles, which serves `get_local_radius`, `get_gamma`
+    and `get_normal_direction` from an `AngularRadiusTable` of the (expensive)
+    local radius of the obstacle, e.g.,
+
+    >>> class TabulatedBlob(RadiusLookupMixin, DoubleBlob):
+    ...     pass
+
+    The table is stored in the obstacle frame, i.e., it is created at the first
+    evaluation and only recreated after a deformation of the obstacle
+    (`update_deforming_obstacle` or `reset_radius_table`), not when it moves.
+
+    Gamma and normal follow the (radius-based) definition of the
+    `StarshapedFlower`.
+    """
+
+    # Maximum (absolut) error of the tabulated radius, can be set per obstacle
+    # (followed by a `reset_radius_table` if the table exists already)
+    radius_tolerance: float = 1e-3
+    n_initial_samples: int = 64
+    n_max_samples: int = 4096
+
+    _radius_table: Optional[AngularRadiusTable] = None
+
+    @property
+    def radius_table(self) -> AngularRadiusTable:
+        if self._radius_table is None:
+            self._radius_table = AngularRadiusTable(
+                self._get_exact_local_radii,
+                dimension=self.dimension,
+                radius_tolerance=self.radius_tolerance,
+                n_initial_samples=self.n_initial_samples,
+                n_max_samples=self.n_max_samples,
+            )
+        return self._radius_table
+
+    def reset_radius_table(self) -> None:
+        """Forces a recreation of the table at the next evaluation."""
+        self._radius_table = None
+
+    def update_deforming_obstacle(self, *args, **kwargs):
+        super().update_deforming_obstacle(*args, **kwargs)
+        self.reset_radius_table()
+
+    def _get_exact_local_radii(self, directions: np.ndarray) -> np.ndarray:
+        """Local radii (n_points) of the directions (dimension, n_points) in the
+        obstacle frame as evaluated by the obstacle itself."""
+        return np.array(
+            [
+                super(RadiusLookupMixin, self).get_local_radius(directions[:, ii])
+                for ii in range(directions.shape[1])
+            ]
+        )
+
+    def get_local_radius(
+        self,
+        position,
+        in_global_frame: bool = False,
+        in_obstacle_frame: Optional[bool] = None,
+    ):
+        """Tabulated local radius; position of shape (dimension) or
+        (dimension, n_points)."""
+        if in_obstacle_frame is not None:
+            in_global_frame = not (in_obstacle_frame)
+
+        if in_global_frame:
+            position = self._transform_position_to_relative(position)
+
+        return self.radius_table.get_radius(position)
+
+    def get_gamma(
+        self,
+        position,
+        in_global_frame: bool = False,
+        in_obstacle_frame: Optional[bool] = None,
+    ):
+        """Gamma from the tabulated radius; position of shape (dimension) or
+        (dimension, n_points)."""
+        if in_obstacle_frame is not None:
+            in_global_frame = not (in_obstacle_frame)
+
+        if in_global_frame:
+            position = self._transform_position_to_relative(position)
+
+        if np.ndim(position) > 1:
+            return self._get_gamma_of_array(position)
+
+        if not (mag_position := LA.norm(position)):
+            if self.is_boundary:
+                return sys.float_info.max
+            else:
+                return 0
+
+        radius = self.radius_table.get_radius(position)
+        if self.is_boundary:
+            return (radius / mag_position) ** self.distance_scaling
+
+        elif mag_position < radius:
+            return (mag_position / radius) ** self.distance_scaling
+
+        else:
+            return (mag_position - radius) * self.distance_scaling + 1
+
+    def _get_gamma_of_array(self, positions: np.ndarray) -> np.ndarray:
+        mag_positions = LA.norm(positions, axis=0)
+        radii = self.radius_table.get_radius(positions)
+
+        with np.errstate(divide="ignore"):
+            if self.is_boundary:
+                gammas = (radii / mag_positions) ** self.distance_scaling
+                gammas[mag_positions == 0] = sys.float_info.max
+
+            else:
+                gammas = np.where(
+                    mag_positions < radii,
+                    (mag_positions / radii) ** self.distance_scaling,
+                    (mag_positions - radii) * self.distance_scaling + 1,
+                )
+        return gammas
+
+    def get_normal_direction(
+        self,
+        position,
+        in_global_frame: bool = False,
+        in_obstacle_frame: Optional[bool] = None,
+    ):
+        """Normal of the tabulated surface; position of shape (dimension) or
+        (dimension, n_points)."""
+        if in_obstacle_frame is not None:
+            in_global_frame = not (in_obstacle_frame)
+
+        if in_global_frame:
+            position = self._transform_position_to_relative(position)
+
+        positions = np.reshape(position, (self.dimension, -1))
+        _, normals = self.radius_table.get_radius_and_normal(positions)
+        # Just return one direction at the center
+        normals[:, LA.norm(positions, axis=0) == 0] = 1.0 / self.dimension
+
+        if in_global_frame:
+            normals = self._transform_direction_from_relative(normals)
+
+        if np.ndim(position) > 1:
+            return normals
+        return normals[:, 0]
+
+    def get_gamma_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        return self.get_gamma(
+            np.reshape(positions, (self.dimension, -1)), in_global_frame=in_global_frame
+        )
+
+    def get_normal_direction_array(
+        self, positions: np.ndarray, in_global_frame: bool = False
+    ) -> np.ndarray:
+        return self.get_normal_direction(
+            np.reshape(positions, (self.dimension, -1)), in_global_frame=in_global_frame
+        )
@@ -0,0 +1,17 @@
+"""
+The :mod:`simulation` module implements the headless simulation of agents
+"""
+from .simulation_engine import SimulationEngine, SimulationResult
+from .monte_carlo import SerializedEnvironment, Scenario, RolloutResult
+from .monte_carlo import MonteCarloRunner, MonteCarloStatistics, run_scenario
+
+__all__ = [
+    "SimulationEngine",
+    "SimulationResult",
+    "SerializedEnvironment",
+    "Scenario",
+    "RolloutResult",
+    "MonteCarloRunner",
+    "MonteCarloStatistics",
+    "run_scenario",
+]
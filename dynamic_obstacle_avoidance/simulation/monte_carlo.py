@@ -0,0 +1,417 @@
+"""
+Monte-Carlo evaluation of the avoidance over many (random) scenarios, which are
+run in parallel processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+from numpy import linalg as LA
+
+from scipy.spatial.transform import Rotation
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance import obstacles
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+
+from .simulation_engine import SimulationEngine
+
+
+@dataclass
+class SerializedEnvironment:
+    """Compact (array only) description of an environment of `EllipseWithAxes` and
+    `CuboidXd` obstacles, which is cheap to send to other processes.
+
+    Attributes
+    ----------
+    type_names: (n_obstacles) list of the obstacle-class names
+    center_positions, axes_lengths, reference_points, linear_velocities:
+        (n_obstacles, dimension) arrays
+    orientations: (n_obstacles, 1) angles in 2D, (n_obstacles, 4) quaternions in 3D
+        and (n_obstacles, 0) in higher dimensions
+    angular_velocities: (n_obstacles, 1) in 2D, (n_obstacles, 3) in 3D
+    margins, curvatures, distance_scalings, repulsion_coeffs, reactivities:
+        (n_obstacles) arrays
+    is_boundary, tail_effects, sticky_surfaces, is_non_starshaped: (n_obstacles)
+        bool-arrays
+    """
+
+    type_names: list
+    center_positions: np.ndarray
+    axes_lengths: np.ndarray
+    reference_points: np.ndarray
+    linear_velocities: np.ndarray
+    orientations: np.ndarray
+    angular_velocities: np.ndarray
+    margins: np.ndarray
+    curvatures: np.ndarray
+    distance_scalings: np.ndarray
+    repulsion_coeffs: np.ndarray
+    reactivities: np.ndarray
+    is_boundary: np.ndarray
+    tail_effects: np.ndarray
+    sticky_surfaces: np.ndarray
+    is_non_starshaped: np.ndarray
+
+    # Names of the obstacle-classes (in `obstacles`) which can be serialized
+    supported_types = ("EllipseWithAxes", "CuboidXd")
+
+    @property
+    def n_obstacles(self) -> int:
+        return len(self.type_names)
+
+    @property
+    def dimension(self) -> int:
+        return self.center_positions.shape[1]
+
+    @classmethod
+    def from_environment(cls, obstacle_environment) -> "SerializedEnvironment":
+        type_names = [type(obs).__name__ for obs in obstacle_environment]
+        for name in type_names:
+            if name not in cls.supported_types:
+                raise TypeError(f"Obstacle of type {name} can not be serialized.")
+
+        if any(obs.is_deforming for obs in obstacle_environment):
+            raise TypeError("Deforming obstacles can not be serialized.")
+
+        n_obs = len(type_names)
+        if n_obs:
+            dim = obstacle_environment[0].dimension
+        else:
+            dim = 0
+
+        if dim == 2:
+            dim_orientation, dim_angular = 1, 1
+        elif dim == 3:
+            dim_orientation, dim_angular = 4, 3
+        else:
+            dim_orientation, dim_angular = 0, 0
+
+        environment = cls(
+            type_names=type_names,
+            center_positions=np.zeros((n_obs, dim)),
+            axes_lengths=np.zeros((n_obs, dim)),
+            reference_points=np.zeros((n_obs, dim)),
+            linear_velocities=np.zeros((n_obs, dim)),
+            orientations=np.zeros((n_obs, dim_orientation)),
+            angular_velocities=np.zeros((n_obs, dim_angular)),
+            margins=np.zeros(n_obs),
+            curvatures=np.ones(n_obs),
+            distance_scalings=np.ones(n_obs),
+            repulsion_coeffs=np.ones(n_obs),
+            reactivities=np.ones(n_obs),
+            is_boundary=np.zeros(n_obs, dtype=bool),
+            tail_effects=np.ones(n_obs, dtype=bool),
+            sticky_surfaces=np.ones(n_obs, dtype=bool),
+            is_non_starshaped=np.zeros(n_obs, dtype=bool),
+        )
+
+        for ii, obs in enumerate(obstacle_environment):
+            environment.center_positions[ii, :] = obs.center_position
+            environment.axes_lengths[ii, :] = obs.axes_length
+            environment.reference_points[ii, :] = obs.reference_point
+
+            if obs.linear_velocity is not None:
+                environment.linear_velocities[ii, :] = obs.linear_velocity
+            if dim == 2:
+                environment.orientations[ii, 0] = obs.orientation
+            elif dim == 3:
+                environment.orientations[ii, :] = obs.orientation.as_quat()
+            if dim_angular and obs.angular_velocity is not None:
+                environment.angular_velocities[ii, :] = obs.angular_velocity
+
+            if isinstance(obs, obstacles.EllipseWithAxes):
+                environment.curvatures[ii] = obs.curvature
+            environment.margins[ii] = obs.margin_absolut
+            environment.distance_scalings[ii] = obs.distance_scaling
+            environment.repulsion_coeffs[ii] = obs.repulsion_coeff
+            environment.reactivities[ii] = obs.reactivity
+            environment.is_boundary[ii] = obs.is_boundary
+            environment.tail_effects[ii] = obs.tail_effect
+            environment.sticky_surfaces[ii] = obs.has_sticky_surface
+            environment.is_non_starshaped[ii] = obs.is_non_starshaped
+
+        return environment
+
+    def to_environment(self) -> ObstacleContainer:
+        """Creates the obstacles (in a new container)."""
+        obstacle_environment = ObstacleContainer()
+        for ii, name in enumerate(self.type_names):
+            if self.dimension == 2:
+                orientation = self.orientations[ii, 0]
+                angular_velocity = self.angular_velocities[ii, 0]
+            elif self.dimension == 3:
+                orientation = Rotation.from_quat(self.orientations[ii, :])
+                angular_velocity = self.angular_velocities[ii, :]
+            else:
+                orientation = None
+                angular_velocity = None
+
+            kwargs = {}
+            if name == "EllipseWithAxes":
+                kwargs["curvature"] = self.curvatures[ii]
+
+            obstacle_environment.append(
+                getattr(obstacles, name)(
+                    center_position=np.copy(self.center_positions[ii, :]),
+                    axes_length=np.copy(self.axes_lengths[ii, :]),
+                    orientation=orientation,
+                    linear_velocity=np.copy(self.linear_velocities[ii, :]),
+                    angular_velocity=angular_velocity,
+                    margin_absolut=self.margins[ii],
+                    distance_scaling=self.distance_scalings[ii],
+                    repulsion_coeff=self.repulsion_coeffs[ii],
+                    reactivity=self.reactivities[ii],
+                    is_boundary=bool(self.is_boundary[ii]),
+                    tail_effect=bool(self.tail_effects[ii]),
+                    has_sticky_surface=bool(self.sticky_surfaces[ii]),
+                    relative_reference_point=np.copy(self.reference_points[ii, :]),
+                    **kwargs,
+                )
+            )
+            obstacle_environment[-1].is_non_starshaped = bool(
+                self.is_non_starshaped[ii]
+            )
+        return obstacle_environment
+
+
+@dataclass
+class Scenario:
+    """Start positions (dimension, n_agents) of agents moving towards the attractor
+    of a linear system in a (serialized) environment."""
+
+    environment: SerializedEnvironment
+    attractor_position: np.ndarray
+    start_positions: np.ndarray
+
+
+@dataclass
+class RolloutResult:
+    """Metrics of the agents of one scenario, all are (n_agents) arrays.
+
+    Attributes
+    ----------
+    has_converged: agent reached the attractor (within the goal margin)
+    time_to_goal: time until the attractor is reached (nan if not converged)
+    minimum_gamma: minimum gamma along the path
+    path_length: length of the path (until convergence or collision)
+    """
+
+    has_converged: np.ndarray
+    time_to_goal: np.ndarray
+    minimum_gamma: np.ndarray
+    path_length: np.ndarray
+
+
+@dataclass
+class MonteCarloStatistics:
+    """Incremental aggregation of the rollout results (the arrays are ordered by
+    task, independent of the order of completion)."""
+
+    n_tasks: int = 0
+    n_agents: int = 0
+    n_converged: int = 0
+    minimum_gamma: float = np.inf
+    _results: dict = field(default_factory=dict, repr=False)
+
+    def add(self, task_index: int, result: RolloutResult) -> None:
+        self._results[task_index] = result
+
+        self.n_tasks += 1
+        self.n_agents += result.has_converged.shape[0]
+        self.n_converged += int(np.sum(result.has_converged))
+        if result.minimum_gamma.shape[0]:
+            self.minimum_gamma = min(
+                self.minimum_gamma, float(np.min(result.minimum_gamma))
+            )
+
+    @property
+    def convergence_rate(self) -> float:
+        if not self.n_agents:
+            return 0.0
+        return self.n_converged / self.n_agents
+
+    def get_array(self, name: str) -> np.ndarray:
+        """Returns the concatenated metric of all agents (ordered by task)."""
+        return np.hstack(
+            [getattr(self._results[key], name) for key in sorted(self._results)]
+        )
+
+    @property
+    def task_indices(self) -> np.ndarray:
+        """Task index of each agent."""
+        return np.hstack(
+            [
+                np.full(self._results[key].has_converged.shape[0], key)
+                for key in sorted(self._results)
+            ]
+        )
+
+
+def run_scenario(
+    scenario: Scenario,
+    dt: float = 0.05,
+    n_steps: int = 500,
+    integrator: str = "euler",
+    goal_margin: float = 0.05,
+    seed: Optional[np.random.SeedSequence] = None,
+) -> RolloutResult:
+    """Simulates all agents of a scenario and evaluates their metrics. The seed is
+    used to set numpy's global random state (e.g. for stochastic dynamics)."""
+    if seed is not None:
+        np.random.seed(seed.generate_state(1)[0])
+
+    obstacle_environment = scenario.environment.to_environment()
+    engine = SimulationEngine(
+        obstacle_environment,
+        initial_dynamics=LinearSystem(attractor_position=scenario.attractor_position),
+        integrator=integrator,
+        dt=dt,
+    )
+    engine.reset(scenario.start_positions)
+    n_agents = engine.n_agents
+
+    time_to_goal = np.full(n_agents, np.nan)
+    path_length = np.zeros(n_agents)
+    if len(obstacle_environment):
+        minimum_gamma = obstacle_environment.get_minimum_gamma_of_array(
+            engine.positions
+        )
+    else:
+        minimum_gamma = np.full(n_agents, np.inf)
+
+    attractor = np.reshape(scenario.attractor_position, (-1, 1))
+    has_converged = LA.norm(engine.positions - attractor, axis=0) < goal_margin
+    time_to_goal[has_converged] = 0
+    engine.has_converged = np.copy(has_converged)
+
+    for it in range(n_steps):
+        if not np.any(engine.is_active):
+            break
+
+        ind_active = engine.is_active
+        positions = np.copy(engine.positions)
+        engine.step()
+
+        path_length[ind_active] += LA.norm(
+            engine.positions[:, ind_active] - positions[:, ind_active], axis=0
+        )
+        if len(obstacle_environment):
+            minimum_gamma[ind_active] = np.minimum(
+                minimum_gamma[ind_active],
+                obstacle_environment.get_minimum_gamma_of_array(
+                    engine.positions[:, ind_active]
+                ),
+            )
+
+        is_at_goal = LA.norm(engine.positions - attractor, axis=0) < goal_margin
+        ind_new = np.logical_and(is_at_goal, np.logical_not(has_converged))
+        time_to_goal[ind_new] = engine.time
+        has_converged = np.logical_or(has_converged, is_at_goal)
+
+        # Agents at the goal (or stalled) are stopped
+        engine.has_converged = np.logical_or(engine.has_converged, is_at_goal)
+
+    return RolloutResult(
+        has_converged=has_converged,
+        time_to_goal=time_to_goal,
+        minimum_gamma=minimum_gamma,
+        path_length=path_length,
+    )
+
+
+def _run_task(scenario, task_index, seed, settings):
+    return task_index, run_scenario(scenario, seed=seed, **settings)
+
+
+class MonteCarloRunner:
+    """Runs many scenarios in parallel processes (`ProcessPoolExecutor`) and
+    aggregates the results, as they complete, in `MonteCarloStatistics`.
+
+    Each task has its own seed (spawned from the seed of the runner), hence the
+    results are reproducible independent of the number of workers.
+
+    Attributes
+    ----------
+    n_workers: number of processes; with 0 the tasks are run in this process
+    settings: keyword arguments of `run_scenario`, e.g., dt, n_steps or integrator
+    """
+
+    def __init__(self, n_workers: Optional[int] = None, seed: int = 0, **settings):
+        self.n_workers = n_workers
+        self.seed = seed
+        self.settings = settings
+
+    def get_task_seeds(self, n_tasks: int) -> list:
+        return np.random.SeedSequence(self.seed).spawn(n_tasks)
+
+    def run(
+        self,
+        scenario_generator: Callable = None,
+        n_tasks: int = None,
+        scenarios: list = None,
+        callback: Optional[Callable] = None,
+    ) -> MonteCarloStatistics:
+        """Runs either n_tasks scenarios of the scenario_generator, a function which
+        creates a `Scenario` from a numpy random generator, or the given list of
+        scenarios. The environments are serialized before they are sent to the
+        workers.
+
+        The callback(task_index, result, statistics) is called for each completed
+        task."""
+        if scenarios is not None:
+            n_tasks = len(scenarios)
+        elif scenario_generator is None or n_tasks is None:
+            raise ValueError("Scenario generator and number of tasks are needed.")
+
+        def get_task(ii, task_seed):
+            if scenarios is not None:
+                scenario = scenarios[ii]
+            else:
+                scenario = scenario_generator(np.random.default_rng(task_seed))
+            # The simulation has its own seed (independent of the scenario)
+            return self._serialize(scenario), task_seed.spawn(1)[0]
+
+        statistics = MonteCarloStatistics()
+        task_seeds = self.get_task_seeds(n_tasks)
+
+        if self.n_workers == 0:
+            for ii in range(n_tasks):
+                scenario, seed = get_task(ii, task_seeds[ii])
+                task_index, result = _run_task(scenario, ii, seed, self.settings)
+                self._add_result(statistics, task_index, result, callback)
+            return statistics
+
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            futures = []
+            for ii in range(n_tasks):
+                scenario, seed = get_task(ii, task_seeds[ii])
+                futures.append(
+                    executor.submit(_run_task, scenario, ii, seed, self.settings)
+                )
+
+            for future in as_completed(futures):
+                task_index, result = future.result()
+                self._add_result(statistics, task_index, result, callback)
+
+        return statistics
+
+    @staticmethod
+    def _serialize(scenario: Scenario) -> Scenario:
+        if isinstance(scenario.environment, SerializedEnvironment):
+            return scenario
+
+        return Scenario(
+            environment=SerializedEnvironment.from_environment(scenario.environment),
+            attractor_position=scenario.attractor_position,
+            start_positions=scenario.start_positions,
+        )
+
+    @staticmethod
+    def _add_result(statistics, task_index, result, callback) -> None:
+        statistics.add(task_index, result)
+        if callback is not None:
+            callback(task_index, result, statistics)
@@ -0,0 +1,238 @@
+"""
+Headless (closed-loop) simulation of agents avoiding (moving) obstacles.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance.rk4 import get_collisions_of_array
+from dynamic_obstacle_avoidance.avoidance.rk4 import get_obstacles_at_time
+
+
+def euler_step(evaluate: Callable, positions: np.ndarray, dt: float) -> np.ndarray:
+    """Explicit euler step of positions of shape (dimension, n_agents)."""
+    return positions + dt * evaluate(positions, 0.0)
+
+
+def rk4_step(evaluate: Callable, positions: np.ndarray, dt: float) -> np.ndarray:
+    """Fourth order Runge-Kutta step of positions of shape (dimension, n_agents).
+    The stages are evaluated at the times (t + c_i * dt) of the step."""
+    k1 = dt * evaluate(positions, 0.0)
+    k2 = dt * evaluate(positions + 0.5 * k1, 0.5 * dt)
+    k3 = dt * evaluate(positions + 0.5 * k2, 0.5 * dt)
+    k4 = dt * evaluate(positions + k3, dt)
+    return positions + 1.0 / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+@dataclass
+class SimulationResult:
+    """Trajectories of a simulation run, agents which have stopped keep their last
+    position (and have zero velocity).
+
+    Attributes
+    ----------
+    times: (n_steps + 1) array
+    positions: (dimension, n_steps + 1, n_agents) array
+    velocities: (dimension, n_steps, n_agents) array of the (avoided) velocities
+    obstacle_positions: (n_obstacles, dimension, n_steps + 1) array of the centers
+    has_converged: (n_agents) bool-array
+    has_collided: (n_agents) bool-array
+    """
+
+    times: np.ndarray
+    positions: np.ndarray
+    velocities: np.ndarray
+    obstacle_positions: np.ndarray
+    has_converged: np.ndarray
+    has_collided: np.ndarray
+
+
+class SimulationEngine:
+    """Steps the obstacles and the agents of an environment without any plotting,
+    e.g., for regression simulations on servers or as backend of the animators.
+
+    Attributes
+    ----------
+    obstacle_environment: obstacle container (or list)
+    avoider: avoider with `evaluate(position)` (default: `ModulationAvoider` of the
+        initial_dynamics); its batched `avoid_batch` is used if available
+    integrator: 'euler', 'rk4' or a function (evaluate, positions, dt) -> positions,
+        where evaluate(positions, delta_time=0.0) is called at the stage times
+    obstacle_update: function (obstacle_environment, time, dt) to move the
+        obstacles; by default the obstacles do a velocity step
+    convergence_margin: agents with a velocity below are stopped
+    check_collision: agents which are inside an obstacle are stopped
+    consider_obstacle_motion: the (intermediate) stages of the integrator see the
+        obstacles at the stage time as predicted by their twist; otherwise the
+        obstacles are static within a step
+    """
+
+    integrators = {"euler": euler_step, "rk4": rk4_step}
+
+    def __init__(
+        self,
+        obstacle_environment,
+        initial_dynamics=None,
+        avoider=None,
+        integrator: str | Callable = "euler",
+        dt: float = 0.01,
+        obstacle_update: Optional[Callable] = None,
+        convergence_margin: float = 1e-3,
+        check_collision: bool = True,
+        consider_obstacle_motion: bool = False,
+    ):
+        self.obstacle_environment = obstacle_environment
+
+        if avoider is None:
+            if initial_dynamics is None:
+                raise ValueError("Initial dynamics or avoider are needed.")
+
+            avoider = ModulationAvoider(
+                initial_dynamics=initial_dynamics,
+                obstacle_environment=obstacle_environment,
+            )
+        self.avoider = avoider
+
+        if isinstance(integrator, str):
+            if integrator not in self.integrators:
+                raise ValueError(f"Unknown integrator '{integrator}'.")
+            integrator = self.integrators[integrator]
+        self.integrator = integrator
+
+        self.dt = dt
+        self.obstacle_update = obstacle_update
+        self.convergence_margin = convergence_margin
+        self.check_collision = check_collision
+        self.consider_obstacle_motion = consider_obstacle_motion
+
+        self.positions = None
+
+    @property
+    def n_agents(self) -> int:
+        return self.positions.shape[1]
+
+    @property
+    def is_active(self) -> np.ndarray:
+        """Agents which have neither converged nor collided."""
+        return np.logical_not(np.logical_or(self.has_converged, self.has_collided))
+
+    def evaluate(self, positions: np.ndarray, delta_time: float = 0.0) -> np.ndarray:
+        """Avoided velocities of shape (dimension, n_points) at the time
+        (self.time + delta_time) of the current step."""
+        if not self.consider_obstacle_motion or not delta_time:
+            return self._evaluate(positions)
+
+        # Evaluate with the predicted obstacles without moving the environment
+        obstacle_environment = self.avoider.obstacle_environment
+        self.avoider.obstacle_environment = get_obstacles_at_time(
+            obstacle_environment, delta_time
+        )
+        try:
+            return self._evaluate(positions)
+        finally:
+            self.avoider.obstacle_environment = obstacle_environment
+
+    def _evaluate(self, positions: np.ndarray) -> np.ndarray:
+        if hasattr(self.avoider, "avoid_batch"):
+            initial_velocities = np.zeros(positions.shape)
+            for ii in range(positions.shape[1]):
+                initial_velocities[:, ii] = self.avoider.initial_dynamics.evaluate(
+                    positions[:, ii]
+                )
+            return self.avoider.avoid_batch(positions, initial_velocities)
+
+        velocities = np.zeros(positions.shape)
+        for ii in range(positions.shape[1]):
+            velocities[:, ii] = self.avoider.evaluate(positions[:, ii])
+        return velocities
+
+    def reset(self, positions_init: np.ndarray) -> None:
+        """Sets the initial positions (dimension, n_agents) of the agents."""
+        positions_init = np.array(positions_init, dtype=float)
+        if len(positions_init.shape) == 1:
+            positions_init = positions_init.reshape(-1, 1)
+
+        self.positions = positions_init
+        self.velocities = np.zeros(positions_init.shape)
+        self.time = 0.0
+        self.it_step = 0
+
+        self.has_converged = np.zeros(self.n_agents, dtype=bool)
+        self.has_collided = np.zeros(self.n_agents, dtype=bool)
+
+    def update_obstacles(self) -> None:
+        if self.obstacle_update is not None:
+            self.obstacle_update(self.obstacle_environment, self.time, self.dt)
+
+        elif hasattr(self.obstacle_environment, "do_velocity_step"):
+            self.obstacle_environment.do_velocity_step(delta_time=self.dt)
+
+        else:
+            for obs in self.obstacle_environment:
+                obs.do_velocity_step(self.dt)
+
+    def step(self) -> None:
+        """Advances the active agents and then the obstacles by one time step."""
+        ind_active = np.arange(self.n_agents)[self.is_active]
+        self.velocities = np.zeros(self.positions.shape)
+
+        if ind_active.shape[0]:
+            positions = self.positions[:, ind_active]
+            new_positions = self.integrator(self.evaluate, positions, self.dt)
+
+            self.velocities[:, ind_active] = (new_positions - positions) / self.dt
+            self.positions[:, ind_active] = new_positions
+
+            self.has_converged[ind_active] = (
+                LA.norm(self.velocities[:, ind_active], axis=0)
+                < self.convergence_margin
+            )
+
+        self.update_obstacles()
+        self.time += self.dt
+        self.it_step += 1
+
+        if self.check_collision and ind_active.shape[0]:
+            self.has_collided[ind_active] = get_collisions_of_array(
+                self.obstacle_environment, self.positions[:, ind_active]
+            )
+
+    def get_obstacle_positions(self) -> np.ndarray:
+        return np.array(
+            [obs.center_position for obs in self.obstacle_environment]
+        ).reshape(len(self.obstacle_environment), -1)
+
+    def run(
+        self, positions_init: np.ndarray, n_steps: int, stop_if_inactive: bool = True
+    ) -> SimulationResult:
+        """Simulates n_steps (or until all agents have stopped) and returns the
+        trajectories."""
+        self.reset(positions_init)
+        dim = self.positions.shape[0]
+
+        positions = np.zeros((dim, n_steps + 1, self.n_agents))
+        positions[:, 0, :] = self.positions
+        velocities = np.zeros((dim, n_steps, self.n_agents))
+        obstacle_positions = [self.get_obstacle_positions()]
+
+        for it in range(n_steps):
+            if stop_if_inactive and not np.any(self.is_active):
+                break
+
+            self.step()
+            positions[:, self.it_step, :] = self.positions
+            velocities[:, self.it_step - 1, :] = self.velocities
+            obstacle_positions.append(self.get_obstacle_positions())
+
+        return SimulationResult(
+            times=np.arange(self.it_step + 1) * self.dt,
+            positions=positions[:, : self.it_step + 1, :],
+            velocities=velocities[:, : self.it_step, :],
+            obstacle_positions=np.moveaxis(np.array(obstacle_positions), 0, 2),
+            has_converged=np.copy(self.has_converged),
+            has_collided=np.copy(self.has_collided),
+        )
@@ -135,6 +135,87 @@ def get_relative_obstacle_velocity(
     return xd_obs
 
 
+def get_relative_obstacle_velocity_batch(
+    positions: np.ndarray,
+    obstacle_list,
+    E_orth: np.ndarray,
+    weights: np.ndarray,
+    gamma_list: np.ndarray,
+    cut_off_gamma: float = 1e4,
+    velocity_only_in_positive_normal_direction: bool = True,
+    normal_weight_factor: float = 1.3,
+) -> np.ndarray:
+    """Get the relative obstacle velocity for many positions at once.
+
+    This is the array version of 'get_relative_obstacle_velocity'. The deformation
+    velocity is not evaluated, i.e., deforming obstacles need the point-wise function.
+
+    Parameters
+    ----------
+    positions: array of shape (dimension, n_points)
+    obstacle_list: list or <obstacle-conainter> with obstacles
+    E_orth: orthogonal matrices with respect to the normal direction
+        array of shape (dimension, dimension, n_obstacles, n_points)
+    weights: obstacle weights of shape (n_obstacles, n_points)
+    gamma_list: precalculated gamma-values of shape (n_obstacles, n_points)
+
+    Return
+    ------
+    relative_velocity: array of shape (dimension, n_points)
+    """
+    dim, n_points = positions.shape
+
+    xd_obs = np.zeros((dim, n_points))
+    for it_obs, obs in enumerate(obstacle_list):
+        ind_obs = gamma_list[it_obs, :] < cut_off_gamma
+        if not np.sum(ind_obs):
+            continue
+
+        relative_position = positions[:, ind_obs] - np.reshape(
+            obs.center_position, (dim, 1)
+        )
+        if dim == 2:
+            if obs.angular_velocity is None:
+                xd_w = np.zeros(relative_position.shape)
+            else:
+                xd_w = np.cross(
+                    np.hstack(([0, 0], obs.angular_velocity)),
+                    np.vstack(
+                        (relative_position, np.zeros(relative_position.shape[1]))
+                    ).T,
+                ).T
+                xd_w = xd_w[0:2, :]
+        elif dim == 3:
+            if obs.angular_velocity is not None and LA.norm(obs.angular_velocity):
+                xd_w = np.cross(obs.angular_velocity, relative_position.T).T
+            else:
+                xd_w = np.zeros(relative_position.shape)
+        else:
+            if obs.angular_velocity is not None and LA.norm(obs.angular_velocity):
+                warnings.warn("Angular velocity is not defined for={}".format(dim))
+            xd_w = np.zeros(relative_position.shape)
+
+        gamma_ = np.maximum(gamma_list[it_obs, ind_obs], 1)
+        weight_angular = np.exp(-1.0 * (gamma_ - 1))
+        weight_linear = np.exp(-1 / 1 * (gamma_ - 1))
+
+        linear_velocity = np.tile(obs.linear_velocity, (gamma_.shape[0], 1)).T
+        if velocity_only_in_positive_normal_direction:
+            normal = E_orth[:, 0, it_obs, ind_obs]
+            lin_vel_normal = np.sum(normal * linear_velocity, axis=0)
+            if not obs.is_boundary:
+                # Obstacle is moving towards the agent
+                lin_vel_normal[lin_vel_normal < 0] = 0
+
+            # For safety in close region, we multiply the velocity
+            linear_velocity = normal * (normal_weight_factor * lin_vel_normal)
+
+        xd_obs_n = weight_linear * linear_velocity + weight_angular * xd_w
+        xd_obs[:, ind_obs] = xd_obs[:, ind_obs] + xd_obs_n * weights[it_obs, ind_obs]
+
+    return xd_obs
+
+
 def get_weight_from_gamma(*args, **kwargs):
     raise Exception("Renamed to 'get_weight_from_inv_of_gamma'")
 
@@ -361,6 +442,255 @@ def compute_weights(
     return w
 
 
+def compute_weights_batch(
+    distMeas: np.ndarray,
+    distMeas_lowerLimit: float = 1,
+    weightPow: float = 1,
+) -> np.ndarray:
+    """Compute weights column-wise for a distance measure of shape
+    (n_obstacles, n_points), such that each column equals 'compute_weights'."""
+    distMeas = np.array(distMeas, dtype=float)
+    weights = np.zeros(distMeas.shape)
+
+    critical_points = distMeas <= distMeas_lowerLimit
+    n_critical = np.sum(critical_points, axis=0)
+
+    ind_critical = n_critical > 0
+    if np.sum(ind_critical):
+        if np.any(n_critical > 1):
+            # TODO: continuous weighting function
+            warnings.warn("Implement continuity of weighting function.")
+        weights[:, ind_critical] = (
+            critical_points[:, ind_critical] * 1.0 / n_critical[ind_critical]
+        )
+
+    ind_regular = np.logical_not(ind_critical)
+    if not np.sum(ind_regular):
+        return weights
+
+    w = (1 / (distMeas[:, ind_regular] - distMeas_lowerLimit)) ** weightPow
+    w_sum = np.sum(w, axis=0)
+    ind_nonzero = w_sum > 0
+    w[:, ind_nonzero] = w[:, ind_nonzero] / w_sum[ind_nonzero]  # Normalization
+    weights[:, ind_regular] = w
+
+    return weights
+
+
+def get_orthogonal_basis_batch(vectors: np.ndarray) -> np.ndarray:
+    """Orthonormal bases of shape (dimension, dimension, n_points) for vectors of
+    shape (dimension, n_points); the first basis vector is the normalized vector.
+
+    The tangent vectors are obtained from a Householder reflection, hence they can
+    differ from 'get_orthogonal_basis', but span the same tangent space."""
+    dim, n_points = vectors.shape
+
+    norms = LA.norm(vectors, axis=0)
+    unit_vectors = np.zeros(vectors.shape)
+    unit_vectors[0, :] = 1
+    ind_nonzero = norms > 0
+    unit_vectors[:, ind_nonzero] = vectors[:, ind_nonzero] / norms[ind_nonzero]
+
+    # Householder vector with the sign chosen to be numerically stable
+    householder = np.copy(unit_vectors)
+    householder[0, :] = householder[0, :] + np.where(unit_vectors[0, :] > 0, 1, -1)
+
+    bases = np.tile(np.eye(dim)[:, :, np.newaxis], (1, 1, n_points)) - 2 * (
+        householder[:, np.newaxis, :] * householder[np.newaxis, :, :]
+    ) / np.sum(householder**2, axis=0)
+    bases[:, 0, :] = unit_vectors
+
+    return bases
+
+
+def get_inverse_of_decomposition_matrix(
+    E: np.ndarray,
+    E_orth: Optional[np.ndarray] = None,
+    singular_tolerance: float = 1e-12,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Inverse of the decomposition matrix E, i.e., of the orthonormal basis E_orth
+    with the first column replaced by the (negative) reference direction.
+
+    The inverse is analytic in 2D (adjugate) and 3D (cross products). In higher
+    dimensions the structure E = E_orth @ M is used, where M is the identity with
+    the first column replaced by c = E_orth.T @ E[:, 0], hence E^-1 = M^-1 @ E_orth.T
+    (E_orth is required, otherwise the pseudo-inverse is returned).
+
+    If E is (close to) singular, i.e., the reference direction is tangent to
+    the surface, the pseudo-inverse is returned.
+
+    If out (array of shape (dimension, dimension)) is given, the inverse is written
+    to it instead of a new array."""
+    dim = E.shape[0]
+    if out is None:
+        out = np.empty((dim, dim))
+
+    if dim == 2:
+        determinant = E[0, 0] * E[1, 1] - E[0, 1] * E[1, 0]
+        if abs(determinant) <= singular_tolerance:
+            out[:, :] = LA.pinv(E)
+            return out
+
+        out[0, 0] = E[1, 1] / determinant
+        out[0, 1] = -E[0, 1] / determinant
+        out[1, 0] = -E[1, 0] / determinant
+        out[1, 1] = E[0, 0] / determinant
+        return out
+
+    if dim == 3:
+        # Rows of the adjugate are the cross products of the columns (np.cross is
+        # slow for single vectors)
+        (a0, a1, a2), (b0, b1, b2), (c0, c1, c2) = E.T
+        out[0, 0] = b1 * c2 - b2 * c1
+        out[0, 1] = b2 * c0 - b0 * c2
+        out[0, 2] = b0 * c1 - b1 * c0
+        out[1, 0] = c1 * a2 - c2 * a1
+        out[1, 1] = c2 * a0 - c0 * a2
+        out[1, 2] = c0 * a1 - c1 * a0
+        out[2, 0] = a1 * b2 - a2 * b1
+        out[2, 1] = a2 * b0 - a0 * b2
+        out[2, 2] = a0 * b1 - a1 * b0
+        determinant = a0 * out[0, 0] + a1 * out[0, 1] + a2 * out[0, 2]
+        if abs(determinant) <= singular_tolerance:
+            out[:, :] = LA.pinv(E)
+            return out
+
+        out /= determinant
+        return out
+
+    if E_orth is None:
+        out[:, :] = LA.pinv(E)
+        return out
+
+    reference_coeffs = E_orth.T.dot(E[:, 0])
+    # The determinant equals reference_coeffs[0] (up to the sign of E_orth)
+    if abs(reference_coeffs[0]) <= singular_tolerance:
+        out[:, :] = LA.pinv(E)
+        return out
+
+    out[:, :] = E_orth.T
+    out[0, :] = out[0, :] / reference_coeffs[0]
+    out[1:, :] = out[1:, :] - np.outer(reference_coeffs[1:], out[0, :])
+    return out
+
+
+def get_inverse_of_decomposition_matrix_batch(
+    E: np.ndarray,
+    E_orth: Optional[np.ndarray] = None,
+    singular_tolerance: float = 1e-12,
+) -> np.ndarray:
+    """Batched version of 'get_inverse_of_decomposition_matrix' for matrices of
+    shape (dimension, dimension, ...), e.g., (dimension, dimension, n_obstacles,
+    n_points). The inverses are returned with the same shape."""
+    dim = E.shape[0]
+    batch_shape = E.shape[2:]
+    E = E.reshape(dim, dim, -1)
+
+    if dim == 2:
+        determinants = E[0, 0] * E[1, 1] - E[0, 1] * E[1, 0]
+        adjugates = np.array([[E[1, 1], -E[0, 1]], [-E[1, 0], E[0, 0]]])
+
+    elif dim == 3:
+        adjugates = np.stack(
+            (
+                np.cross(E[:, 1], E[:, 2], axis=0),
+                np.cross(E[:, 2], E[:, 0], axis=0),
+                np.cross(E[:, 0], E[:, 1], axis=0),
+            )
+        )
+        determinants = np.sum(E[:, 0] * adjugates[0], axis=0)
+
+    elif E_orth is not None:
+        E_orth = E_orth.reshape(dim, dim, -1)
+        reference_coeffs = np.einsum("jin,jn->in", E_orth, E[:, 0])
+        determinants = reference_coeffs[0]
+
+        # Scaled such that the division by the determinant gives M^-1 @ E_orth.T
+        adjugates = np.swapaxes(E_orth, 0, 1).copy()
+        adjugates[1:] = (
+            determinants * adjugates[1:]
+            - reference_coeffs[1:, np.newaxis, :] * adjugates[0][np.newaxis, :, :]
+        )
+
+    else:
+        E_inv = np.moveaxis(LA.pinv(np.moveaxis(E, 2, 0)), 0, 2)
+        return E_inv.reshape(dim, dim, *batch_shape)
+
+    ind_singular = np.abs(determinants) <= singular_tolerance
+    determinants = np.where(ind_singular, 1, determinants)
+    E_inv = adjugates / determinants
+
+    if np.any(ind_singular):
+        E_inv[:, :, ind_singular] = np.moveaxis(
+            LA.pinv(np.moveaxis(E[:, :, ind_singular], 2, 0)), 0, 2
+        )
+
+    return E_inv.reshape(dim, dim, *batch_shape)
+
+
+def get_directional_weighted_sum_batch(
+    null_directions: np.ndarray,
+    directions: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """Directional weighted sum for many points at once.
+
+    This evaluates 'vartools.directional_space.get_directional_weighted_sum'
+    column-wise without constructing the basis of the null-direction.
+
+    Parameters
+    ----------
+    null_directions: array of shape (dimension, n_points)
+    directions: array of shape (dimension, n_directions, n_points)
+    weights: array of shape (n_directions, n_points)
+
+    Return
+    ------
+    weighted_directions: array of shape (dimension, n_points)
+    """
+    ind_weight = weights > 0
+    weights = weights * ind_weight
+
+    null_directions = null_directions / LA.norm(null_directions, axis=0)
+
+    directions_norm = LA.norm(directions, axis=0)
+    ind_nonzero = directions_norm > 0
+    unit_directions = np.zeros(directions.shape)
+    unit_directions[:, ind_nonzero] = (
+        directions[:, ind_nonzero] / directions_norm[ind_nonzero]
+    )
+
+    # Decompose into null-direction and (normalized) tangent part
+    cos_directions = np.sum(unit_directions * null_directions[:, np.newaxis, :], axis=0)
+    tangents = unit_directions - cos_directions * null_directions[:, np.newaxis, :]
+    tangents_norm = LA.norm(tangents, axis=0)
+    ind_nonzero = tangents_norm > 0
+    tangents[:, ind_nonzero] = tangents[:, ind_nonzero] / tangents_norm[ind_nonzero]
+
+    cos_directions = np.minimum(np.maximum(cos_directions, -1), 1)
+    tangents_sum = np.sum(tangents * (np.arccos(cos_directions) * weights), axis=1)
+    tangents_sum_norm = LA.norm(tangents_sum, axis=0)
+
+    weighted_directions = np.copy(null_directions)
+    ind_nonzero = tangents_sum_norm > 0
+    weighted_directions[:, ind_nonzero] = (
+        np.cos(tangents_sum_norm[ind_nonzero]) * null_directions[:, ind_nonzero]
+        + (np.sin(tangents_sum_norm[ind_nonzero]) / tangents_sum_norm[ind_nonzero])
+        * tangents_sum[:, ind_nonzero]
+    )
+
+    # A single direction with nonzero weight is returned as it is
+    ind_single = np.sum(ind_weight, axis=0) == 1
+    if np.sum(ind_single):
+        it_single = np.argmax(ind_weight[:, ind_single], axis=0)
+        weighted_directions[:, ind_single] = directions[
+            :, it_single, np.arange(weights.shape[1])[ind_single]
+        ]
+
+    return weighted_directions
+
+
 def compute_R(d, th_r):
     warnings.warn("This function will be removed. Don't use it")
     if th_r == 0:
@@ -33,7 +33,7 @@ from dynamic_obstacle_avoidance.avoidance.obs_dynamic_center_3d import (
     get_dynamic_center_obstacles,
 )
 
-from dynamic_obstacle_avoidance.avoidance import obs_avoidance_rk4
+from dynamic_obstacle_avoidance.avoidance import integrate_trajectories_rk4
 
 plt.ion()
 
@@ -58,45 +58,42 @@ def plt_speed_line_and_qolo(
     else:
         fig, ax = fig_and_ax_handle
 
-    dim = 2  # 2-D problem
     if len(points_init.shape) == 1:
         points_init = np.array([points_init]).T
 
     n_points = points_init.shape[1]
+    attractorPos = np.array(attractorPos, dtype=float)
+
+    def linear_dynamics(positions):
+        # Linear system towards the attractor evaluated for all points at once
+        return np.reshape(attractorPos, (-1, 1)) - positions
+
+    trajectories, n_active_steps = integrate_trajectories_rk4(
+        points_init,
+        obs,
+        ds=linear_dynamics,
+        dt=dt,
+        max_simu_step=max_simu_step,
+        attractor_position=attractorPos,
+        convergence_margin=convergence_margin,
+        check_collision=False,
+    )
+
     for j in range(n_points):
-        x_pos = np.zeros((dim, max_simu_step + 1))
-        x_pos[:, 0] = points_init[:, j]
-
-        it_count = 0
-
-        for it_count in range(max_simu_step):
-            x_pos[:, it_count + 1] = obs_avoidance_rk4(
-                dt,
-                x_pos[:, it_count],
-                obs,
-                # x0=attractorPos,
-                obs_avoidance=obs_avoidance_interpolation_moving,
-                ds=LinearSystem(attractor_position=attractorPos).evaluate,
+        x_pos = trajectories[:, : n_active_steps[j] + 1, j]
+
+        if n_active_steps[j] < max_simu_step:
+            print(
+                "Convergence reached after {} iterations.".format(n_active_steps[j] - 1)
             )
 
-            # Check convergence
-            if (
-                np.linalg.norm(x_pos[:, it_count + 1] - attractorPos)
-                < convergence_margin
-            ):
-                x_pos = x_pos[:, : it_count + 2]
-                print("Convergence reached after {} iterations.".format(it_count))
-                break
-
-            if (
-                np.linalg.norm(x_pos[:, it_count + 1] - x_pos[:, it_count])
-                < convergence_margin
-            ):
-                x_pos = x_pos[:, : it_count + 2]
-                print("Stopping at local minimum after {} iterations.".format(it_count))
-                break
-
-            it_count += 1
+        # Trajectories stop at a local minimum
+        ind_stuck = np.flatnonzero(
+            np.linalg.norm(x_pos[:, 1:] - x_pos[:, :-1], axis=0) < convergence_margin
+        )
+        if ind_stuck.shape[0] and ind_stuck[0] < n_active_steps[j] - 1:
+            x_pos = x_pos[:, : ind_stuck[0] + 2]
+            print("Stopping at local minimum after {} iterations.".format(ind_stuck[0]))
 
         if line_color is None:
             magnitude = np.linalg.norm(x_pos[:, :-1] - x_pos[:, 1:], axis=0)
@@ -188,33 +185,26 @@ def plot_streamlines(
 ):
     """Plot streamlines."""
     n_points = np.array(points_init).shape[1]
+    attractorPos = np.array(attractorPos, dtype=float)
+
+    def linear_dynamics(positions):
+        # Linear system towards the attractor evaluated for all points at once
+        return np.reshape(attractorPos, (-1, 1)) - positions
+
+    # Each trajectory stops once it is within the convergence margin
+    x_pos, _ = integrate_trajectories_rk4(
+        points_init,
+        obs,
+        ds=linear_dynamics,
+        dt=dt,
+        max_simu_step=max_simu_step,
+        attractor_position=attractorPos,
+        convergence_margin=np.sqrt(convergence_margin),
+        check_collision=False,
+    )
 
-    x_pos = np.zeros((dim, max_simu_step + 1, n_points))
-    x_pos[:, 0, :] = points_init
-
-    it_count = 0
-    for iSim in range(max_simu_step):
-        for j in range(n_points):
-            x_pos[:, iSim + 1, j] = obs_avoidance_rk4(
-                dt,
-                x_pos[:, iSim, j],
-                obs,
-                obs_avoidance=obs_avoidance_interpolation_moving,
-                ds=LinearSystem(attractor_position=attractorPos).evaluate,
-            )
-
-        # Check convergence
-        if (
-            np.sum(
-                (x_pos[:, iSim + 1, :] - np.tile(attractorPos, (n_points, 1)).T) ** 2
-            )
-            < convergence_margin
-        ):
-            x_pos = x_pos[:, : iSim + 2, :]
-
-            print("Convergence reached after {} iterations.".format(it_count))
-            break
-        it_count += 1
+    if x_pos.shape[1] <= max_simu_step:
+        print("Convergence reached after {} iterations.".format(x_pos.shape[1] - 1))
 
     for j in range(n_points):
         ax.plot(x_pos[0, :, j], x_pos[1, :, j], "--", linewidth=4, color="r")
@@ -23,6 +23,7 @@ from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes as Ellipse
 from dynamic_obstacle_avoidance.containers import ObstacleContainer
 
 from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.simulation import SimulationEngine
 from dynamic_obstacle_avoidance.visualization import plot_obstacles
 
 from vartools.dynamical_systems import LinearSystem
@@ -51,6 +52,15 @@ class DynamicalSystemAnimation(Animator):
             obstacle_environment=self.obstacle_environment,
         )
 
+        # The (headless) engine moves the agent and the obstacles
+        self.simulation_engine = SimulationEngine(
+            obstacle_environment=self.obstacle_environment,
+            avoider=self.dynamic_avoider,
+            dt=self.dt_simulation,
+            check_collision=False,
+        )
+        self.simulation_engine.reset(start_position)
+
         self.position_list = np.zeros((self.dim, self.it_max + 1))
         self.position_list[:, 0] = start_position
 
@@ -61,14 +71,8 @@ class DynamicalSystemAnimation(Animator):
             print(f"it={ii}")
 
         # Here come the main calculation part
-        velocity = self.dynamic_avoider.evaluate(self.position_list[:, ii])
-
-        self.position_list[:, ii + 1] = (
-            velocity * self.dt_simulation + self.position_list[:, ii]
-        )
-
-        # Update obstacles
-        self.obstacle_environment.do_velocity_step(delta_time=self.dt_simulation)
+        self.simulation_engine.step()
+        self.position_list[:, ii + 1] = self.simulation_engine.positions[:, 0]
 
         self.ax.clear()
 
@@ -0,0 +1,135 @@
+"""
+Number of avoider evaluations of the fixed step RK4 and the adaptive Dormand-Prince
+integration needed to reach the same accuracy of the final position.
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance import DormandPrinceIntegrator
+
+
+def get_single_ellipse_scene():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([2.0, 1.0]),
+            orientation=30 * np.pi / 180,
+        )
+    )
+    return obstacle_environment, np.array([3.0, 0.5]), np.array([-3.0, 0.1])
+
+
+def get_mixed_obstacles_scene():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([-1.0, 1.5]),
+            axes_length=np.array([1.5, 2.5]),
+            margin_absolut=0.2,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([2.0, -0.5]),
+            axes_length=np.array([1.0, 2.0]),
+            orientation=-20 * np.pi / 180,
+            margin_absolut=0.2,
+        )
+    )
+    return obstacle_environment, np.array([5.0, 0.0]), np.array([-4.0, 0.5])
+
+
+def get_room_scene():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([12.0, 8.0]),
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.5]),
+            axes_length=np.array([1.5, 2.0]),
+        )
+    )
+    return obstacle_environment, np.array([4.5, 0.0]), np.array([-4.5, 1.0])
+
+
+def integrate_rk4(avoider, position, time_max, n_steps):
+    dt = time_max / n_steps
+    for ii in range(n_steps):
+        k1 = avoider.evaluate(position)
+        k2 = avoider.evaluate(position + 0.5 * dt * k1)
+        k3 = avoider.evaluate(position + 0.5 * dt * k2)
+        k4 = avoider.evaluate(position + dt * k3)
+        position = position + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return position, 4 * n_steps
+
+
+def integrate_adaptive(avoider, position, time_max, tolerance):
+    integrator = DormandPrinceIntegrator(
+        avoider, rtol=tolerance, atol=tolerance, convergence_margin=0
+    )
+    trajectory = integrator.integrate(position, time_max=time_max)
+    return trajectory.positions[:, -1], trajectory.n_evaluations
+
+
+def get_evaluations_for_accuracy(results, accuracy):
+    """Minimum number of evaluations of (error, evaluations)-pairs reaching the
+    accuracy (None if never reached)."""
+    evaluations = [n_eval for error, n_eval in results if error < accuracy]
+    if not len(evaluations):
+        return None
+    return min(evaluations)
+
+
+def main(time_max=6.0, accuracies=[1e-2, 1e-3, 1e-4]):
+    scenes = {
+        "single_ellipse": get_single_ellipse_scene,
+        "mixed_obstacles": get_mixed_obstacles_scene,
+        "room": get_room_scene,
+    }
+
+    for name, get_scene in scenes.items():
+        obstacle_environment, attractor, start_position = get_scene()
+        avoider = ModulationAvoider(
+            initial_dynamics=LinearSystem(attractor_position=attractor),
+            obstacle_environment=obstacle_environment,
+        )
+
+        reference, _ = integrate_adaptive(avoider, start_position, time_max, 1e-11)
+
+        results_rk4 = []
+        for n_steps in [10, 20, 40, 80, 160, 320, 640, 1280]:
+            position, n_eval = integrate_rk4(avoider, start_position, time_max, n_steps)
+            results_rk4.append((LA.norm(position - reference), n_eval))
+
+        results_adaptive = []
+        for tolerance in np.logspace(-2, -9, 15):
+            position, n_eval = integrate_adaptive(
+                avoider, start_position, time_max, tolerance
+            )
+            results_adaptive.append((LA.norm(position - reference), n_eval))
+
+        print(f"Scene: {name}")
+        for accuracy in accuracies:
+            print(
+                f"  error < {accuracy:.0e}: "
+                + f"rk4={get_evaluations_for_accuracy(results_rk4, accuracy)} "
+                + "dormand-prince="
+                + f"{get_evaluations_for_accuracy(results_adaptive, accuracy)} "
+                + "evaluations"
+            )
+
+
+if (__name__) == "__main__":
+    main()
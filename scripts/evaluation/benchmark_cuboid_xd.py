@@ -0,0 +1,72 @@
+"""
+Timing of the point-wise and the batched evaluation of the gamma and the normal
+direction of a cuboid (e.g., joint-limit boxes in joint space).
+"""
+
+import time
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.obstacles import CuboidXd
+
+
+def get_cuboid(dimension):
+    return CuboidXd(
+        center_position=np.zeros(dimension),
+        axes_length=np.linspace(1.0, 2.0, dimension),
+        margin_absolut=0.1,
+    )
+
+
+def benchmark_single(cuboid, positions):
+    """Time per point [s] of the point-wise evaluation."""
+    time_start = time.perf_counter()
+    for ii in range(positions.shape[1]):
+        cuboid.get_gamma(positions[:, ii], in_global_frame=True)
+    time_gamma = time.perf_counter() - time_start
+
+    time_start = time.perf_counter()
+    for ii in range(positions.shape[1]):
+        cuboid.get_normal_direction(positions[:, ii], in_global_frame=True)
+    time_normal = time.perf_counter() - time_start
+
+    return time_gamma / positions.shape[1], time_normal / positions.shape[1]
+
+
+def benchmark_batch(cuboid, positions):
+    """Time per point [s] of the batched evaluation."""
+    time_start = time.perf_counter()
+    cuboid.get_gamma(positions, in_global_frame=True)
+    time_gamma = time.perf_counter() - time_start
+
+    time_start = time.perf_counter()
+    cuboid.get_normal_direction(positions, in_global_frame=True)
+    time_normal = time.perf_counter() - time_start
+
+    return time_gamma / positions.shape[1], time_normal / positions.shape[1]
+
+
+def main(dimensions=[2, 3, 7], n_points=1_000_000, n_points_single=10_000):
+    np.random.seed(0)
+
+    print(f"Time per point [us] ({n_points} points, the point-wise evaluation is")
+    print(f"extrapolated from {n_points_single} points)")
+    for dim in dimensions:
+        cuboid = get_cuboid(dim)
+        positions = np.random.uniform(-2, 2, (dim, n_points))
+
+        single_gamma, single_normal = benchmark_single(
+            cuboid, positions[:, :n_points_single]
+        )
+        batch_gamma, batch_normal = benchmark_batch(cuboid, positions)
+        print(
+            f"dim={dim}: "
+            + f"gamma single={single_gamma*1e6:.2f} batch={batch_gamma*1e6:.3f} "
+            + f"speedup={single_gamma/batch_gamma:.0f}x | "
+            + f"normal single={single_normal*1e6:.2f} batch={batch_normal*1e6:.3f} "
+            + f"speedup={single_normal/batch_normal:.0f}x"
+        )
+
+
+if (__name__) == "__main__":
+    main()
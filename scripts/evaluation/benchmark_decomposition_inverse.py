@@ -0,0 +1,71 @@
+"""
+Timing of the closed-form inverse of the decomposition matrix vs. the pseudo-inverse
+(as used in the point-wise and the batched modulation).
+"""
+
+import timeit
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.utils import get_orthogonal_basis_batch
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix_batch
+
+
+def get_decomposition_matrices(dimension, n_points):
+    E_orth = get_orthogonal_basis_batch(np.random.randn(dimension, n_points))
+    references = np.random.randn(dimension, n_points)
+    E = np.copy(E_orth)
+    E[:, 0, :] = (-1) * references / LA.norm(references, axis=0)
+    return E, E_orth
+
+
+def benchmark_single(dimension, n_repetitions=20000):
+    E, E_orth = get_decomposition_matrices(dimension, n_points=1)
+    E, E_orth = E[:, :, 0], E_orth[:, :, 0]
+
+    time_pinv = timeit.timeit(lambda: LA.pinv(E), number=n_repetitions)
+    time_closed = timeit.timeit(
+        lambda: get_inverse_of_decomposition_matrix(E, E_orth), number=n_repetitions
+    )
+    return time_pinv / n_repetitions, time_closed / n_repetitions
+
+
+def benchmark_batch(dimension, n_obstacles=10, n_points=1000, n_repetitions=20):
+    E, E_orth = get_decomposition_matrices(dimension, n_obstacles * n_points)
+    E = E.reshape(dimension, dimension, n_obstacles, n_points)
+    E_orth = E_orth.reshape(dimension, dimension, n_obstacles, n_points)
+
+    time_pinv = timeit.timeit(
+        lambda: LA.pinv(np.moveaxis(E, (0, 1), (2, 3))), number=n_repetitions
+    )
+    time_closed = timeit.timeit(
+        lambda: get_inverse_of_decomposition_matrix_batch(E, E_orth),
+        number=n_repetitions,
+    )
+    return time_pinv / n_repetitions, time_closed / n_repetitions
+
+
+def main(dimensions=[2, 3, 4, 7]):
+    np.random.seed(0)
+
+    print("Single matrix [us]")
+    for dim in dimensions:
+        time_pinv, time_closed = benchmark_single(dim)
+        print(
+            f"dim={dim}: pinv={time_pinv*1e6:.2f} closed-form={time_closed*1e6:.2f} "
+            + f"speedup={time_pinv/time_closed:.1f}x"
+        )
+
+    print("Batch of 10 obstacles x 1000 points [ms]")
+    for dim in dimensions:
+        time_pinv, time_closed = benchmark_batch(dim)
+        print(
+            f"dim={dim}: pinv={time_pinv*1e3:.2f} closed-form={time_closed*1e3:.2f} "
+            + f"speedup={time_pinv/time_closed:.1f}x"
+        )
+
+
+if (__name__) == "__main__":
+    main()
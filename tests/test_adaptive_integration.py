@@ -0,0 +1,77 @@
+"""
+Test the adaptive (Dormand-Prince) integration of the avoidance dynamics
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance import DormandPrinceIntegrator
+
+
+def get_avoider():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([2.0, 1.0]),
+            orientation=30 * np.pi / 180,
+        )
+    )
+    initial_dynamics = LinearSystem(attractor_position=np.array([3.0, 0.5]))
+    return ModulationAvoider(
+        initial_dynamics=initial_dynamics, obstacle_environment=obstacle_environment
+    )
+
+
+def test_trajectory_around_obstacle():
+    avoider = get_avoider()
+    integrator = DormandPrinceIntegrator(avoider, rtol=1e-6, atol=1e-8)
+
+    trajectory = integrator.integrate(np.array([-3.0, 0.1]), time_max=30.0)
+    assert trajectory.has_converged
+    assert trajectory.n_evaluations == integrator.n_evaluations
+    assert LA.norm(trajectory.positions[:, -1] - np.array([3.0, 0.5])) < 1e-2
+
+    # The trajectory does not enter the obstacle (checked on the dense output)
+    times = np.linspace(0, trajectory.times[-1], 500)
+    positions = trajectory.get_position(times)
+    assert positions.shape == (2, 500)
+    gammas = avoider.obstacle_environment.get_minimum_gamma_of_array(positions)
+    assert np.all(gammas > 1)
+
+    # Dense output agrees with the steps
+    assert np.allclose(trajectory.get_position(trajectory.times), trajectory.positions)
+
+
+def test_step_is_bounded_by_gamma():
+    avoider = get_avoider()
+    integrator = DormandPrinceIntegrator(avoider, rtol=1e-2, atol=1e-2)
+
+    position = np.array([-3.0, 0.1])
+    velocity = avoider.evaluate(position)
+    gamma = avoider.obstacle_environment.get_minimum_gamma(position)
+    max_step = integrator.get_max_step(position, velocity)
+    assert np.isclose(
+        max_step * LA.norm(velocity), integrator.gamma_step_factor * (gamma - 1)
+    )
+
+    trajectory = integrator.integrate(position, time_max=30.0)
+    for ii in range(trajectory.times.shape[0] - 1):
+        step_length = LA.norm(
+            trajectory.positions[:, ii + 1] - trajectory.positions[:, ii]
+        )
+        gamma = avoider.obstacle_environment.get_minimum_gamma(
+            trajectory.positions[:, ii]
+        )
+        # Path length is close to the straight distance of a step
+        assert step_length <= integrator.gamma_step_factor * (gamma - 1) * 1.1 + 1e-3
+
+
+if (__name__) == "__main__":
+    test_trajectory_around_obstacle()
+    test_step_is_bounded_by_gamma()
@@ -0,0 +1,154 @@
+"""
+Test the compiled (structure-of-arrays) environment against the obstacles
+"""
+
+import numpy as np
+
+from scipy.spatial.transform import Rotation
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.containers import CompiledEnvironment
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes as Ellipse
+from dynamic_obstacle_avoidance.obstacles import CuboidXd as Cuboid
+from dynamic_obstacle_avoidance.obstacles import HyperSphere
+
+
+def assert_equal_to_obstacles(obstacle_environment, positions):
+    compiled = CompiledEnvironment(obstacle_environment)
+
+    gammas = compiled.get_gamma(positions)
+    normals = compiled.get_normal_direction(positions)
+    references = compiled.get_reference_direction(positions)
+
+    for oo, obs in enumerate(obstacle_environment):
+        for ii in range(positions.shape[1]):
+            gamma = obs.get_gamma(positions[:, ii], in_global_frame=True)
+            assert np.isclose(gammas[oo, ii], gamma), f"Gamma of obstacle #{oo}"
+
+            normal = obs.get_normal_direction(positions[:, ii], in_global_frame=True)
+            assert np.allclose(normals[:, oo, ii], normal), f"Normal of obstacle #{oo}"
+
+            reference = obs.get_reference_direction(
+                positions[:, ii], in_global_frame=True
+            )
+            assert np.allclose(references[:, oo, ii], reference)
+
+
+def test_mixed_environment_2d():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([1.5, -0.5]),
+            orientation=-10 * np.pi / 180,
+            axes_length=np.array([2.0, 1.0]),
+            margin_absolut=0.2,
+        )
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([-1.5, 0.5]),
+            orientation=30 * np.pi / 180,
+            axes_length=np.array([1.5, 2.5]),
+            distance_scaling=2.0,
+        )
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0, 0]),
+            axes_length=np.array([9.0, 7.0]),
+            margin_absolut=0.1,
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([-2.0, -2.0]),
+            axes_length=np.array([1.0, 1.0]),
+        )
+    )
+
+    x_vals, y_vals = np.meshgrid(np.linspace(-4, 4, 15), np.linspace(-3, 3, 15))
+    positions = np.vstack((x_vals.reshape(1, -1), y_vals.reshape(1, -1)))
+
+    # Add points on the surface (and edges) of the cuboid
+    positions = np.hstack(
+        (positions, np.array([[-2.0, -2.5], [-1.5, -2.0], [-1.5, -1.5]]).T)
+    )
+
+    assert_equal_to_obstacles(obstacle_environment, positions)
+
+
+def test_rotated_environment_3d():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0.5, 0, 0]),
+            orientation=Rotation.from_euler("zyx", [30, 10, 0], degrees=True),
+            axes_length=np.array([1.0, 2.0, 1.5]),
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([-1.0, 1.5, 0.2]),
+            orientation=Rotation.from_euler("x", 20, degrees=True),
+            axes_length=np.array([1.0, 1.0, 2.0]),
+        )
+    )
+
+    np.random.seed(0)
+    positions = np.random.uniform(low=-3, high=3, size=(3, 40))
+
+    assert_equal_to_obstacles(obstacle_environment, positions)
+
+
+def test_hypersphere():
+    dimension = 4
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        HyperSphere(
+            radius=1.5,
+            center_position=np.array([0.5, -0.3, 0.0, 0.2]),
+            margin_absolut=0.2,
+            distance_scaling=2.0,
+        )
+    )
+
+    np.random.seed(1)
+    positions = np.random.uniform(low=-3, high=3, size=(dimension, 20))
+
+    # Add a point inside the sphere
+    positions = np.hstack((positions, np.array([[1.0, 0, 0, 0]]).T))
+
+    assert_equal_to_obstacles(obstacle_environment, positions)
+
+
+def test_update_poses():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(center_position=np.array([0, 0]), axes_length=np.array([1.0, 2.0]))
+    )
+    obstacle_environment.append(
+        Cuboid(center_position=np.array([3.0, 0]), axes_length=np.array([1.0, 2.0]))
+    )
+    compiled = CompiledEnvironment(obstacle_environment)
+
+    position = np.array([1.0, 1.0])
+    gamma_old = compiled.get_gamma(position)
+
+    obstacle_environment[1].center_position = np.array([1.0, 3.0])
+    obstacle_environment[1].orientation = 0.3
+
+    # Snapshot is not changed until the poses are updated
+    assert np.allclose(compiled.get_gamma(position), gamma_old)
+
+    compiled.update_poses(indices=[1])
+    gamma = obstacle_environment[1].get_gamma(position, in_global_frame=True)
+    assert np.isclose(compiled.get_gamma(position)[1, 0], gamma)
+    assert np.isclose(compiled.get_gamma(position)[0, 0], gamma_old[0, 0])
+
+
+if (__name__) == "__main__":
+    test_mixed_environment_2d()
+    test_rotated_environment_3d()
+    test_hypersphere()
+    test_update_poses()
@@ -0,0 +1,181 @@
+"""
+Test the closest points of convex obstacles based on their support mapping
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.obstacles import Ellipse, Cuboid, Polygon
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.obstacles import StarshapedFlower
+from dynamic_obstacle_avoidance.containers import GradientContainer
+from dynamic_obstacle_avoidance.containers.convex_distance import (
+    get_convex_closest_points,
+)
+
+
+def get_surface_points(obstacle, n_points=2000):
+    angles = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    directions = np.vstack((np.cos(angles), np.sin(angles)))
+    return np.array(
+        [
+            obstacle.get_support_point(directions[:, ii], in_global_frame=True)
+            for ii in range(n_points)
+        ]
+    ).T
+
+
+def test_ellipse_and_cuboid():
+    ellipse = Ellipse(
+        center_position=np.array([3.5, 0.5]),
+        axes_length=np.array([1.5, 0.8]),
+        orientation=-0.5,
+        margin_absolut=0.2,
+    )
+    cuboid = Cuboid(
+        center_position=np.array([0.5, 3.0]),
+        axes_length=np.array([1.0, 2.0]),
+        orientation=0.4,
+    )
+
+    distance, point0, point1, n_iterations = get_convex_closest_points(ellipse, cuboid)
+    assert np.isclose(distance, LA.norm(point1 - point0))
+    assert np.isclose(ellipse.get_gamma(point0, in_global_frame=True), 1)
+    assert np.isclose(cuboid.get_gamma(point1, in_global_frame=True), 1)
+
+    # Compare to the sampled surfaces
+    surface0 = get_surface_points(ellipse)
+    surface1 = get_surface_points(cuboid)
+    distances = LA.norm(surface0[:, :, np.newaxis] - surface1[:, np.newaxis, :], axis=0)
+    assert distance <= np.min(distances) + 1e-6
+    assert np.isclose(distance, np.min(distances), atol=1e-3)
+
+    # Starting from the solution converges immediately
+    _, _, _, n_iterations_warm = get_convex_closest_points(
+        ellipse, cuboid, direction=point1 - point0
+    )
+    assert n_iterations_warm < n_iterations
+
+
+def test_intersecting_obstacles():
+    obstacle0 = Ellipse(
+        center_position=np.array([0.0, 0.0]), axes_length=np.array([1.5, 0.8])
+    )
+    obstacle1 = Polygon(
+        edge_points=np.array([[1.0, -3.0], [3.0, -2.0], [1.0, -1.0]]).T,
+        center_position=np.array([1.6, -2.0]),
+    )
+    assert get_convex_closest_points(obstacle0, obstacle1)[0] > 0
+
+    obstacle1.center_position = np.array([1.0, -0.5])
+    distance, point0, point1, _ = get_convex_closest_points(obstacle0, obstacle1)
+    assert distance == 0
+    assert point0 is None and point1 is None
+
+
+def test_obstacles_without_support_mapping():
+    ellipse = Ellipse(
+        center_position=np.array([0.0, 0.0]), axes_length=np.array([1.5, 0.8])
+    )
+    flower = StarshapedFlower(center_position=np.array([4.0, 0.0]))
+    assert get_convex_closest_points(ellipse, flower) is None
+
+    # Curved ellipse (superellipse) is not described by the semi-axes
+    curved_ellipse = Ellipse(
+        center_position=np.array([0.0, 4.0]),
+        axes_length=np.array([1.5, 0.8]),
+        curvature=np.array([2, 2]),
+    )
+    assert get_convex_closest_points(ellipse, curved_ellipse) is None
+
+    # Non-convex polygon
+    polygon = Polygon(
+        edge_points=np.array(
+            [[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [1.5, 0.5], [0.0, 2.0]]
+        ).T,
+        center_position=np.array([1.0, 0.5]),
+    )
+    assert polygon.get_support_point(np.array([1.0, 0.0])) is None
+
+    boundary = Ellipse(
+        center_position=np.array([0.0, 0.0]),
+        axes_length=np.array([5.0, 5.0]),
+        is_boundary=True,
+    )
+    assert get_convex_closest_points(ellipse, boundary) is None
+
+
+def test_obstacles_in_3d():
+    ellipse = EllipseWithAxes(
+        center_position=np.array([0.0, 0.0, 0.0]),
+        axes_length=np.array([1.0, 2.0, 3.0]),
+        margin_absolut=0.1,
+    )
+    cuboid = CuboidXd(
+        center_position=np.array([2.0, 1.0, 0.5]),
+        axes_length=np.array([1.0, 1.0, 1.0]),
+        margin_absolut=0.2,
+    )
+
+    distance, point0, point1, _ = get_convex_closest_points(ellipse, cuboid)
+    assert np.isclose(distance, LA.norm(point1 - point0))
+    assert np.isclose(ellipse.get_gamma(point0, in_obstacle_frame=False), 1)
+    assert np.isclose(cuboid.get_gamma(point1, in_obstacle_frame=False), 1)
+
+    # The connecting line separates the obstacles, i.e., it is along the normals
+    direction = (point1 - point0) / distance
+    normal0 = ellipse.get_normal_direction(point0, in_obstacle_frame=False)
+    assert np.allclose(normal0, direction, atol=1e-3)
+
+    support1 = cuboid.get_support_point((-1) * direction, in_global_frame=True)
+    assert np.isclose(support1.dot(direction), point1.dot(direction), atol=1e-5)
+
+
+def test_closest_points_in_container():
+    obstacle_environment = GradientContainer()
+    obstacle_environment.append(
+        Ellipse(center_position=np.array([0.0, 0.0]), axes_length=np.array([1.0, 1.0]))
+    )
+    obstacle_environment.append(
+        Cuboid(center_position=np.array([4.0, 0.0]), axes_length=np.array([2.0, 3.0]))
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0.5, 3.5]),
+            axes_length=np.array([1.5, 0.8]),
+            orientation=0.3,
+        )
+    )
+    obstacle_environment.update_reference_points(need_for_speed=False)
+    assert obstacle_environment.search_telemetry.n_iterations > 0
+
+    # Exact distance and closest points of the circle and the cuboid
+    assert np.isclose(obstacle_environment.get_distance(0, 1), 2.0, atol=1e-4)
+    assert np.allclose(
+        obstacle_environment.get_boundary_reference_point(0, 1), [1.0, 0], atol=1e-3
+    )
+    assert np.allclose(
+        obstacle_environment.get_boundary_reference_point(1, 0), [3.0, 0], atol=1e-3
+    )
+
+    n_obstacles = len(obstacle_environment)
+    for ii in range(n_obstacles):
+        for jj in range(ii + 1, n_obstacles):
+            distance, point0, point1, _ = get_convex_closest_points(
+                obstacle_environment[ii], obstacle_environment[jj]
+            )
+            assert np.isclose(obstacle_environment.get_distance(ii, jj), distance)
+            assert np.allclose(
+                obstacle_environment.get_boundary_reference_point(ii, jj), point0
+            )
+            assert np.allclose(
+                obstacle_environment.get_boundary_reference_point(jj, ii), point1
+            )
+
+
+if (__name__) == "__main__":
+    test_ellipse_and_cuboid()
+    test_intersecting_obstacles()
+    test_obstacles_without_support_mapping()
+    test_obstacles_in_3d()
+    test_closest_points_in_container()
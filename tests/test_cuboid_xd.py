@@ -187,7 +187,7 @@ def test_surface_position():
         axes_length=np.array([0.4, 0.7]),
     )
     surf_point = cube.get_point_on_surface(position, in_obstacle_frame=True)
-    assert np.allclose(surf_point, [0.2, 0])
+    assert np.allclose(surf_point, [-0.2, 0])
 
 
 def test_normal_direction():
@@ -314,6 +314,75 @@ def test_cube_3d_creation():
     assert np.allclose(cube.orientation.as_euler("xyz"), [0, 0, 0])
 
 
+def test_multiple_positions():
+    for dimension in [2, 3, 7]:
+        for is_boundary in [False, True]:
+            for margin_absolut in [0.0, 0.3]:
+                cube = CuboidXd(
+                    center_position=np.linspace(0.5, -0.5, dimension),
+                    axes_length=np.linspace(2.0, 3.0, dimension),
+                    orientation=(30 * np.pi / 180 if dimension == 2 else None),
+                    margin_absolut=margin_absolut,
+                    is_boundary=is_boundary,
+                )
+
+                np.random.seed(3)
+                semiaxes = cube.semiaxes
+                relative_positions = np.random.uniform(-2, 2, (dimension, 60))
+                relative_positions = relative_positions * semiaxes.reshape(-1, 1)
+                # Center, face, corners, rounded margin and inside
+                relative_positions[:, 0] = 0
+                relative_positions[:, 1] = 0
+                relative_positions[0, 1] = semiaxes[0] + margin_absolut
+                relative_positions[:, 2] = semiaxes + margin_absolut
+                relative_positions[:, 3] = (-1) * semiaxes
+                relative_positions[:, 4] = semiaxes + 0.5 * margin_absolut
+                relative_positions[:, 5] = 0.5 * semiaxes
+                positions = cube.transform_positions_from_relative(relative_positions)
+
+                for in_global_frame, points in [
+                    (True, positions),
+                    (False, relative_positions),
+                ]:
+                    for method in [
+                        cube.get_gamma,
+                        cube.get_normal_direction,
+                        cube.get_point_on_surface,
+                        cube.get_local_radius,
+                    ]:
+                        values = method(points, in_global_frame=in_global_frame)
+                        assert values.shape[-1] == points.shape[1]
+                        for ii in range(points.shape[1]):
+                            assert np.allclose(
+                                values[..., ii],
+                                method(points[:, ii], in_global_frame=in_global_frame),
+                            )
+
+                distances = cube.get_distance_to_surface(relative_positions)
+                for ii in range(relative_positions.shape[1]):
+                    assert np.isclose(
+                        distances[ii],
+                        cube.get_distance_to_surface(relative_positions[:, ii]),
+                    )
+
+                assert np.allclose(
+                    cube.get_normal_direction_array(positions, in_global_frame=True),
+                    cube.get_normal_direction(positions, in_global_frame=True),
+                )
+
+    # Gamma options passed as arguments
+    gamma_kwargs = {
+        "margin_absolut": 0.5,
+        "is_boundary": True,
+        "boundary_power_factor": 2,
+    }
+    gammas = cube.get_gamma(relative_positions, **gamma_kwargs)
+    for ii in range(relative_positions.shape[1]):
+        assert np.isclose(
+            gammas[ii], cube.get_gamma(relative_positions[:, ii], **gamma_kwargs)
+        )
+
+
 if (__name__) == "__main__":
     import matplotlib.pyplot as plt
 
@@ -331,3 +400,4 @@ if (__name__) == "__main__":
     test_normal_direction()
     test_simple_cuboid_with_margin()
     test_3d_cube_far_away()
+    test_multiple_positions()
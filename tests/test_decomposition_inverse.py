@@ -0,0 +1,113 @@
+"""
+Test the closed-form inverse of the decomposition matrix against the pseudo-inverse
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.utils import get_orthogonal_basis_batch
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix_batch
+
+
+def get_decomposition_matrices(normals, references):
+    """Returns E, E_orth of shape (dimension, dimension, n_points)."""
+    E_orth = get_orthogonal_basis_batch(normals)
+    E = np.copy(E_orth)
+    E[:, 0, :] = (-1) * references / LA.norm(references, axis=0)
+    return E, E_orth
+
+
+def get_pinv_batch(E):
+    return np.moveaxis(LA.pinv(np.moveaxis(E, 2, 0)), 0, 2)
+
+
+def assert_inverse_close(E_inv, E_inv_reference, rtol=1e-10):
+    # Tolerance relative to the magnitude of the inverse (which is large close
+    # to the singularity)
+    scale = np.maximum(np.max(np.abs(E_inv_reference), axis=(0, 1)), 1)
+    assert np.all(np.max(np.abs(E_inv - E_inv_reference), axis=(0, 1)) < rtol * scale)
+
+
+def test_inverse_of_random_bases():
+    np.random.seed(0)
+    n_points = 50
+    for dim in [2, 3, 4, 7]:
+        normals = np.random.randn(dim, n_points)
+        references = np.random.randn(dim, n_points)
+        E, E_orth = get_decomposition_matrices(normals, references)
+
+        E_inv_pinv = get_pinv_batch(E)
+        assert_inverse_close(
+            get_inverse_of_decomposition_matrix_batch(E, E_orth), E_inv_pinv
+        )
+
+        for ii in range(n_points):
+            E_inv = get_inverse_of_decomposition_matrix(E[:, :, ii], E_orth[:, :, ii])
+            assert np.allclose(E_inv.dot(E[:, :, ii]), np.eye(dim))
+            assert_inverse_close(E_inv[:, :, np.newaxis], E_inv_pinv[:, :, ii : ii + 1])
+
+
+def test_near_singular_bases():
+    """The reference direction is (close to) tangent to the surface."""
+    np.random.seed(1)
+    n_points = 20
+    for dim in [2, 3, 5]:
+        normals = np.random.randn(dim, n_points)
+        E_orth = get_orthogonal_basis_batch(normals)
+
+        # Reference along the first tangent with a small normal component
+        normal_component = np.logspace(-2, -9, n_points)
+        references = E_orth[:, 1, :] - normal_component[np.newaxis, :] * E_orth[:, 0, :]
+        E, E_orth = get_decomposition_matrices(normals, references)
+
+        # The relative accuracy of the inverse is limited by the condition
+        E_inv = get_inverse_of_decomposition_matrix_batch(E, E_orth)
+        assert_inverse_close(E_inv, get_pinv_batch(E), rtol=1e-6)
+
+        for ii in range(n_points):
+            assert_inverse_close(
+                get_inverse_of_decomposition_matrix(E[:, :, ii], E_orth[:, :, ii])[
+                    :, :, np.newaxis
+                ],
+                E_inv[:, :, ii : ii + 1],
+                rtol=1e-6,
+            )
+
+
+def test_singular_bases():
+    """Exactly singular matrices fall back to the pseudo-inverse."""
+    np.random.seed(2)
+    for dim in [2, 3, 4]:
+        normals = np.random.randn(dim, 3)
+        E_orth = get_orthogonal_basis_batch(normals)
+        E, E_orth = get_decomposition_matrices(normals, E_orth[:, 1, :])
+
+        E_inv = get_inverse_of_decomposition_matrix_batch(E, E_orth)
+        assert np.all(np.isfinite(E_inv))
+        assert np.allclose(E_inv, get_pinv_batch(E))
+        assert np.allclose(
+            get_inverse_of_decomposition_matrix(E[:, :, 0], E_orth[:, :, 0]),
+            E_inv[:, :, 0],
+        )
+
+
+def test_batch_shape():
+    np.random.seed(3)
+    normals = np.random.randn(3, 8)
+    references = np.random.randn(3, 8)
+    E, E_orth = get_decomposition_matrices(normals, references)
+
+    # Shape (dimension, dimension, n_obstacles, n_points) is kept
+    E_inv = get_inverse_of_decomposition_matrix_batch(
+        E.reshape(3, 3, 2, 4), E_orth.reshape(3, 3, 2, 4)
+    )
+    assert E_inv.shape == (3, 3, 2, 4)
+    assert np.allclose(E_inv.reshape(3, 3, 8), get_pinv_batch(E))
+
+
+if (__name__) == "__main__":
+    test_inverse_of_random_bases()
+    test_near_singular_bases()
+    test_singular_bases()
+    test_batch_shape()
@@ -0,0 +1,90 @@
+"""
+Test the (packed) symmetric distance and intersection matrices
+"""
+
+import numpy as np
+import pytest
+
+from dynamic_obstacle_avoidance.avoidance.obs_common_section import (
+    DistanceMatrix,
+    IntersectionMatrix,
+)
+
+
+def test_bulk_access_equals_single_access():
+    n_obs = 9
+    distance_matrix = DistanceMatrix(n_obs=n_obs)
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 5, (n_obs, n_obs))
+    values = values + values.T
+
+    rows, cols = np.triu_indices(n_obs, k=1)
+    # The lower triangle is symmetric
+    distance_matrix[cols, rows] = values[cols, rows]
+    for ii, jj in zip(rows, cols):
+        assert distance_matrix[int(ii), int(jj)] == values[ii, jj]
+        assert distance_matrix[int(jj), int(ii)] == values[ii, jj]
+
+    assert np.allclose(distance_matrix[rows, cols], values[rows, cols])
+    matrix = distance_matrix.get_matrix()
+    assert np.allclose(matrix[rows, cols], values[rows, cols])
+    assert np.allclose(matrix, matrix.T)
+    assert np.all(np.diag(matrix) == 0)
+
+    # The stored values follow the upper triangle
+    list_indexes = distance_matrix.get_index(rows, cols)
+    assert np.all(list_indexes == np.arange(rows.shape[0]))
+
+    # Negative indexes as for lists
+    assert distance_matrix[-1, 0] == distance_matrix[n_obs - 1, 0]
+
+    with pytest.raises(RuntimeError):
+        distance_matrix[2, 2]
+    with pytest.raises(RuntimeError):
+        distance_matrix[np.array([0, 1]), np.array([n_obs, 2])]
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_intersection_matrix(sparse):
+    n_obs = 6
+    intersections = IntersectionMatrix(n_obs=n_obs, dim=3, sparse=sparse)
+    assert intersections.get(1, 2) is None
+    assert not np.any(intersections.get_bool_matrix())
+
+    intersections.set(4, 1, np.array([1.0, 2.0, 3.0]))
+    intersections[0, 2] = np.array([0.0, -1.0, 0.5])
+    assert intersections.is_intersecting(1, 4)
+    assert np.allclose(intersections.get(1, 4), [1.0, 2.0, 3.0])
+
+    # Bulk access
+    rows = np.array([3, 5, 0])
+    cols = np.array([5, 2, 2])
+    points = np.array([[1.0, 2.0, 0.0], [0.0, 0.0, -1.0], [4.0, 4.0, 0.5]])
+    intersections.set_points(rows[:2], cols[:2], points[:, :2])
+    assert np.all(intersections.is_intersecting(rows, cols))
+    assert np.allclose(intersections[rows, cols], points)
+
+    pairs = intersections.get_intersecting_pairs()
+    assert pairs.tolist() == [[0, 2], [1, 4], [2, 5], [3, 5]]
+
+    bool_matrix = intersections.get_bool_matrix()
+    assert np.sum(bool_matrix) == 2 * pairs.shape[0]
+    assert bool_matrix[4, 1] and bool_matrix[1, 4] and not bool_matrix[1, 2]
+
+    intersection_matrix = intersections.get_intersection_matrix()
+    assert intersection_matrix.shape == (3, n_obs, n_obs)
+    assert np.allclose(intersection_matrix[:, 5, 3], [1.0, 0.0, 4.0])
+    assert np.allclose(intersection_matrix[:, 1, 2], 0)
+
+    # Removing intersections
+    intersections[1, 4] = None
+    intersections.reset(np.array([3]), np.array([5]))
+    assert intersections.get(4, 1) is None
+    assert intersections.get_intersecting_pairs().tolist() == [[0, 2], [2, 5]]
+    assert np.all(np.isnan(intersections.get_points(np.array([1]), np.array([4]))))
+
+
+if (__name__) == "__main__":
+    test_bulk_access_equals_single_access()
+    test_intersection_matrix(sparse=False)
+    test_intersection_matrix(sparse=True)
@@ -283,6 +283,72 @@ def test_zero_scaling():
         )
 
 
+def test_gamma_and_normal_for_multiple_positions():
+    for dimension in [2, 3]:
+        for is_boundary in [False, True]:
+            for margin_absolut in [0.0, 0.2]:
+                obstacle = EllipseWithAxes(
+                    center_position=np.linspace(0.5, -0.5, dimension),
+                    axes_length=np.linspace(2.0, 4.0, dimension),
+                    orientation=(40 * np.pi / 180 if dimension == 2 else None),
+                    margin_absolut=margin_absolut,
+                    is_boundary=is_boundary,
+                    distance_scaling=1.5,
+                )
+
+                np.random.seed(2)
+                positions = np.random.uniform(-4, 4, (dimension, 50))
+                # Center and a point on the surface (with margin)
+                positions[:, 0] = obstacle.center_position
+                surface_point = np.zeros((dimension, 1))
+                surface_point[0] = obstacle.semiaxes[0] + margin_absolut
+                positions[:, 1:2] = obstacle.transform_positions_from_relative(
+                    surface_point
+                )
+
+                relative_positions = obstacle.transform_positions_to_relative(positions)
+                for in_global_frame, points in [
+                    (True, positions),
+                    (False, relative_positions),
+                ]:
+                    for method in [
+                        obstacle.get_gamma,
+                        obstacle.get_normal_direction,
+                        obstacle.get_point_on_surface,
+                        obstacle.get_local_radius,
+                    ]:
+                        values = method(points, in_global_frame=in_global_frame)
+                        assert values.shape[-1] == points.shape[1]
+                        for ii in range(points.shape[1]):
+                            assert np.allclose(
+                                values[..., ii],
+                                method(points[:, ii], in_global_frame=in_global_frame),
+                                rtol=1e-12,
+                                atol=1e-14,
+                            )
+
+                assert np.allclose(
+                    obstacle.get_gamma_array(positions, in_global_frame=True),
+                    obstacle.get_gamma(positions, in_global_frame=True),
+                )
+                assert np.allclose(
+                    obstacle.get_normal_direction_array(
+                        positions, in_global_frame=True
+                    ),
+                    obstacle.get_normal_direction(positions, in_global_frame=True),
+                )
+
+    # Margin passed as an argument
+    gammas = obstacle.get_gamma(positions, in_global_frame=True, margin_absolut=0.5)
+    for ii in range(positions.shape[1]):
+        assert np.isclose(
+            gammas[ii],
+            obstacle.get_gamma(
+                positions[:, ii], in_global_frame=True, margin_absolut=0.5
+            ),
+        )
+
+
 def test_surface_intersection():
     obs_parent = EllipseWithAxes(
         center_position=np.array([0.0, 0.0]),
@@ -318,5 +384,6 @@ if (__name__) == "__main__":
     # test_gamma_for_general_ellipse(visualize=True)
     # test_zero_scaling()
 
+    test_gamma_and_normal_for_multiple_positions()
     test_surface_intersection()
     print("Tests done.")
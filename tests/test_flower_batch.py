@@ -0,0 +1,71 @@
+"""
+Test the evaluation of star-shaped flowers for many positions at once
+"""
+
+import sys
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.obstacles import StarshapedFlower
+
+
+def get_flowers():
+    flowers = []
+    for is_boundary in [False, True]:
+        for distance_scaling in [1.0, 2.0]:
+            flowers.append(
+                StarshapedFlower(
+                    center_position=np.array([0.5, -1.0]),
+                    radius_magnitude=0.4,
+                    number_of_edges=5,
+                    radius_mean=1.5,
+                    orientation=20 * np.pi / 180,
+                    is_boundary=is_boundary,
+                    distance_scaling=distance_scaling,
+                )
+            )
+    return flowers
+
+
+def test_batch_equals_single():
+    positions = np.random.default_rng(3).uniform(-4, 4, (2, 60))
+    for flower in get_flowers():
+        # Center and a point on the surface
+        positions[:, 0] = flower.center_position
+        positions[:, 1] = flower.get_intersection_with_surface(
+            flower.center_position, np.array([1.0, 0.0]), in_global_frame=True
+        )
+
+        gammas = flower.get_gamma(positions, in_global_frame=True)
+        normals = flower.get_normal_direction(positions, in_global_frame=True)
+        assert gammas.shape == (positions.shape[1],)
+        assert normals.shape == positions.shape
+
+        assert np.allclose(
+            flower.get_gamma_array(positions, in_global_frame=True), gammas
+        )
+        assert np.allclose(
+            flower.get_normal_direction_array(positions, in_global_frame=True),
+            normals,
+        )
+
+        for ii in range(positions.shape[1]):
+            assert np.isclose(
+                gammas[ii],
+                flower.get_gamma(positions[:, ii], in_global_frame=True),
+                rtol=1e-12,
+            )
+            assert np.allclose(
+                normals[:, ii],
+                flower.get_normal_direction(positions[:, ii], in_global_frame=True),
+            )
+
+        if flower.is_boundary:
+            assert gammas[0] == sys.float_info.max
+        else:
+            assert gammas[0] == 0
+        assert np.isclose(gammas[1], 1)
+
+
+if (__name__) == "__main__":
+    test_batch_equals_single()
@@ -0,0 +1,116 @@
+"""
+Test the vectorized gamma of the obstacles and the container gamma matrix
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd, Polygon
+
+
+def get_mixed_environment():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([2.0, 1.0]),
+            axes_length=np.array([3.0, 1.5]),
+            orientation=30 * np.pi / 180,
+            margin_absolut=0.3,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([-3.0, -1.0]),
+            axes_length=np.array([2.0, 3.0]),
+            orientation=-50 * np.pi / 180,
+            margin_absolut=0.4,
+            distance_scaling=2.0,
+        )
+    )
+    # Without vectorized gamma (point-wise fallback)
+    obstacle_environment.append(
+        Polygon(
+            edge_points=np.array([[0.0, -5.0], [3.0, -5.0], [1.0, -2.5]]).T,
+            center_position=np.array([1.0, -4.0]),
+        )
+    )
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([16.0, 14.0]),
+            margin_absolut=0.5,
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([0.5, 0.0]),
+            axes_length=np.array([15.0, 13.0]),
+            margin_absolut=0.2,
+            is_boundary=True,
+        )
+    )
+    return obstacle_environment
+
+
+def test_gamma_matrix_of_mixed_environment():
+    obstacle_environment = get_mixed_environment()
+
+    np.random.seed(0)
+    positions = np.random.uniform(low=-9, high=9, size=(2, 200))
+    # Include the centers
+    positions = np.hstack(
+        (positions, np.array([obs.center_position for obs in obstacle_environment]).T)
+    )
+
+    gamma_matrix = obstacle_environment.get_gamma_matrix(positions)
+    assert gamma_matrix.shape == (len(obstacle_environment), positions.shape[1])
+
+    for jj in range(positions.shape[1]):
+        for ii, obs in enumerate(obstacle_environment):
+            gamma = obs.get_gamma(positions[:, jj], in_global_frame=True)
+            assert np.isclose(gamma_matrix[ii, jj], gamma)
+
+        assert np.isclose(
+            obstacle_environment.get_minimum_gamma_of_array(positions)[jj],
+            obstacle_environment.get_minimum_gamma(positions[:, jj]),
+        )
+
+    collisions = obstacle_environment.check_collision_array(positions)
+    assert np.any(collisions) and not np.all(collisions)
+    for jj in range(positions.shape[1]):
+        assert collisions[jj] == obstacle_environment.is_position_colliding(
+            positions[:, jj]
+        )
+
+
+def test_gamma_array_in_higher_dimensions():
+    dimension = 5
+    obstacles = [
+        EllipseWithAxes(
+            center_position=np.ones(dimension),
+            axes_length=np.arange(1, dimension + 1),
+            margin_absolut=0.2,
+        ),
+        CuboidXd(
+            center_position=np.ones(dimension),
+            axes_length=np.arange(1, dimension + 1),
+            margin_absolut=0.2,
+        ),
+    ]
+
+    np.random.seed(1)
+    positions = np.random.uniform(low=-4, high=4, size=(dimension, 100))
+    for obs in obstacles:
+        gammas = obs.get_gamma_array(positions, in_global_frame=True)
+        relative_positions = positions - obs.center_position.reshape(-1, 1)
+        for jj in range(positions.shape[1]):
+            assert np.isclose(
+                gammas[jj],
+                obs.get_gamma(relative_positions[:, jj], in_global_frame=False),
+            )
+
+
+if (__name__) == "__main__":
+    test_gamma_matrix_of_mixed_environment()
+    test_gamma_array_in_higher_dimensions()
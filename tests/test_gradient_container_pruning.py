@@ -0,0 +1,114 @@
+"""
+Test the broad phase of the reference point search of the gradient container
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.obstacles import Ellipse
+from dynamic_obstacle_avoidance.containers import GradientContainer
+
+
+def get_environment(n_obstacles=20, seed=0):
+    rng = np.random.default_rng(seed)
+    obstacle_environment = GradientContainer()
+    for ii in range(n_obstacles):
+        obstacle_environment.append(
+            Ellipse(
+                center_position=rng.uniform(-8, 8, 2),
+                axes_length=np.array([1.5, 0.8]),
+                orientation=rng.uniform(-np.pi, np.pi),
+            )
+        )
+    return obstacle_environment
+
+
+def test_far_pairs_are_pruned():
+    obstacle_environment = get_environment()
+    distance_max = 3
+
+    candidate_pairs = obstacle_environment.get_candidate_pairs(distance_max)
+    candidate_set = set(map(tuple, candidate_pairs.tolist()))
+    assert len(candidate_set) < len(obstacle_environment) ** 2 / 4
+
+    # Evaluate all pairs
+    obstacle_environment.update_reference_points(distance_max=distance_max)
+    obstacle_environment.update_boundary_reference_points()
+
+    for ii in range(len(obstacle_environment)):
+        for jj in range(ii + 1, len(obstacle_environment)):
+            if (ii, jj) in candidate_set:
+                continue
+            # Very far pairs are skipped in the search itself (distance=-1)
+            distance = obstacle_environment.get_distance(ii, jj)
+            assert distance < 0 or distance >= distance_max
+
+
+def get_reference_points_without_pruning(obstacle_environment):
+    # Evaluate all pairs
+    n_obstacles = len(obstacle_environment)
+    obstacle_environment.get_candidate_pairs = lambda distance_max: np.array(
+        np.triu_indices(n_obstacles, k=1)
+    ).T
+    obstacle_environment.update_reference_points()
+    return [obs.global_reference_point for obs in obstacle_environment]
+
+
+def test_reference_points_equal_without_pruning():
+    obstacle_environment = get_environment()
+    obstacle_environment.update_reference_points()
+
+    reference_points = get_reference_points_without_pruning(get_environment())
+    for obs, reference_point in zip(obstacle_environment, reference_points):
+        assert np.allclose(obs.global_reference_point, reference_point)
+
+
+def test_close_obstacles_without_intersection():
+    def get_close_environment():
+        obstacle_environment = GradientContainer()
+        for center_position in [[0.0, 0.0], [2.0, 0.3], [12.0, 0.0]]:
+            obstacle_environment.append(
+                Ellipse(
+                    center_position=np.array(center_position),
+                    axes_length=np.array([0.8, 0.5]),
+                )
+            )
+        return obstacle_environment
+
+    obstacle_environment = get_close_environment()
+    obstacle_environment.update_reference_points()
+    assert 0 < obstacle_environment.get_distance(0, 1) < 1
+    assert not obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+
+    # The reference points are pulled towards the close obstacle (but stay inside)
+    obs0, obs1, obs_far = obstacle_environment
+    direction = obs1.center_position - obs0.center_position
+    assert np.dot(obs0.global_reference_point - obs0.center_position, direction) > 0
+    assert np.dot(obs1.global_reference_point - obs1.center_position, direction) < 0
+    assert np.allclose(obs_far.global_reference_point, obs_far.center_position)
+    for obs in obstacle_environment:
+        assert obs.get_gamma(obs.global_reference_point, in_global_frame=True) < 1
+
+    reference_points = get_reference_points_without_pruning(get_close_environment())
+    for obs, reference_point in zip(obstacle_environment, reference_points):
+        assert np.allclose(obs.global_reference_point, reference_point)
+
+
+def test_pruned_distances_are_reset():
+    obstacle_environment = get_environment(n_obstacles=2)
+    obstacle_environment[0].center_position = np.array([0.0, 0.0])
+    obstacle_environment[1].center_position = np.array([4.0, 0.0])
+
+    obstacle_environment.update_reference_points()
+    assert obstacle_environment.get_distance(0, 1) > 0
+
+    obstacle_environment[1].center_position = np.array([20.0, 0.0])
+    obstacle_environment.update_reference_points()
+    assert obstacle_environment.get_distance(0, 1) == -1
+    assert not len(obstacle_environment.get_candidate_pairs())
+
+
+if (__name__) == "__main__":
+    test_far_pairs_are_pruned()
+    test_reference_points_equal_without_pruning()
+    test_close_obstacles_without_intersection()
+    test_pruned_distances_are_reset()
@@ -0,0 +1,164 @@
+"""
+Test the warm-started closest point search of the gradient container
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.obstacles import Ellipse
+from dynamic_obstacle_avoidance.containers import GradientContainer
+
+
+def get_environment():
+    obstacle_environment = GradientContainer()
+    for center_position, orientation in [
+        ([0.0, 0.0], 0.0),
+        ([3.5, 0.5], 30),
+        ([0.0, 3.0], -20),
+        ([-3.5, 1.0], 60),
+    ]:
+        obstacle_environment.append(
+            Ellipse(
+                center_position=np.array(center_position),
+                axes_length=np.array([1.5, 0.8]),
+                orientation=orientation * np.pi / 180,
+            )
+        )
+    return obstacle_environment
+
+
+def move_obstacles(obstacle_environment, displacement):
+    for obs in obstacle_environment:
+        obs.center_position = obs.center_position + displacement
+        obs.orientation = obs.orientation + 0.01
+        obs.has_moved = True
+
+
+def test_warm_start_after_small_motion():
+    obstacle_environment = get_environment()
+    obstacle_environment.update_reference_points(need_for_speed=False)
+
+    telemetry = obstacle_environment.search_telemetry
+    n_searches = telemetry.n_searches
+    n_iterations_cold = telemetry.n_iterations
+    assert n_searches > 0 and telemetry.n_warm_starts == 0
+    assert n_iterations_cold > 0
+
+    displacement = np.array([0.003, -0.002])
+    move_obstacles(obstacle_environment, displacement)
+    obstacle_environment.update_reference_points(need_for_speed=False)
+
+    assert telemetry.n_searches == 2 * n_searches
+    assert telemetry.n_warm_starts == n_searches
+    assert telemetry.n_iterations - n_iterations_cold < n_iterations_cold
+    assert telemetry.n_iterations_saved > 0
+
+    # Same result as a cold-started search
+    obstacle_environment_cold = get_environment()
+    move_obstacles(obstacle_environment_cold, displacement)
+    obstacle_environment_cold.update_reference_points(need_for_speed=False)
+
+    n_obstacles = len(obstacle_environment)
+    for ii in range(n_obstacles):
+        for jj in range(ii + 1, n_obstacles):
+            assert np.isclose(
+                obstacle_environment.get_distance(ii, jj),
+                obstacle_environment_cold.get_distance(ii, jj),
+                atol=1e-2,
+            )
+
+
+def test_unmoved_pairs_are_skipped():
+    obstacle_environment = get_environment()
+    # Intersecting obstacle
+    obstacle_environment[1].center_position = np.array([1.0, 0.5])
+    obstacle_environment.update_reference_points()
+
+    telemetry = obstacle_environment.search_telemetry
+    n_searches = telemetry.n_searches
+    distances = np.copy(obstacle_environment._distance_matrix._value_list)
+    reference_points = [obs.global_reference_point for obs in obstacle_environment]
+    assert obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+
+    obstacle_environment.update_reference_points()
+    assert telemetry.n_searches == n_searches
+    assert telemetry.n_pairs_skipped == n_searches
+    assert np.allclose(obstacle_environment._distance_matrix._value_list, distances)
+    assert obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+    for obs, reference_point in zip(obstacle_environment, reference_points):
+        assert np.allclose(obs.global_reference_point, reference_point)
+
+    # Only the pairs with the moved obstacle are evaluated again
+    obstacle_environment[3].has_moved = True
+    obstacle_environment.update_reference_points()
+    n_pairs_obstacle = np.sum(
+        np.any(obstacle_environment.get_candidate_pairs() == 3, axis=1)
+    )
+    assert telemetry.n_searches == n_searches + n_pairs_obstacle
+
+
+def test_moved_obstacles_without_flag_are_updated():
+    for move_with_velocity in [False, True]:
+        obstacle_environment = GradientContainer()
+        for center_position in [[0.0, 0.0], [4.0, 0.0]]:
+            obstacle_environment.append(
+                Ellipse(
+                    center_position=np.array(center_position),
+                    axes_length=np.array([1.0, 1.0]),
+                )
+            )
+        obstacle_environment.update_reference_points()
+        assert np.isclose(obstacle_environment.get_distance(0, 1), 2.0)
+        assert not obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+
+        # Move the obstacle onto the other one without setting 'has_moved'
+        if move_with_velocity:
+            obstacle_environment[1].linear_velocity = np.array([-3.5, 0.0])
+            obstacle_environment.do_velocity_step(delta_time=1.0)
+        else:
+            obstacle_environment[1].center_position = np.array([0.5, 0.0])
+
+        obstacle_environment.update_reference_points()
+        assert obstacle_environment.get_distance(0, 1) == 0
+        assert obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+
+    # Moving the obstacle in-place is detected, too
+    obstacle_environment[1].center_position[0] = 4.0
+    obstacle_environment.update_reference_points()
+    assert np.isclose(obstacle_environment.get_distance(0, 1), 2.0)
+    assert not obstacle_environment.intersection_matrix.is_intersecting(0, 1)
+
+
+def test_search_states_after_removal():
+    for key in [-1, 3, slice(1, 3), slice(None, None, 2)]:
+        obstacle_environment = get_environment()
+        obstacle_environment[1].center_position = np.array([1.0, 0.5])
+        obstacle_environment.update_reference_points()
+
+        n_obstacles = len(obstacle_environment)
+        remaining = list(range(n_obstacles))
+        del remaining[key]
+        search_states = {
+            pair: obstacle_environment._pair_search_states.get(pair)
+            for pair in zip(*np.triu_indices(n_obstacles, k=1))
+        }
+
+        del obstacle_environment[key]
+        assert len(obstacle_environment) == len(remaining)
+        for (ii, jj), search_state in obstacle_environment._pair_search_states.items():
+            assert 0 <= ii < jj < len(obstacle_environment)
+            assert search_state is search_states[(remaining[ii], remaining[jj])]
+
+        # The remaining (unmoved) pairs keep their intersections
+        obstacle_environment.update_reference_points()
+        for ii in range(len(remaining)):
+            for jj in range(ii + 1, len(remaining)):
+                assert obstacle_environment.intersection_matrix.is_intersecting(
+                    ii, jj
+                ) == ((remaining[ii], remaining[jj]) == (0, 1))
+
+
+if (__name__) == "__main__":
+    test_warm_start_after_small_motion()
+    test_unmoved_pairs_are_skipped()
+    test_moved_obstacles_without_flag_are_updated()
+    test_search_states_after_removal()
@@ -0,0 +1,145 @@
+"""
+Test the culling of far obstacles in the modulation
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd, Polygon
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+
+
+def test_bounding_radius():
+    obstacles = [
+        EllipseWithAxes(
+            center_position=np.zeros(2),
+            axes_length=np.array([3.0, 1.0]),
+            curvature=2,
+            margin_absolut=0.3,
+        ),
+        CuboidXd(
+            center_position=np.zeros(2),
+            axes_length=np.array([2.0, 1.0]),
+            margin_absolut=0.2,
+        ),
+        Polygon(
+            edge_points=np.array([[-1.0, -1.0], [2.0, -1.0], [0.0, 1.5]]).T,
+            center_position=np.zeros(2),
+        ),
+    ]
+
+    angles = np.linspace(0, 2 * np.pi, 50)
+    for obstacle in obstacles:
+        bounding_radius = obstacle.get_bounding_radius()
+        for angle in angles:
+            # Points outside the bounding radius are outside the obstacle
+            position = np.array([np.cos(angle), np.sin(angle)]) * (
+                bounding_radius * 1.001
+            )
+            assert obstacle.get_gamma(position, in_global_frame=False) > 1
+
+
+def get_grid_environment(n_x=20, n_y=15):
+    obstacle_environment = ObstacleContainer()
+    for ix in range(n_x):
+        for iy in range(n_y):
+            obstacle_environment.append(
+                CuboidXd(
+                    center_position=np.array([ix * 4.0, iy * 4.0]),
+                    axes_length=np.array([1.0, 1.5]),
+                    margin_absolut=0.1,
+                )
+            )
+    return obstacle_environment
+
+
+def test_culled_modulation():
+    obstacle_environment = get_grid_environment()
+    position = np.array([9.0, 11.0])
+    velocity = np.array([1.0, 0.3])
+    influence_distance = 3.0
+
+    main_avoider = ModulationAvoider(
+        obstacle_environment=obstacle_environment,
+        influence_distance=influence_distance,
+    )
+    velocity_culled = main_avoider.avoid(position, velocity)
+
+    # Compare to the local environment only
+    local_obstacles = [
+        obs
+        for obs in obstacle_environment
+        if LA.norm(position - obs.center_position) - obs.get_bounding_radius()
+        <= influence_distance
+    ]
+    assert 0 < len(local_obstacles) < len(obstacle_environment)
+    assert main_avoider.n_culled_obstacles == len(obstacle_environment) - len(
+        local_obstacles
+    )
+
+    velocity_local = obs_avoidance_interpolation_moving(
+        position, velocity, local_obstacles
+    )
+    assert np.allclose(velocity_culled, velocity_local)
+
+
+def test_all_obstacles_culled():
+    obstacle_environment = get_grid_environment(n_x=2, n_y=2)
+    position = np.array([-20.0, -20.0])
+    velocity = np.array([1.0, 0.3])
+
+    velocity_culled = obs_avoidance_interpolation_moving(
+        position, velocity, obstacle_environment, influence_distance=1.0
+    )
+    assert np.allclose(velocity_culled, velocity)
+
+    # Boundaries are never culled
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.zeros(2),
+            axes_length=np.array([50.0, 50.0]),
+            is_boundary=True,
+        )
+    )
+    main_avoider = ModulationAvoider(
+        obstacle_environment=obstacle_environment, influence_distance=1.0
+    )
+    main_avoider.avoid(position, velocity)
+    assert main_avoider.n_culled_obstacles == 4
+
+
+def test_culled_batch_equals_single():
+    obstacle_environment = get_grid_environment(n_x=4, n_y=3)
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([6.0, 4.0]),
+            axes_length=np.array([30.0, 25.0]),
+            is_boundary=True,
+        )
+    )
+    main_avoider = ModulationAvoider(
+        obstacle_environment=obstacle_environment, influence_distance=1.5
+    )
+
+    np.random.seed(4)
+    positions = np.random.uniform(low=[-2, -2], high=[14, 10], size=(20, 2)).T
+    velocities = np.random.uniform(low=-1, high=1, size=positions.shape)
+
+    velocities_batch = main_avoider.avoid_batch(positions, velocities)
+    n_culled = np.zeros(positions.shape[1])
+    for ii in range(positions.shape[1]):
+        velocity = main_avoider.avoid(positions[:, ii], velocities[:, ii])
+        assert np.allclose(velocities_batch[:, ii], velocity), f"Point #{ii}"
+        n_culled[ii] = main_avoider.n_culled_obstacles
+
+    # Different obstacles are culled for different points
+    assert np.all(n_culled > 0) and np.unique(n_culled).shape[0] > 1
+
+
+if (__name__) == "__main__":
+    test_bounding_radius()
+    test_culled_modulation()
+    test_all_obstacles_culled()
+    test_culled_batch_equals_single()
@@ -0,0 +1,90 @@
+"""
+Test the union-find clustering of intersecting obstacles
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.avoidance.obs_common_section import (
+    IntersectionClusters,
+    IntersectionMatrix,
+)
+
+
+def get_clusters_by_propagation(n_obstacles, intersecting_pairs, index_wall=None):
+    """Reference clustering by propagating the (dense) intersection matrix."""
+    intersection_matrix = np.zeros((n_obstacles, n_obstacles), dtype=bool)
+    for ii, jj in intersecting_pairs:
+        intersection_matrix[ii, jj] = intersection_matrix[jj, ii] = True
+
+    obstacles = [
+        ii
+        for ii in range(n_obstacles)
+        if np.any(intersection_matrix[ii, :]) and ii != index_wall
+    ]
+    if index_wall is not None:
+        intersection_matrix_wall = intersection_matrix[:, index_wall].copy()
+        intersection_matrix[:, index_wall] = intersection_matrix[index_wall, :] = False
+
+    clusters = []
+    while len(obstacles):
+        cluster = {obstacles[0]}
+        new_obstacles = True
+        while new_obstacles:
+            neighbours = set(
+                np.flatnonzero(np.any(intersection_matrix[list(cluster), :], axis=0))
+            )
+            new_obstacles = len(neighbours - cluster) > 0
+            cluster = cluster | neighbours
+
+        clusters.append(sorted(int(ii) for ii in cluster))
+        if index_wall is not None and np.any(intersection_matrix_wall[clusters[-1]]):
+            clusters[-1].append(index_wall)
+        obstacles = [ii for ii in obstacles if ii not in cluster]
+
+    return clusters
+
+
+def test_clusters_of_intersection_matrix():
+    intersections = IntersectionMatrix(n_obs=7)
+    intersections.set(0, 3, np.zeros(2))
+    intersections.set(5, 3, np.zeros(2))
+    intersections.set(1, 4, np.zeros(2))
+
+    intersecting_pairs = intersections.get_intersecting_pairs()
+    assert sorted(map(tuple, intersecting_pairs.tolist())) == [(0, 3), (1, 4), (3, 5)]
+
+    clusters = IntersectionClusters(n_obstacles=7)
+    clusters.update(intersecting_pairs)
+    assert clusters.get_clusters() == [[0, 3, 5], [1, 4]]
+    assert clusters.is_same_cluster(0, 5)
+    assert not clusters.is_same_cluster(0, 4)
+    assert not clusters.is_intersecting(2)
+
+
+def test_wall_does_not_merge_clusters():
+    clusters = IntersectionClusters(n_obstacles=6)
+    clusters.update(np.array([[0, 1], [1, 5], [2, 5], [3, 4]]), index_wall=5)
+    assert clusters.get_clusters() == [[0, 1, 5], [2, 5], [3, 4]]
+
+
+def test_incremental_updates_equal_propagation():
+    n_obstacles = 15
+    rng = np.random.default_rng(1)
+    all_pairs = np.array(np.triu_indices(n_obstacles, k=1)).T
+
+    clusters = IntersectionClusters(n_obstacles)
+    for it in range(30):
+        index_wall = None if it < 15 else 2
+        is_intersecting = rng.uniform(size=all_pairs.shape[0]) < 0.08
+        intersecting_pairs = all_pairs[is_intersecting, :]
+
+        clusters.update(intersecting_pairs, index_wall=index_wall)
+        assert clusters.get_clusters() == get_clusters_by_propagation(
+            n_obstacles, intersecting_pairs, index_wall=index_wall
+        )
+
+
+if (__name__) == "__main__":
+    test_clusters_of_intersection_matrix()
+    test_wall_does_not_merge_clusters()
+    test_incremental_updates_equal_propagation()
@@ -0,0 +1,146 @@
+"""
+Test the fused local-geometry query against the separate evaluations
+"""
+
+import numpy as np
+
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.obstacles import Ellipse, Polygon
+
+
+def assert_geometry_equals_separate(obstacle, positions, in_global_frame=True):
+    for ii in range(positions.shape[1]):
+        position = positions[:, ii]
+        geometry = obstacle.get_local_geometry(
+            position, in_global_frame=in_global_frame
+        )
+
+        gamma = obstacle.get_gamma(position, in_global_frame=in_global_frame)
+        normal = obstacle.get_normal_direction(
+            position, in_global_frame=in_global_frame
+        )
+        reference = obstacle.get_reference_direction(
+            position, in_global_frame=in_global_frame
+        )
+
+        assert np.isclose(geometry.gamma, gamma), f"Gamma at {position}"
+        assert np.allclose(geometry.normal, normal), f"Normal at {position}"
+        assert np.allclose(
+            geometry.reference_direction, reference
+        ), f"Reference at {position}"
+
+
+def test_ellipse_xd_geometry():
+    obstacle = EllipseWithAxes(
+        center_position=np.array([1.0, -0.5]),
+        orientation=30 * np.pi / 180,
+        axes_length=np.array([2.0, 1.0]),
+        margin_absolut=0.2,
+    )
+    np.random.seed(0)
+    positions = np.random.uniform(low=-3, high=3, size=(2, 40))
+    assert_geometry_equals_separate(obstacle, positions)
+    assert_geometry_equals_separate(obstacle, positions, in_global_frame=False)
+
+    # The surface point has gamma equal to one
+    geometry = obstacle.get_local_geometry(positions[:, 0], in_global_frame=True)
+    assert np.isclose(
+        obstacle.get_gamma(geometry.surface_point, in_global_frame=True), 1
+    )
+
+
+def test_cuboid_xd_geometry():
+    obstacle = CuboidXd(
+        center_position=np.array([0.5, 0.3]),
+        orientation=20 * np.pi / 180,
+        axes_length=np.array([2.0, 1.2]),
+        margin_absolut=0.1,
+    )
+    np.random.seed(1)
+    positions = np.random.uniform(low=-3, high=3, size=(2, 40))
+    assert_geometry_equals_separate(obstacle, positions)
+
+    # The surface point lies in direction of the position (also for negative axes)
+    obstacle = CuboidXd(
+        center_position=np.array([0.0, 0.0]),
+        axes_length=np.array([2.0, 2.0]),
+        margin_absolut=0.5,
+    )
+    geometry = obstacle.get_local_geometry(np.array([-3.0, 0.5]))
+    assert np.allclose(geometry.surface_point, [-1.5, 0.25])
+    geometry = obstacle.get_local_geometry(np.array([0.5, -3.0]))
+    assert np.allclose(geometry.surface_point, [0.25, -1.5])
+
+    for ii in range(positions.shape[1]):
+        geometry = obstacle.get_local_geometry(positions[:, ii])
+        assert np.dot(geometry.surface_point, positions[:, ii]) > 0
+
+    surface_points = obstacle.get_point_on_surface(positions, in_obstacle_frame=True)
+    assert np.all(np.sum(surface_points * positions, axis=0) > 0)
+
+    boundary = CuboidXd(
+        center_position=np.array([0.5, 0.3]),
+        orientation=20 * np.pi / 180,
+        axes_length=np.array([8.0, 7.0]),
+        is_boundary=True,
+    )
+    assert_geometry_equals_separate(boundary, positions)
+
+
+def test_cuboid_xd_gamma_in_global_frame():
+    obstacle = CuboidXd(
+        center_position=np.array([3.0, 2.0]),
+        axes_length=np.array([2.0, 2.0]),
+    )
+    position = np.array([3.5, 2.0])
+    gamma_global = obstacle.get_gamma(position, in_global_frame=True)
+    gamma_local = obstacle.get_gamma(
+        obstacle.pose.transform_position_to_relative(position),
+        in_global_frame=False,
+    )
+    assert np.isclose(gamma_global, gamma_local)
+    assert gamma_global < 1
+
+
+def test_legacy_ellipse_geometry():
+    obstacle = Ellipse(
+        center_position=np.array([-1.0, 0.5]),
+        orientation=-40 * np.pi / 180,
+        axes_length=np.array([1.5, 0.8]),
+    )
+    np.random.seed(2)
+    positions = np.random.uniform(low=-3, high=3, size=(2, 40))
+    assert_geometry_equals_separate(obstacle, positions)
+    assert_geometry_equals_separate(obstacle, positions, in_global_frame=False)
+
+    geometry = obstacle.get_local_geometry(positions[:, 0], in_global_frame=True)
+    assert np.isclose(
+        obstacle.get_gamma(geometry.surface_point, in_global_frame=True), 1
+    )
+
+    curved_obstacle = Ellipse(
+        center_position=np.array([-1.0, 0.5]),
+        axes_length=np.array([1.5, 0.8]),
+        curvature=np.array([2, 2]),
+        margin_absolut=0.1,
+    )
+    assert_geometry_equals_separate(curved_obstacle, positions)
+
+
+def test_polygon_geometry():
+    obstacle = Polygon(
+        edge_points=np.array([[-1.0, -1.0], [2.0, -1.0], [0.0, 1.5]]).T,
+        center_position=np.array([0.5, 0.5]),
+        orientation=45 * np.pi / 180,
+    )
+    np.random.seed(3)
+    positions = np.random.uniform(low=-3, high=3, size=(2, 30))
+    assert_geometry_equals_separate(obstacle, positions)
+
+
+if (__name__) == "__main__":
+    test_ellipse_xd_geometry()
+    test_cuboid_xd_geometry()
+    test_cuboid_xd_gamma_in_global_frame()
+    test_legacy_ellipse_geometry()
+    test_polygon_geometry()
@@ -0,0 +1,155 @@
+"""
+Test the batched modulation against the point-wise evaluation
+"""
+
+import numpy as np
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes as Ellipse
+from dynamic_obstacle_avoidance.obstacles import CuboidXd as Cuboid
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+from dynamic_obstacle_avoidance.avoidance import (
+    obs_avoidance_interpolation_moving_batch,
+)
+
+
+def get_grid_positions(x_lim=[-4, 4], y_lim=[-3, 3], n_resolution=12):
+    x_vals, y_vals = np.meshgrid(
+        np.linspace(x_lim[0], x_lim[1], n_resolution),
+        np.linspace(y_lim[0], y_lim[1], n_resolution),
+    )
+    return np.vstack((x_vals.reshape(1, -1), y_vals.reshape(1, -1)))
+
+
+def assert_batch_equals_pointwise(obstacle_environment, positions, velocities):
+    velocities_batch = obs_avoidance_interpolation_moving_batch(
+        positions, velocities, obstacle_environment
+    )
+
+    for ii in range(positions.shape[1]):
+        velocity = obs_avoidance_interpolation_moving(
+            positions[:, ii], velocities[:, ii], obstacle_environment
+        )
+        assert np.allclose(velocities_batch[:, ii], velocity), (
+            f"Batch evaluation differs at position={positions[:, ii]}: "
+            + f"{velocities_batch[:, ii]} instead of {velocity}"
+        )
+
+
+def test_two_obstacles_2d():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([-1.5, 0.5]),
+            orientation=30 * np.pi / 180,
+            axes_length=np.array([1.5, 2.5]),
+            tail_effect=False,
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([1.5, -0.5]),
+            orientation=-10 * np.pi / 180,
+            axes_length=np.array([2.0, 1.0]),
+            linear_velocity=np.array([-0.5, 0.2]),
+            angular_velocity=0.3,
+            margin_absolut=0.2,
+        )
+    )
+
+    initial_dynamics = LinearSystem(attractor_position=np.array([3.5, 2.0]))
+    avoider = ModulationAvoider(
+        initial_dynamics=initial_dynamics, obstacle_environment=obstacle_environment
+    )
+
+    positions = get_grid_positions()
+    velocities = np.zeros(positions.shape)
+    for ii in range(positions.shape[1]):
+        velocities[:, ii] = initial_dynamics.evaluate(positions[:, ii])
+
+    assert_batch_equals_pointwise(obstacle_environment, positions, velocities)
+
+    velocities_batch = avoider.avoid_batch(positions, velocities)
+    assert velocities_batch.shape == positions.shape
+
+
+def test_boundary_and_repulsion_2d():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0, 0]),
+            axes_length=np.array([9.0, 7.0]),
+            is_boundary=True,
+        )
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([1.0, 0.5]),
+            axes_length=np.array([1.0, 1.5]),
+            repulsion_coeff=2.0,
+            tail_effect=False,
+        )
+    )
+
+    positions = get_grid_positions(x_lim=[-3.5, 3.5], y_lim=[-2.5, 2.5])
+    velocities = np.tile(np.array([1.0, 0.3]), (positions.shape[1], 1)).T
+
+    assert_batch_equals_pointwise(obstacle_environment, positions, velocities)
+
+
+def test_single_obstacle_3d():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0.5, 0, 0]),
+            axes_length=np.array([1.0, 2.0, 1.5]),
+            linear_velocity=np.array([0.0, 0.2, 0.0]),
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([-1.0, 1.5, 0.2]),
+            axes_length=np.array([1.0, 1.0, 1.0]),
+        )
+    )
+
+    np.random.seed(2)
+    positions = np.random.uniform(low=-3, high=3, size=(3, 50))
+    velocities = np.random.uniform(low=-1, high=1, size=(3, 50))
+
+    assert_batch_equals_pointwise(obstacle_environment, positions, velocities)
+
+
+def test_reference_direction_batch():
+    obstacle = Ellipse(
+        center_position=np.array([1.0, -0.5]),
+        axes_length=np.array([2.0, 1.0]),
+        orientation=30 * np.pi / 180,
+    )
+    obstacle.set_reference_point(np.array([1.5, -0.5]), in_global_frame=True)
+
+    positions = get_grid_positions()
+    # At the reference point
+    positions[:, 0] = obstacle.global_reference_point
+
+    for in_global_frame in [True, False]:
+        references = obstacle.get_reference_direction_array(
+            positions, in_global_frame=in_global_frame
+        )
+        for ii in range(positions.shape[1]):
+            assert np.allclose(
+                references[:, ii],
+                obstacle.get_reference_direction(
+                    positions[:, ii], in_global_frame=in_global_frame
+                ),
+            )
+
+
+if (__name__) == "__main__":
+    test_two_obstacles_2d()
+    test_boundary_and_repulsion_2d()
+    test_single_obstacle_3d()
+    test_reference_direction_batch()
@@ -0,0 +1,111 @@
+"""
+Test the per-stage profiling of the modulation
+"""
+
+import numpy as np
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes as Ellipse
+from dynamic_obstacle_avoidance.obstacles import CuboidXd as Cuboid
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.avoidance import ModulationProfiler
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+from dynamic_obstacle_avoidance.avoidance.profiling import get_active_profiler
+
+
+def get_environment():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([1.0, 2.0]),
+        )
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([3.0, 3.0]),
+            axes_length=np.array([1.0, 1.0]),
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([-2.0, 3.0]),
+            axes_length=np.array([1.0, 1.0]),
+            orientation=0.3,
+        )
+    )
+    return obstacle_environment
+
+
+def test_profiler_counters():
+    obstacle_environment = get_environment()
+    position = np.array([-1.5, 1.0])
+    velocity = np.array([1.0, 0.0])
+
+    velocity_reference = obs_avoidance_interpolation_moving(
+        position, velocity, obstacle_environment
+    )
+
+    profiler = ModulationProfiler()
+    n_evaluations = 5
+    for it in range(n_evaluations):
+        modulated_velocity = obs_avoidance_interpolation_moving(
+            position, velocity, obstacle_environment, profiler=profiler
+        )
+    assert np.allclose(modulated_velocity, velocity_reference)
+
+    assert profiler.n_evaluations == n_evaluations
+    for stage in ["local_geometry", "decomposition", "stretching"]:
+        assert profiler.n_calls[stage] == 3 * n_evaluations
+        assert profiler.obstacle_n_calls[(stage, "EllipseWithAxes")] == (
+            2 * n_evaluations
+        )
+        assert profiler.obstacle_n_calls[(stage, "CuboidXd")] == n_evaluations
+        assert np.isclose(
+            profiler.wall_time[stage],
+            profiler.obstacle_wall_time[(stage, "EllipseWithAxes")]
+            + profiler.obstacle_wall_time[(stage, "CuboidXd")],
+        )
+
+    for stage in ["weights", "relative_velocity", "weighted_sum"]:
+        assert profiler.n_calls[stage] == n_evaluations
+
+    counters = profiler.get_counters()
+    assert counters["n_evaluations"] == n_evaluations
+    assert counters["local_geometry.CuboidXd.n_calls"] == n_evaluations
+    assert counters["weighted_sum.wall_time"] > 0
+
+    table = profiler.get_summary_table()
+    assert all(stage in table for stage in ModulationProfiler.stages)
+    assert "CuboidXd" in table
+
+    profiler.reset()
+    assert not profiler.n_evaluations and not profiler.total_time
+
+
+def test_profiler_context():
+    avoider = ModulationAvoider(
+        initial_dynamics=LinearSystem(attractor_position=np.array([4.0, 0.0])),
+        obstacle_environment=get_environment(),
+    )
+    position = np.array([-1.5, 1.0])
+
+    assert get_active_profiler() is None
+    with ModulationProfiler() as profiler:
+        assert get_active_profiler() is profiler
+        avoider.evaluate(position)
+        avoider.evaluate(position)
+
+    assert get_active_profiler() is None
+    assert profiler.n_evaluations == 2
+
+    # Nothing is recorded outside of the context
+    avoider.evaluate(position)
+    assert profiler.n_evaluations == 2
+
+
+if (__name__) == "__main__":
+    test_profiler_counters()
+    test_profiler_context()
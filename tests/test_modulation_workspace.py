@@ -0,0 +1,164 @@
+"""
+Test the reuse of the preallocated modulation buffers
+"""
+
+import tracemalloc
+import warnings
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes as Ellipse
+from dynamic_obstacle_avoidance.obstacles import CuboidXd as Cuboid
+from dynamic_obstacle_avoidance.avoidance import ModulationWorkspace
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+from dynamic_obstacle_avoidance.avoidance.modulation import (
+    compute_diagonal_matrix,
+    compute_diagonal_eigenvalues,
+    compute_decomposition_matrix,
+)
+from dynamic_obstacle_avoidance.utils import get_inverse_of_decomposition_matrix
+
+
+def test_diagonal_eigenvalues():
+    for gamma in [0.5, 1.0, 1.3, 10.0]:
+        for isometric in [True, False]:
+            matrix = compute_diagonal_matrix(
+                gamma,
+                3,
+                repulsion_coeff=2.0,
+                rho=1.5,
+                tangent_eigenvalue_isometric=isometric,
+            )
+
+            eigenvalues = np.zeros((3, 2))
+            compute_diagonal_eigenvalues(
+                gamma,
+                3,
+                repulsion_coeff=2.0,
+                rho=1.5,
+                tangent_eigenvalue_isometric=isometric,
+                out=eigenvalues[:, 1],
+            )
+            assert np.allclose(np.diag(matrix), eigenvalues[:, 1])
+            assert np.allclose(eigenvalues[:, 0], 0)
+
+
+def test_reused_workspace():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([-1.0, 0.5]),
+            axes_length=np.array([1.0, 2.0]),
+            orientation=30 * np.pi / 180,
+            linear_velocity=np.array([0.5, 0.2]),
+        )
+    )
+    obstacle_environment.append(
+        Cuboid(
+            center_position=np.array([2.0, -0.5]),
+            axes_length=np.array([1.0, 1.5]),
+            repulsion_coeff=2.0,
+        )
+    )
+    obstacle_environment.append(
+        Ellipse(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([12.0, 10.0]),
+            is_boundary=True,
+        )
+    )
+
+    # Started too small, to ensure growing of the buffers
+    workspace = ModulationWorkspace(dimension=2, max_obstacles=1)
+
+    np.random.seed(0)
+    positions = np.random.uniform(low=-4, high=4, size=(2, 30))
+    velocities = np.random.uniform(low=-1, high=1, size=(2, 30))
+    for n_obs in [3, 1, 2]:
+        obstacles = obstacle_environment[:n_obs]
+        for ii in range(positions.shape[1]):
+            velocity = obs_avoidance_interpolation_moving(
+                positions[:, ii], velocities[:, ii], obstacles
+            )
+            with warnings.catch_warnings():
+                # Growing the buffers does not warn
+                warnings.simplefilter("error")
+                velocity_workspace = obs_avoidance_interpolation_moving(
+                    positions[:, ii], velocities[:, ii], obstacles, workspace=workspace
+                )
+            assert np.allclose(velocity, velocity_workspace)
+
+    assert workspace.max_obstacles == 3
+    assert workspace.n_allocations == 2
+
+    # The views are reused as long as the number of obstacles does not change
+    buffers = workspace.get_buffers(2)
+    assert workspace.get_buffers(2) is buffers
+    assert buffers["E"].base is workspace.E
+
+
+def test_decomposition_into_buffers():
+    obstacle = Ellipse(
+        center_position=np.array([0.5, 0.2, -0.3]),
+        axes_length=np.array([1.0, 2.0, 1.5]),
+    )
+    position = np.array([1.5, 1.0, 0.4])
+    E, E_orth = compute_decomposition_matrix(obstacle, position, in_global_frame=True)
+
+    E_buffer = np.zeros((3, 3, 2))
+    E_orth_buffer = np.zeros((3, 3, 2))
+    compute_decomposition_matrix(
+        obstacle,
+        position,
+        in_global_frame=True,
+        out=(E_buffer[:, :, 1], E_orth_buffer[:, :, 1]),
+    )
+    assert np.allclose(E_buffer[:, :, 1], E) and np.allclose(E_buffer[:, :, 0], 0)
+    assert np.allclose(E_orth_buffer[:, :, 1], E_orth)
+
+    E_inv = np.zeros((3, 3))
+    assert get_inverse_of_decomposition_matrix(E, E_orth, out=E_inv) is E_inv
+    assert np.allclose(E_inv, LA.inv(E))
+
+
+def get_peak_memory_of_evaluation(n_obstacles):
+    obstacles = [
+        Ellipse(
+            center_position=np.array([3.0 * ii, 2.0]),
+            axes_length=np.array([1.0, 0.5]),
+            linear_velocity=np.array([0.1, 0.0]),
+        )
+        for ii in range(n_obstacles)
+    ]
+    workspace = ModulationWorkspace(dimension=2, max_obstacles=n_obstacles)
+    position = np.array([1.0, 0.3])
+    velocity = np.array([1.0, 0.2])
+    obs_avoidance_interpolation_moving(
+        position, velocity, obstacles, workspace=workspace
+    )
+
+    tracemalloc.start()
+    memory_start = tracemalloc.get_traced_memory()[0]
+    obs_avoidance_interpolation_moving(
+        position, velocity, obstacles, workspace=workspace
+    )
+    memory_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return memory_peak - memory_start
+
+
+def test_evaluation_memory_with_workspace():
+    # The per-obstacle results are stored in the workspace, i.e., only few
+    # (small) temporary arrays scale with the number of obstacles
+    n_obstacles = [5, 40]
+    memory = [get_peak_memory_of_evaluation(nn) for nn in n_obstacles]
+    assert (memory[1] - memory[0]) / (n_obstacles[1] - n_obstacles[0]) < 200
+
+
+if (__name__) == "__main__":
+    test_diagonal_eigenvalues()
+    test_reused_workspace()
+    test_decomposition_into_buffers()
+    test_evaluation_memory_with_workspace()
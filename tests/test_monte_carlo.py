@@ -0,0 +1,188 @@
+"""
+Test the (parallel) Monte-Carlo rollouts
+"""
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.simulation import SerializedEnvironment
+from dynamic_obstacle_avoidance.simulation import Scenario, MonteCarloRunner
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+
+
+def get_random_scenario(rng):
+    obstacle_environment = ObstacleContainer()
+    for ii in range(3):
+        obstacle_environment.append(
+            EllipseWithAxes(
+                center_position=rng.uniform(low=-2, high=2, size=2),
+                axes_length=rng.uniform(low=0.5, high=1.5, size=2),
+                orientation=rng.uniform(low=-np.pi, high=np.pi),
+                margin_absolut=0.1,
+            )
+        )
+
+    start_positions = np.vstack((np.full(4, -5.0), rng.uniform(low=-3, high=3, size=4)))
+    return Scenario(
+        environment=obstacle_environment,
+        attractor_position=np.array([5.0, 0.0]),
+        start_positions=start_positions,
+    )
+
+
+def test_serialized_environment():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([1.0, -1.0]),
+            axes_length=np.array([2.0, 1.0]),
+            orientation=0.4,
+            curvature=2,
+            margin_absolut=0.2,
+            linear_velocity=np.array([0.5, 0.0]),
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([10.0, 8.0]),
+            is_boundary=True,
+            distance_scaling=2.0,
+        )
+    )
+
+    environment = SerializedEnvironment.from_environment(obstacle_environment)
+    assert environment.n_obstacles == 2
+    restored_environment = environment.to_environment()
+
+    np.random.seed(0)
+    positions = np.random.uniform(low=-5, high=5, size=(2, 50))
+    assert np.allclose(
+        restored_environment.get_gamma_matrix(positions),
+        obstacle_environment.get_gamma_matrix(positions),
+    )
+    assert np.allclose(restored_environment[0].linear_velocity, [0.5, 0.0])
+    assert restored_environment[0].curvature == 2
+    assert restored_environment[1].is_boundary
+
+    # Three dimensional
+    obstacle_3d = EllipseWithAxes(
+        center_position=np.array([1.0, 0.0, 0.5]),
+        axes_length=np.array([2.0, 1.0, 1.5]),
+        orientation=Rotation.from_euler("zyx", [0.3, 0.2, -0.1]),
+    )
+    restored_3d = SerializedEnvironment.from_environment([obstacle_3d]).to_environment()
+    positions = np.random.uniform(low=-3, high=3, size=(3, 20))
+    assert np.allclose(
+        restored_3d[0].get_gamma_array(positions, in_global_frame=True),
+        obstacle_3d.get_gamma_array(positions, in_global_frame=True),
+    )
+
+
+def test_serialized_modulation_parameters():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.5]),
+            axes_length=np.array([2.0, 1.0]),
+            orientation=0.3,
+            reactivity=3.0,
+            repulsion_coeff=2.0,
+            tail_effect=False,
+            has_sticky_surface=False,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([3.0, -1.0]),
+            axes_length=np.array([1.0, 1.5]),
+            reactivity=0.5,
+        )
+    )
+
+    restored_environment = SerializedEnvironment.from_environment(
+        obstacle_environment
+    ).to_environment()
+    for obs, restored_obs in zip(obstacle_environment, restored_environment):
+        assert restored_obs.reactivity == obs.reactivity
+        assert restored_obs.has_sticky_surface == obs.has_sticky_surface
+        assert restored_obs.is_non_starshaped == obs.is_non_starshaped
+
+    np.random.seed(1)
+    positions = np.random.uniform(low=-4, high=4, size=(2, 40))
+    velocities = np.tile(np.array([[1.0], [0.2]]), (1, positions.shape[1]))
+    for ii in range(positions.shape[1]):
+        if obstacle_environment.get_minimum_gamma(positions[:, ii]) <= 1:
+            continue
+        assert np.allclose(
+            obs_avoidance_interpolation_moving(
+                positions[:, ii], velocities[:, ii], restored_environment
+            ),
+            obs_avoidance_interpolation_moving(
+                positions[:, ii], velocities[:, ii], obstacle_environment
+            ),
+        )
+
+
+def test_reproducible_over_worker_counts():
+    settings = {"dt": 0.1, "n_steps": 150}
+
+    completed_tasks = []
+    statistics_serial = MonteCarloRunner(n_workers=0, seed=3, **settings).run(
+        get_random_scenario,
+        n_tasks=6,
+        callback=lambda ii, result, stats: completed_tasks.append(ii),
+    )
+    assert completed_tasks == list(range(6))
+    assert statistics_serial.n_agents == 24
+    assert statistics_serial.n_converged > 0
+
+    for n_workers in [1, 3]:
+        statistics = MonteCarloRunner(n_workers=n_workers, seed=3, **settings).run(
+            get_random_scenario, n_tasks=6
+        )
+        for name in ["has_converged", "minimum_gamma", "path_length"]:
+            assert np.array_equal(
+                statistics.get_array(name), statistics_serial.get_array(name)
+            )
+        assert np.allclose(
+            statistics.get_array("time_to_goal"),
+            statistics_serial.get_array("time_to_goal"),
+            equal_nan=True,
+        )
+
+    # Different seed leads to different scenarios
+    statistics = MonteCarloRunner(n_workers=0, seed=4, **settings).run(
+        get_random_scenario, n_tasks=6
+    )
+    assert not np.array_equal(
+        statistics.get_array("path_length"), statistics_serial.get_array("path_length")
+    )
+
+
+def test_metrics_of_scenario():
+    scenario = get_random_scenario(np.random.default_rng(0))
+    statistics = MonteCarloRunner(n_workers=0, dt=0.1, n_steps=300).run(
+        scenarios=[scenario]
+    )
+
+    has_converged = statistics.get_array("has_converged")
+    time_to_goal = statistics.get_array("time_to_goal")
+    assert np.all(np.isnan(time_to_goal) == np.logical_not(has_converged))
+
+    # Path is at least the straight line
+    distances = np.linalg.norm(
+        scenario.start_positions - scenario.attractor_position.reshape(-1, 1), axis=0
+    )
+    path_length = statistics.get_array("path_length")
+    assert np.all(path_length[has_converged] >= distances[has_converged] - 0.05)
+    assert np.all(statistics.get_array("minimum_gamma") > 1)
+
+
+if (__name__) == "__main__":
+    test_serialized_environment()
+    test_serialized_modulation_parameters()
+    test_reproducible_over_worker_counts()
+    test_metrics_of_scenario()
@@ -0,0 +1,130 @@
+"""
+Test the prediction of the obstacle pose within an integration step
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_rk4_batch
+from dynamic_obstacle_avoidance.avoidance import (
+    obs_avoidance_interpolation_moving_batch,
+)
+from dynamic_obstacle_avoidance.simulation import SimulationEngine
+
+
+def get_moving_environment():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.5]),
+            axes_length=np.array([1.0, 2.0]),
+            orientation=20 * np.pi / 180,
+            linear_velocity=np.array([-1.0, 0.5]),
+            angular_velocity=1.0,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([2.0, -2.0]),
+            axes_length=np.array([1.0, 1.0]),
+        )
+    )
+    return obstacle_environment
+
+
+def test_pose_at_time_equals_velocity_step():
+    obstacle_environment = get_moving_environment()
+    obstacle = obstacle_environment[0]
+    position = np.copy(obstacle.position)
+    orientation = obstacle.orientation
+
+    delta_time = 0.3
+    pose = obstacle.get_pose_at_time(delta_time)
+    moved_obstacle = obstacle.get_obstacle_at_time(delta_time)
+
+    # The obstacle itself is not moved
+    assert np.allclose(obstacle.position, position)
+    assert np.isclose(obstacle.orientation, orientation)
+    assert np.allclose(moved_obstacle.position, pose.position)
+
+    obstacle.do_velocity_step(delta_time)
+    assert np.allclose(obstacle.position, pose.position)
+    assert np.isclose(obstacle.orientation, pose.orientation)
+
+    position = np.array([1.2, 0.3])
+    assert np.isclose(
+        obstacle.get_gamma(position, in_global_frame=True),
+        moved_obstacle.get_gamma(position, in_global_frame=True),
+    )
+
+    # Static obstacle keeps its pose
+    obstacle = obstacle_environment[1]
+    moved_obstacles = obstacle_environment.get_obstacles_at_time(delta_time)
+    assert np.allclose(moved_obstacles[1].position, obstacle.position)
+    assert moved_obstacles[1].pose.orientation is obstacle.pose.orientation
+
+
+def test_rk4_with_obstacle_motion():
+    obstacle_environment = get_moving_environment()
+    initial_dynamics = LinearSystem(attractor_position=np.array([4.0, 0.0]))
+
+    def dynamics(positions):
+        return np.array(
+            [
+                initial_dynamics.evaluate(positions[:, ii])
+                for ii in range(positions.shape[1])
+            ]
+        ).T
+
+    positions_init = np.array([[-2.5, 0.0], [-2.0, 1.5], [-2.5, -1.0]]).T
+    time_max = 0.8
+
+    def integrate(dt, consider_obstacle_motion):
+        obstacles = [obs.get_obstacle_at_time(0.0) for obs in obstacle_environment]
+        positions = np.copy(positions_init)
+        for it in range(int(round(time_max / dt))):
+            positions = obs_avoidance_rk4_batch(
+                dt,
+                positions,
+                obstacles,
+                ds=dynamics,
+                obs_avoidance=obs_avoidance_interpolation_moving_batch,
+                consider_obstacle_motion=consider_obstacle_motion,
+            )
+            for obs in obstacles:
+                obs.do_velocity_step(dt)
+        return positions
+
+    reference = integrate(dt=0.01, consider_obstacle_motion=True)
+    error_static = LA.norm(integrate(0.2, False) - reference)
+    error_motion = LA.norm(integrate(0.2, True) - reference)
+    assert error_motion < error_static
+
+    # The obstacles of the environment have not been moved
+    assert np.allclose(obstacle_environment[0].position, [0.0, 0.5])
+
+
+def test_simulation_engine_with_obstacle_motion():
+    obstacle_environment = get_moving_environment()
+    engine = SimulationEngine(
+        obstacle_environment,
+        initial_dynamics=LinearSystem(attractor_position=np.array([4.0, 0.0])),
+        integrator="rk4",
+        dt=0.1,
+        consider_obstacle_motion=True,
+    )
+    result = engine.run(np.array([[-2.5, 0.0], [-2.0, 1.5]]).T, n_steps=5)
+
+    assert result.positions.shape == (2, 6, 2)
+    assert engine.avoider.obstacle_environment is obstacle_environment
+    assert np.allclose(obstacle_environment[0].position, [-0.5, 0.75])
+
+
+if (__name__) == "__main__":
+    test_pose_at_time_equals_velocity_step()
+    test_rk4_with_obstacle_motion()
+    test_simulation_engine_with_obstacle_motion()
@@ -0,0 +1,110 @@
+"""
+Test the (shapely-free) local radius of the polygon against the shapely intersection
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+import shapely
+
+from dynamic_obstacle_avoidance.obstacles import Polygon, Cuboid
+
+
+def get_radius_point_with_shapely(obstacle, position):
+    """Intersection of the (extended) line from the reference point with the hull."""
+    hull = obstacle.shapely.get(
+        in_global_frame=False, margin=True, reference_extended=True
+    )
+    if hull is None:
+        hull = obstacle.shapely.get(
+            in_global_frame=False, margin=True, reference_extended=False
+        )
+    if hull.geom_type == "Polygon":
+        hull = hull.exterior
+
+    position = position / LA.norm(position) * obstacle.get_maximal_distance() * 10.0
+    intersection = shapely.geometry.LineString([[0, 0], position]).intersection(hull)
+    return np.array([intersection.x, intersection.y])
+
+
+def get_obstacles():
+    return [
+        Polygon(
+            edge_points=np.array(
+                [[-5.0, -4.0], [5.0, -4.0], [5.0, 1.0], [2.0, 4.0], [-5.0, 4.0]]
+            ).T,
+            center_position=np.array([0.0, 0.0]),
+            is_boundary=True,
+        ),
+        Polygon(
+            edge_points=np.array([[1.0, -3.0], [3.0, -2.0], [1.0, -1.0]]).T,
+            center_position=np.array([1.6, -2.0]),
+            orientation=0.3,
+        ),
+        Cuboid(
+            center_position=np.array([0.2, 2.4]),
+            axes_length=[0.4, 2.4],
+            margin_absolut=0.1,
+            orientation=-30 * np.pi / 180,
+        ),
+    ]
+
+
+def test_radius_point_equals_shapely():
+    positions = np.random.default_rng(0).uniform(-3, 3, (2, 50))
+    # Include the directions of the corners
+    for obstacle in get_obstacles():
+        edges = obstacle.shapely.get_local_edge_points()
+        all_positions = np.hstack((positions, edges, 0.5 * edges))
+
+        radius_points = obstacle.get_local_radius_point(all_positions)
+        for ii in range(all_positions.shape[1]):
+            radius_point = obstacle.get_local_radius_point(all_positions[:, ii])
+            assert np.allclose(radius_points[:, ii], radius_point)
+            assert np.allclose(
+                radius_point,
+                get_radius_point_with_shapely(obstacle, all_positions[:, ii]),
+            )
+
+
+def test_gamma_array():
+    positions = np.random.default_rng(1).uniform(-6, 6, (2, 100))
+    positions[:, 0] = 0
+    for obstacle in get_obstacles():
+        positions[:, 0] = obstacle.center_position
+        gammas = obstacle.get_gamma_array(positions, in_global_frame=True)
+        assert gammas.shape == (positions.shape[1],)
+
+        for ii in range(1, positions.shape[1]):
+            assert np.isclose(
+                gammas[ii],
+                obstacle.get_gamma(positions[:, ii], in_global_frame=True),
+            )
+
+        # Center point is deepest inside
+        if obstacle.is_boundary:
+            assert gammas[0] > 1e10
+        else:
+            assert np.isclose(gammas[0], 0)
+
+
+def test_reference_point_outside():
+    obstacle = Polygon(
+        edge_points=np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 0.5], [0.0, 0.5]]).T,
+        center_position=np.array([1.0, 0.25]),
+    )
+    obstacle.set_reference_point(np.array([1.0, 1.0]), in_global_frame=True)
+
+    position = np.array([0.0, 1.5])
+    radius_point = obstacle.get_local_radius_point(position)
+    assert np.allclose(radius_point, get_radius_point_with_shapely(obstacle, position))
+    # The extended hull is larger than the obstacle itself
+    assert LA.norm(radius_point) > LA.norm(
+        obstacle.get_local_radius_point(position, with_reference_point_expansion=False)
+    )
+
+
+if (__name__) == "__main__":
+    test_radius_point_equals_shapely()
+    test_gamma_array()
+    test_reference_point_outside()
@@ -0,0 +1,153 @@
+"""
+Test the tabulated local radius of star-shaped obstacles
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.obstacles import StarshapedFlower, EllipseWithAxes
+from dynamic_obstacle_avoidance.obstacles import AngularRadiusTable, RadiusLookupMixin
+
+
+class TabulatedFlower(RadiusLookupMixin, StarshapedFlower):
+    pass
+
+
+class TabulatedEllipse(RadiusLookupMixin, EllipseWithAxes):
+    pass
+
+
+def test_flower_table():
+    kwargs = dict(
+        center_position=np.array([1.0, 0.5]),
+        radius_magnitude=0.5,
+        number_of_edges=5,
+        radius_mean=1.5,
+        orientation=0.2,
+    )
+    flower = StarshapedFlower(**kwargs)
+    tabulated_flower = TabulatedFlower(**kwargs)
+
+    positions = np.random.default_rng(0).uniform(-3, 3, (2, 100))
+    positions = positions + np.reshape(flower.center_position, (-1, 1))
+
+    gammas = tabulated_flower.get_gamma(positions, in_global_frame=True)
+    normals = tabulated_flower.get_normal_direction(positions, in_global_frame=True)
+    radii = tabulated_flower.get_local_radius(positions, in_global_frame=True)
+
+    tolerance = tabulated_flower.radius_tolerance
+    for ii in range(positions.shape[1]):
+        position = positions[:, ii]
+        gamma = tabulated_flower.get_gamma(position, in_global_frame=True)
+        assert np.isclose(gamma, gammas[ii])
+        assert np.isclose(
+            gamma, flower.get_gamma(position, in_global_frame=True), atol=tolerance
+        )
+
+        assert np.isclose(
+            radii[ii],
+            flower.get_local_radius(position, in_global_frame=True),
+            atol=tolerance,
+        )
+
+        normal = flower.get_normal_direction(position, in_global_frame=True)
+        assert np.allclose(normals[:, ii], normal, atol=1e-2)
+        assert np.allclose(
+            tabulated_flower.get_normal_direction(position, in_global_frame=True),
+            normals[:, ii],
+        )
+
+    # Center
+    assert tabulated_flower.get_gamma(flower.center_position, in_global_frame=True) == 0
+
+    # Frame given as 'in_obstacle_frame' (as used by the containers)
+    position = positions[:, 0]
+    assert np.isclose(
+        tabulated_flower.get_gamma(position, in_obstacle_frame=False),
+        flower.get_gamma(position, in_obstacle_frame=False),
+        atol=tolerance,
+    )
+    assert np.isclose(
+        tabulated_flower.get_gamma(position, in_obstacle_frame=False),
+        gammas[0],
+    )
+    assert np.allclose(
+        tabulated_flower.get_normal_direction(position, in_obstacle_frame=False),
+        normals[:, 0],
+    )
+    assert np.isclose(
+        tabulated_flower.get_local_radius(position, in_obstacle_frame=False),
+        radii[0],
+    )
+
+
+def test_table_is_only_recreated_after_deformation():
+    flower = TabulatedFlower(
+        center_position=np.array([0.0, 0.0]),
+        radius_magnitude=0.5,
+        radius_mean=1.5,
+        is_deforming=True,
+        time_now=0,
+        property_functions={"radius_mean": lambda time: 1.5 + 0.5 * time},
+    )
+    position = np.array([3.0, 0.0])
+    radius_table = flower.radius_table
+    gamma = flower.get_gamma(position)
+
+    flower.do_velocity_step(0.1)
+    flower.center_position = np.array([0.5, 0.3])
+    assert flower.radius_table is radius_table
+
+    flower.update_deforming_obstacle(time_now=1.0)
+    assert flower.radius_table is not radius_table
+    assert np.isclose(flower.get_local_radius(position), 2.5, atol=1e-3)
+    assert flower.get_gamma(position) < gamma
+
+
+def test_ellipsoid_table():
+    kwargs = dict(
+        center_position=np.array([0.0, 0.0, 0.5]),
+        axes_length=np.array([1.0, 2.0, 3.0]),
+    )
+    ellipse = EllipseWithAxes(**kwargs)
+    tabulated_ellipse = TabulatedEllipse(**kwargs)
+
+    positions = np.random.default_rng(1).uniform(-2, 2, (3, 50))
+    # Include the poles
+    positions[:, 0] = [0, 0, 2.0]
+    positions[:, 1] = [0, 0, -2.0]
+
+    radii = tabulated_ellipse.get_local_radius(positions)
+    normals = tabulated_ellipse.get_normal_direction(positions)
+    for ii in range(positions.shape[1]):
+        assert np.isclose(
+            radii[ii], ellipse.get_local_radius(positions[:, ii]), atol=1e-3
+        )
+        # The (derivative based) normal is less accurate close to the poles
+        assert np.allclose(
+            normals[:, ii], ellipse.get_normal_direction(positions[:, ii]), atol=3e-2
+        )
+
+
+def test_table_tolerance():
+    def get_radius(directions):
+        return 1 + 0.3 * np.cos(3 * np.arctan2(directions[1, :], directions[0, :]))
+
+    table_coarse = AngularRadiusTable(get_radius, radius_tolerance=1e-2)
+    table_fine = AngularRadiusTable(get_radius, radius_tolerance=1e-7)
+    assert table_fine.n_samples > table_coarse.n_samples
+    assert table_fine.max_error < 1e-7
+
+    angles = np.linspace(-np.pi, np.pi, 37)
+    directions = np.vstack((np.cos(angles), np.sin(angles)))
+    assert np.allclose(
+        table_fine.get_radius(2 * directions), get_radius(directions), atol=1e-7
+    )
+    assert LA.norm(table_coarse.get_radius(directions) - get_radius(directions)) > 0
+
+
+if (__name__) == "__main__":
+    test_flower_table()
+    test_table_is_only_recreated_after_deformation()
+    test_ellipsoid_table()
+    test_table_tolerance()
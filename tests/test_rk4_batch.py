@@ -0,0 +1,110 @@
+"""
+Test the batched RK4 integration of many trajectories
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_rk4
+from dynamic_obstacle_avoidance.avoidance import integrate_trajectories_rk4
+
+
+def get_environment():
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([2.0, 0.5]),
+            axes_length=np.array([1.5, 2.5]),
+            orientation=20 * np.pi / 180,
+            margin_absolut=0.1,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([-1.0, -2.0]),
+            axes_length=np.array([1.0, 1.0]),
+        )
+    )
+    return obstacle_environment
+
+
+def test_batch_equals_single_integration():
+    obstacle_environment = get_environment()
+    attractor_position = np.array([4.0, 0.0])
+    dt = 0.05
+
+    np.random.seed(0)
+    positions_init = np.vstack(
+        (np.random.uniform(-3, -1, 8), np.random.uniform(-1, 3, 8))
+    )
+
+    trajectories, n_steps = integrate_trajectories_rk4(
+        positions_init,
+        obstacle_environment,
+        ds=lambda x: attractor_position.reshape(-1, 1) - x,
+        dt=dt,
+        max_simu_step=30,
+        attractor_position=attractor_position,
+    )
+    assert trajectories.shape == (2, 31, 8)
+    assert np.all(n_steps == 30)
+
+    for jj in range(positions_init.shape[1]):
+        position = positions_init[:, jj]
+        for it in range(5):
+            position = obs_avoidance_rk4(
+                dt,
+                position,
+                obstacle_environment,
+                obs_avoidance=obs_avoidance_interpolation_moving,
+                ds=lambda x, x0: attractor_position - x,
+            )
+            assert np.allclose(trajectories[:, it + 1, jj], position)
+
+
+def test_converged_and_collided_trajectories_stop():
+    obstacle_environment = get_environment()
+    attractor_position = np.array([4.0, 0.0])
+
+    positions_init = np.array(
+        [
+            [4.0, 0.0],  # At attractor
+            [-1.0, -2.0],  # In collision
+            [-3.0, 2.0],
+        ]
+    ).T
+
+    n_evaluations = []
+
+    def counting_dynamics(x):
+        n_evaluations.append(x.shape[1])
+        return attractor_position.reshape(-1, 1) - x
+
+    trajectories, n_steps = integrate_trajectories_rk4(
+        positions_init,
+        obstacle_environment,
+        ds=counting_dynamics,
+        dt=0.1,
+        max_simu_step=200,
+        attractor_position=attractor_position,
+        convergence_margin=1e-2,
+    )
+
+    # Stopped trajectories are not evaluated anymore
+    assert n_evaluations[0] == 3
+    assert np.all(np.array(n_evaluations[4:]) == 1)
+    assert n_steps[0] == n_steps[1] == 1
+    assert 1 < n_steps[2] < 200
+
+    # And keep their last position
+    assert np.allclose(trajectories[:, -1, 0], trajectories[:, 1, 0])
+    assert LA.norm(trajectories[:, -1, 2] - attractor_position) < 1e-2
+    assert trajectories.shape[1] == n_steps[2] + 1
+
+
+if (__name__) == "__main__":
+    test_batch_equals_single_integration()
+    test_converged_and_collided_trajectories_stop()
@@ -0,0 +1,107 @@
+"""
+Test the headless simulation engine
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from vartools.dynamical_systems import LinearSystem
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.avoidance import ModulationAvoider
+from dynamic_obstacle_avoidance.simulation import SimulationEngine
+
+
+def get_environment(linear_velocity=None):
+    obstacle_environment = ObstacleContainer()
+    obstacle_environment.append(
+        EllipseWithAxes(
+            center_position=np.array([0.0, 0.0]),
+            axes_length=np.array([1.0, 2.0]),
+            linear_velocity=linear_velocity,
+        )
+    )
+    obstacle_environment.append(
+        CuboidXd(
+            center_position=np.array([2.0, 2.0]),
+            axes_length=np.array([1.0, 1.0]),
+            orientation=10 * np.pi / 180,
+        )
+    )
+    return obstacle_environment
+
+
+def test_static_environment():
+    obstacle_environment = get_environment()
+    initial_dynamics = LinearSystem(attractor_position=np.array([3.0, 0.0]))
+    engine = SimulationEngine(
+        obstacle_environment, initial_dynamics=initial_dynamics, dt=0.05
+    )
+
+    positions_init = np.array([[-3.0, 0.2], [-2.0, -1.5], [-3.0, 2.0]]).T
+    result = engine.run(positions_init, n_steps=400)
+
+    assert np.all(result.has_converged)
+    assert not np.any(result.has_collided)
+    assert result.positions.shape[1] == result.times.shape[0] < 401
+    assert np.allclose(result.positions[:, -1, :].T, np.array([3.0, 0.0]), atol=1e-2)
+
+    # Equal to the point-wise euler integration
+    avoider = ModulationAvoider(
+        initial_dynamics=initial_dynamics, obstacle_environment=obstacle_environment
+    )
+    position = positions_init[:, 0]
+    for it in range(20):
+        position = position + 0.05 * avoider.evaluate(position)
+        assert np.allclose(result.positions[:, it + 1, 0], position)
+
+
+def test_moving_obstacle_and_collision():
+    obstacle_environment = get_environment(linear_velocity=np.array([1.0, 0.0]))
+    engine = SimulationEngine(
+        obstacle_environment,
+        initial_dynamics=LinearSystem(attractor_position=np.array([3.0, 0.0])),
+        integrator="rk4",
+        dt=0.1,
+    )
+
+    # The second agent starts within the obstacle
+    positions_init = np.array([[-3.0, 2.0], [0.0, 0.0]]).T
+    result = engine.run(positions_init, n_steps=10)
+
+    assert result.has_collided[1] and not result.has_collided[0]
+    assert np.allclose(result.positions[:, 1:, 1].T, result.positions[:, 1, 1])
+    assert np.allclose(result.velocities[:, 1:, 1], 0)
+
+    assert result.obstacle_positions.shape == (2, 2, 11)
+    assert np.allclose(result.obstacle_positions[0, :, -1], [1.0, 0.0])
+    assert np.allclose(result.obstacle_positions[1, :, -1], [2.0, 2.0])
+
+
+def test_custom_integrator_and_obstacle_update():
+    obstacle_environment = get_environment()
+
+    def obstacle_update(obstacle_environment, time, dt):
+        obstacle_environment[0].center_position = np.array([0.0, np.sin(time + dt)])
+
+    def midpoint_step(evaluate, positions, dt):
+        return positions + dt * evaluate(positions + 0.5 * dt * evaluate(positions))
+
+    engine = SimulationEngine(
+        obstacle_environment,
+        initial_dynamics=LinearSystem(attractor_position=np.array([3.0, 0.0])),
+        integrator=midpoint_step,
+        obstacle_update=obstacle_update,
+        dt=0.1,
+    )
+    result = engine.run(np.array([-3.0, 0.0]), n_steps=5)
+    assert np.allclose(result.obstacle_positions[0, 1, :], np.sin(result.times))
+    assert result.positions.shape == (2, 6, 1)
+    assert LA.norm(result.velocities[:, 0, 0]) > 0
+
+
+if (__name__) == "__main__":
+    test_static_environment()
+    test_moving_obstacle_and_collision()
+    test_custom_integrator_and_obstacle_update()
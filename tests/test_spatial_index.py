@@ -0,0 +1,170 @@
+"""
+Test the spatial index of the obstacle containers
+"""
+
+import numpy as np
+from numpy import linalg as LA
+
+from dynamic_obstacle_avoidance.containers import ObstacleContainer
+from dynamic_obstacle_avoidance.obstacles import EllipseWithAxes, CuboidXd
+from dynamic_obstacle_avoidance.avoidance import obs_avoidance_interpolation_moving
+
+
+def get_random_environment(n_obstacles=60, with_boundary=True):
+    np.random.seed(0)
+    obstacle_environment = ObstacleContainer()
+    for ii in range(n_obstacles):
+        if ii % 2:
+            obstacle_type = EllipseWithAxes
+        else:
+            obstacle_type = CuboidXd
+
+        obstacle_environment.append(
+            obstacle_type(
+                center_position=np.random.uniform(low=-20, high=20, size=2),
+                axes_length=np.random.uniform(low=0.5, high=3.0, size=2),
+                orientation=np.random.uniform(low=-np.pi, high=np.pi),
+            )
+        )
+
+    if with_boundary:
+        obstacle_environment.append(
+            EllipseWithAxes(
+                center_position=np.zeros(2),
+                axes_length=np.array([60.0, 60.0]),
+                is_boundary=True,
+            )
+        )
+    return obstacle_environment
+
+
+def get_lower_distances(obstacle_environment, position):
+    return np.array(
+        [
+            max(LA.norm(position - obs.center_position) - obs.get_bounding_radius(), 0)
+            for obs in obstacle_environment
+        ]
+    )
+
+
+def test_radius_and_nearest_query():
+    obstacle_environment = get_random_environment()
+    positions = np.random.uniform(low=-22, high=22, size=(2, 30))
+
+    for ii in range(positions.shape[1]):
+        position = positions[:, ii]
+        # Without index (linear search)
+        indices_radius = obstacle_environment.query_radius(position, 4.0)
+        indices_nearest = obstacle_environment.query_nearest(position, k=5)
+
+        obstacle_environment.build_spatial_index()
+        assert np.all(
+            obstacle_environment.query_radius(position, 4.0) == indices_radius
+        )
+        assert np.all(
+            obstacle_environment.query_nearest(position, k=5) == indices_nearest
+        )
+        obstacle_environment._spatial_index = None
+
+        # Boundary is always part of the radius query
+        assert (len(obstacle_environment) - 1) in indices_radius
+        assert (len(obstacle_environment) - 1) not in indices_nearest
+
+        distances = get_lower_distances(obstacle_environment, position)
+        assert np.all(distances[indices_radius[:-1]] <= 4.0)
+        assert np.sum(distances[:-1] <= 4.0) == len(indices_radius) - 1
+        assert np.isclose(
+            np.max(distances[indices_nearest]), np.sort(distances[:-1])[4]
+        )
+
+
+def test_moving_obstacles():
+    obstacle_environment = get_random_environment(with_boundary=False)
+    obstacle_environment.build_spatial_index(rebuild_slack=1.0)
+    index = obstacle_environment.spatial_index
+
+    for obs in obstacle_environment:
+        obs.linear_velocity = np.array([0.3, -0.2])
+
+    n_rebuilds = index.n_rebuilds
+    position = np.array([2.0, 1.0])
+    for it in range(10):
+        obstacle_environment.do_velocity_step(delta_time=0.5)
+
+        indices = obstacle_environment.query_radius(position, 3.0)
+        distances = get_lower_distances(obstacle_environment, position)
+        assert np.all(indices == np.arange(len(distances))[distances <= 3.0])
+
+    # Loose tree is only rebuilt after some steps
+    assert 1 <= index.n_rebuilds - n_rebuilds < 10
+
+    # Single obstacle reports its move
+    obstacle_environment[0].center_position = position
+    obstacle_environment[0].has_moved = True
+    obstacle_environment.update_spatial_index()
+    assert obstacle_environment.query_nearest(position, k=1)[0] == 0
+
+    # Added obstacle is considered
+    obstacle_environment.append(
+        CuboidXd(center_position=position + 0.1, axes_length=np.array([1.0, 1.0]))
+    )
+    assert (len(obstacle_environment) - 1) in obstacle_environment.query_radius(
+        position, 0
+    )
+
+
+def test_collision_and_modulation_with_index():
+    obstacle_environment = get_random_environment()
+    positions = np.random.uniform(low=-22, high=22, size=(2, 100))
+    collisions = obstacle_environment.check_collision_array(positions)
+
+    obstacle_environment.build_spatial_index()
+    assert np.all(obstacle_environment.check_collision_array(positions) == collisions)
+    for ii in range(positions.shape[1]):
+        assert obstacle_environment.is_collision_free(positions[:, ii]) == (
+            not any(
+                obs.get_gamma(positions[:, ii], in_global_frame=True) < 1
+                for obs in obstacle_environment
+            )
+        )
+
+    velocity = np.array([1.0, 0.0])
+    for ii in range(10):
+        velocity_index = obs_avoidance_interpolation_moving(
+            positions[:, ii], velocity, obstacle_environment, influence_distance=3.0
+        )
+        velocity_list = obs_avoidance_interpolation_moving(
+            positions[:, ii],
+            velocity,
+            obstacle_environment.list,
+            influence_distance=3.0,
+        )
+        assert np.allclose(velocity_index, velocity_list)
+
+
+def test_collision_after_move_without_update():
+    obstacle_environment = get_random_environment(with_boundary=False)
+    obstacle_environment.build_spatial_index()
+
+    position = np.array([25.0, 25.0])
+    assert obstacle_environment.is_collision_free(position)
+
+    # Move the obstacle onto the position without updating the index
+    for has_moved in [False, True]:
+        obstacle_environment[3].center_position = position
+        obstacle_environment[3].has_moved = has_moved
+
+        assert obstacle_environment[3].get_gamma(position, in_global_frame=True) < 1
+        assert not obstacle_environment.is_collision_free(position)
+        assert obstacle_environment.is_position_colliding(position)
+        assert 3 in obstacle_environment.query_radius(position, 0)
+
+        obstacle_environment[3].center_position = -position
+        assert obstacle_environment.is_collision_free(position)
+
+
+if (__name__) == "__main__":
+    test_radius_and_nearest_query()
+    test_moving_obstacles()
+    test_collision_and_modulation_with_index()
+    test_collision_after_move_without_update()